@@ -0,0 +1,499 @@
+"""
+Servidor local de co-simulación para herramientas externas
+
+Expone SimulationEngine por un socket local (TCP en localhost o socket Unix)
+con mensajes JSON delimitados por líneas:
+- Un conjunto de procesos trabajadores, cada uno con un SimulationEngine
+  precalentado (módulos importados y primera simulación ya resuelta)
+- Solicitudes concurrentes de régimen permanente, barridos y transitorios;
+  el cálculo corre en el ProcessPoolExecutor y no bloquea el bucle asyncio
+- Respuestas por bloques: transitorios y barridos largos vuelven en varios
+  mensajes, el último con "final": true
+- Estadísticas del servidor: profundidad de la cola y percentiles de latencia
+
+Protocolo (una línea JSON por mensaje, UTF-8):
+
+    → {"id": 1, "op": "steady", "parameters": {"T_load": 50.0}}
+    ← {"id": 1, "status": "ok", "chunk": 0, "final": true, "data": {...}}
+
+    → {"id": 2, "op": "transient", "t_span": [0, 2], "num_points": 20000}
+    ← {"id": 2, "status": "ok", "chunk": 0, "final": false, "data": {"time": [...], ...}}
+    ← ...
+    ← {"id": 2, "status": "ok", "chunk": 9, "final": true, "data": {...}}
+
+Operaciones: 'steady', 'sweep' (parameter, range, num_points), 'transient'
+(t_span, initial_conditions, num_points), 'stats' y 'ping'. "parameters"
+modifica los parámetros del motor (MotorParameters) sólo para esa solicitud;
+se validan con el tipo de cada campo antes de ocupar un trabajador.
+Los errores se responden con "status": "error" y el mensaje en "error"; una
+línea de más de 1 MiB se descarta y se responde con un error de "id": null.
+Las respuestas son JSON estricto: los valores no finitos (NaN, ±inf) se
+envían como null.
+
+Ejecutar `python cosim_server.py --port 8765 --workers 4` para iniciarlo.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import time
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Executor
+from typing import Dict, List, Any, Optional, AsyncIterator, Tuple
+from motor_model import MotorParameters
+from utils import json_default, finite_or_none, coerce_parameter
+
+
+# Parámetros que el barrido resuelve en forma vectorizada (por lotes)
+_BATCH_SWEEP_FIELDS = ('V_line', 'f', 'If', 'T_load', 'Rs', 'Xd', 'Xq', 'p')
+
+# Límite de longitud de una línea de solicitud
+_LINE_LIMIT = 1 << 20
+
+# Ventana de latencias para los percentiles
+_LATENCY_WINDOW = 10000
+
+
+# ==================== TRABAJADORES ====================
+
+_engine = None
+
+
+def _init_worker() -> None:
+    """Inicializador del proceso trabajador: crea y precalienta su SimulationEngine"""
+    global _engine
+    from simulation_engine import SimulationEngine
+
+    _engine = SimulationEngine(MotorParameters())
+    _engine.solve_steady_state()
+    _engine.simulate_transient_response((0.0, 0.01), num_points=10)
+
+
+def _worker_engine(overrides: Dict[str, Any]):
+    """Motor del trabajador con los parámetros de la solicitud (ya validados)"""
+    if _engine is None:
+        _init_worker()
+    _engine.motor.parameters = MotorParameters()._replace(**overrides)
+    return _engine
+
+
+def _warm_up() -> int:
+    """Tarea vacía: fuerza el arranque (y la inicialización) de un trabajador"""
+    return os.getpid()
+
+
+def _run_steady(overrides: Dict[str, Any]) -> Dict[str, Any]:
+    return _worker_engine(overrides).solve_steady_state()
+
+
+def _run_sweep(overrides: Dict[str, Any], parameter: str,
+               values: List[float]) -> Dict[str, List[Any]]:
+    """Bloque de un barrido como resultado columnar"""
+    engine = _worker_engine(overrides)
+    if not hasattr(engine.motor, parameter):
+        raise ValueError(f"El motor no tiene el parámetro '{parameter}'")
+
+    if parameter in _BATCH_SWEEP_FIELDS:
+        batch = engine.solve_steady_state_batch(**{parameter: np.asarray(values, dtype=float)})
+        columns = {name: np.broadcast_to(column, (len(values),)).tolist()
+                   for name, column in batch.items()}
+    else:
+        rows = [engine.solve_steady_state(**{parameter: value}) for value in values]
+        columns = {name: [row.get(name) for row in rows] for name in rows[0]}
+    columns[f'parameter_{parameter}'] = list(values)
+    return columns
+
+
+def _run_transient(overrides: Dict[str, Any], t_span: Tuple[float, float],
+                   initial_conditions: Optional[Dict[str, float]],
+                   num_points: int) -> Dict[str, Any]:
+    return _worker_engine(overrides).simulate_transient_response(
+        tuple(t_span), initial_conditions, num_points=num_points)
+
+
+# ==================== SERVIDOR ====================
+
+def _validate_overrides(overrides: Any) -> Dict[str, Any]:
+    """
+    "parameters" de una solicitud convertidos al tipo de cada campo de
+    MotorParameters; se valida en el servidor, antes de ocupar un trabajador
+    """
+    if not isinstance(overrides, dict):
+        raise ValueError('"parameters" debe ser un objeto JSON')
+    unknown = set(overrides) - set(MotorParameters._fields)
+    if unknown:
+        raise ValueError(f"Parámetros desconocidos: {sorted(unknown)}")
+    defaults = MotorParameters()
+    return {name: coerce_parameter(name, getattr(defaults, name), value)
+            for name, value in overrides.items()}
+
+
+async def _skip_line(reader: asyncio.StreamReader) -> None:
+    """Descarta lo que resta de una línea más larga que el límite del lector"""
+    while True:
+        try:
+            await reader.readuntil(b'\n')
+            return
+        except asyncio.LimitOverrunError as error:
+            await reader.readexactly(error.consumed)
+
+
+class CoSimServer:
+    """
+    Servidor asyncio de co-simulación
+
+    Cada solicitud espera un lugar libre (tantos como trabajadores) y se
+    ejecuta en el pool de procesos; mientras espera cuenta en queue_depth.
+    Las solicitudes de una misma conexión se atienden concurrentemente y sus
+    respuestas se identifican por "id".
+
+        server = CoSimServer(port=8765, workers=4)
+        await server.start()
+        await server.serve_forever()
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 unix_path: Optional[str] = None, workers: Optional[int] = None,
+                 chunk_size: int = 5000, executor: Optional[Executor] = None):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.errors = 0
+        self._latencies = deque(maxlen=_LATENCY_WINDOW)
+
+    @property
+    def address(self):
+        """Dirección de escucha: (host, puerto) o ruta del socket Unix"""
+        if self.unix_path is not None:
+            return self.unix_path
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self) -> None:
+        """Arranca y precalienta los trabajadores y abre el socket"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 initializer=_init_worker)
+        self._slots = asyncio.Semaphore(self.workers)
+
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _warm_up)
+                               for _ in range(self.workers)))
+
+        if self.unix_path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, path=self.unix_path, limit=_LINE_LIMIT)
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_connection, self.host, self.port, limit=_LINE_LIMIT)
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Cierra el socket y, si es propio, el pool de procesos"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self) -> 'CoSimServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    def statistics(self) -> Dict[str, Any]:
+        """Profundidad de la cola, solicitudes en curso y percentiles de latencia (ms)"""
+        latencies = np.array(self._latencies) * 1e3
+        percentiles = (dict(zip(('p50', 'p90', 'p99'), np.percentile(latencies, [50, 90, 99]).tolist()))
+                       if len(latencies) else {'p50': None, 'p90': None, 'p99': None})
+        percentiles['max'] = float(latencies.max()) if len(latencies) else None
+        return {
+            'queue_depth': self.queue_depth,
+            'in_flight': self.in_flight,
+            'completed': self.completed,
+            'errors': self.errors,
+            'workers': self.workers,
+            'latency_ms': percentiles
+        }
+
+    # ==================== CONEXIONES ====================
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as error:
+                    line = error.partial  # última línea sin salto, o fin de la conexión
+                except asyncio.LimitOverrunError:
+                    # readline() convertiría esto en ValueError tras descartar una parte
+                    # indeterminada de la línea; se descarta completa y se sigue atendiendo
+                    await _skip_line(reader)
+                    self.errors += 1
+                    await self._send(writer, {
+                        'id': None, 'status': 'error', 'final': True,
+                        'error': f'ValueError: la solicitud excede {_LINE_LIMIT} bytes'})
+                    continue
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._handle_request(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Cliente desconectado o servidor cerrándose
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _handle_request(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        received = time.perf_counter()
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("La solicitud debe ser un objeto JSON")
+            request_id = request.get('id')
+
+            chunk = 0
+            async for data, final in self._dispatch(request):
+                await self._send(writer, {'id': request_id, 'status': 'ok', 'chunk': chunk,
+                                          'final': final, 'data': data})
+                chunk += 1
+            self.completed += 1
+        except ConnectionError:
+            return
+        except Exception as error:
+            self.errors += 1
+            try:
+                await self._send(writer, {'id': request_id, 'status': 'error', 'final': True,
+                                          'error': f'{type(error).__name__}: {error}'})
+            except ConnectionError:
+                return
+        self._latencies.append(time.perf_counter() - received)
+
+    async def _send(self, writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+        line = json.dumps(finite_or_none(message), allow_nan=False)
+        writer.write(line.encode('utf-8') + b'\n')
+        await writer.drain()
+
+    # ==================== OPERACIONES ====================
+
+    async def _dispatch(self, request: Dict[str, Any]) -> AsyncIterator[Tuple[Any, bool]]:
+        """Genera los bloques (data, final) de la respuesta"""
+        op = request.get('op')
+        overrides = _validate_overrides(request.get('parameters') or {})
+
+        if op == 'ping':
+            yield {'pong': True}, True
+        elif op == 'stats':
+            yield self.statistics(), True
+        elif op == 'steady':
+            yield await self._submit(_run_steady, overrides), True
+        elif op == 'sweep':
+            async for item in self._sweep(request, overrides):
+                yield item
+        elif op == 'transient':
+            async for item in self._transient(request, overrides):
+                yield item
+        else:
+            raise ValueError(f"Operación desconocida: {op}")
+
+    async def _submit(self, function, *args) -> Any:
+        """Ejecuta una tarea en el pool cuando hay un trabajador libre"""
+        self.queue_depth += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queue_depth -= 1
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, function, *args)
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    async def _sweep(self, request: Dict[str, Any],
+                     overrides: Dict[str, Any]) -> AsyncIterator[Tuple[Any, bool]]:
+        """Barrido repartido en bloques entre los trabajadores; respuesta en orden"""
+        parameter = request['parameter']
+        low, high = request['range']
+        values = np.linspace(float(low), float(high), int(request.get('num_points', 20))).tolist()
+        chunk_size = int(request.get('chunk_size', self.chunk_size))
+        blocks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+
+        tasks = [asyncio.ensure_future(self._submit(_run_sweep, overrides, parameter, block))
+                 for block in blocks]
+        try:
+            for k, task in enumerate(tasks):
+                yield await task, k == len(tasks) - 1
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _transient(self, request: Dict[str, Any],
+                         overrides: Dict[str, Any]) -> AsyncIterator[Tuple[Any, bool]]:
+        """Transitorio resuelto en un trabajador y enviado en bloques de muestras"""
+        results = await self._submit(_run_transient, overrides, request['t_span'],
+                                     request.get('initial_conditions'),
+                                     int(request.get('num_points', 1000)))
+        chunk_size = int(request.get('chunk_size', self.chunk_size))
+        n_samples = len(results['time'])
+        columns = {name: value for name, value in results.items()
+                   if isinstance(value, np.ndarray) and value.shape == (n_samples,)}
+        metadata = {name: value for name, value in results.items() if name not in columns}
+
+        starts = range(0, max(n_samples, 1), chunk_size)
+        for k, start in enumerate(starts):
+            data = {name: column[start:start + chunk_size] for name, column in columns.items()}
+            final = k == len(starts) - 1
+            if final:
+                data.update(metadata)
+            yield data, final
+
+
+# ==================== CLIENTE ====================
+
+class CoSimClient:
+    """
+    Cliente asyncio del servidor de co-simulación
+
+    Permite varias solicitudes concurrentes sobre una misma conexión; las
+    respuestas se reparten por "id".
+
+        async with CoSimClient(port=8765) as client:
+            steady = await client.call('steady', parameters={'T_load': 50.0})
+            transient = await client.call('transient', t_span=[0, 2])
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: Optional[int] = None,
+                 unix_path: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self._ids = itertools.count()
+        self._pending: Dict[Any, asyncio.Queue] = {}
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def connect(self) -> 'CoSimClient':
+        if self.unix_path is not None:
+            self._reader, self._writer = await asyncio.open_unix_connection(
+                self.unix_path, limit=_LINE_LIMIT * 64)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(
+                self.host, self.port, limit=_LINE_LIMIT * 64)
+        self._listener = asyncio.ensure_future(self._listen())
+        return self
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+        if self._listener is not None:
+            self._listener.cancel()
+
+    async def __aenter__(self) -> 'CoSimClient':
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def _listen(self) -> None:
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            queue = self._pending.get(message.get('id'))
+            if queue is not None:
+                queue.put_nowait(message)
+        for queue in self._pending.values():
+            queue.put_nowait({'status': 'error', 'final': True, 'error': 'Conexión cerrada'})
+
+    async def stream(self, op: str, **arguments) -> AsyncIterator[Dict[str, Any]]:
+        """Envía una solicitud y genera los bloques 'data' de la respuesta"""
+        request_id = next(self._ids)
+        queue = self._pending[request_id] = asyncio.Queue()
+        try:
+            message = dict(arguments, id=request_id, op=op)
+            line = json.dumps(message, default=json_default).encode('utf-8') + b'\n'
+            if len(line) > _LINE_LIMIT:
+                raise ValueError(f"La solicitud excede {_LINE_LIMIT} bytes")
+            self._writer.write(line)
+            await self._writer.drain()
+            while True:
+                response = await queue.get()
+                if response['status'] != 'ok':
+                    raise RuntimeError(response.get('error'))
+                yield response['data']
+                if response['final']:
+                    break
+        finally:
+            del self._pending[request_id]
+
+    async def call(self, op: str, **arguments) -> Dict[str, Any]:
+        """Envía una solicitud y reúne la respuesta completa (concatena las columnas)"""
+        merged: Dict[str, Any] = {}
+        async for data in self.stream(op, **arguments):
+            for name, value in data.items():
+                if isinstance(value, list) and isinstance(merged.get(name), list):
+                    merged[name].extend(value)
+                else:
+                    merged[name] = value
+        return merged
+
+
+def serve(host: str = '127.0.0.1', port: int = 8765, unix_path: Optional[str] = None,
+          workers: Optional[int] = None, chunk_size: int = 5000) -> None:
+    """Inicia el servidor y atiende solicitudes hasta que se interrumpe"""
+    async def run():
+        async with CoSimServer(host, port, unix_path, workers, chunk_size) as server:
+            print(f"Servidor de co-simulación escuchando en {server.address} "
+                  f"({server.workers} trabajadores)")
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Servidor local de co-simulación')
+    parser.add_argument('--host', default='127.0.0.1', help='Dirección de escucha (localhost)')
+    parser.add_argument('--port', type=int, default=8765, help='Puerto TCP')
+    parser.add_argument('--unix', metavar='RUTA', help='Escuchar en un socket Unix en lugar de TCP')
+    parser.add_argument('--workers', type=int, help='Procesos trabajadores (por defecto, núcleos)')
+    parser.add_argument('--chunk-size', type=int, default=5000,
+                        help='Muestras por bloque en las respuestas')
+    args = parser.parse_args()
+    serve(args.host, args.port, args.unix, args.workers, args.chunk_size)
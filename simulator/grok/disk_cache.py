@@ -0,0 +1,189 @@
+"""
+Caché persistente en disco para resultados de simulaciones transitorias
+
+Guarda las salidas de SimulationEngine.simulate_transient_response() en un
+directorio direccionado por contenido:
+- La clave es un hash de los parámetros del motor, t_span, condiciones
+  iniciales, tolerancias del solver y una sal con la versión del código
+- Cada array se guarda como archivo .npy y se recupera mapeado en memoria
+- El tamaño total está acotado, con desalojo de las entradas menos usadas
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from utils import json_default
+
+
+# Sal de versión: cambiarla invalida todas las entradas al modificar el modelo
+CODE_VERSION = 'transient-v6'
+
+# Directorio por defecto si se habilita la caché sin indicar uno
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'motor_sincrono'
+
+# Tamaño máximo por defecto de la caché
+DEFAULT_MAX_BYTES = 1 << 30  # 1 GiB
+
+_META_FILE = 'meta.json'
+
+
+class TransientDiskCache:
+    """
+    Caché en disco de resultados transitorios con desalojo LRU
+
+    Cada entrada es un subdirectorio <clave>/ con un .npy por array y un
+    meta.json con los valores no vectoriales. El instante de último acceso
+    (mtime de meta.json) determina el orden de desalojo.
+    """
+
+    def __init__(self, directory: Optional[os.PathLike] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES, salt: str = CODE_VERSION):
+        self.directory = Path(directory) if directory is not None else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.salt = salt
+        self.hits = 0
+        self.misses = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def make_key(self, parameters: Tuple, t_span: Tuple[float, float],
+                 initial_conditions: Dict[str, float],
+                 solver_options: Dict[str, Any]) -> str:
+        """Clave canónica (SHA-256) de una simulación"""
+        description = {
+            'salt': self.salt,
+            'parameters': parameters._asdict() if hasattr(parameters, '_asdict') else parameters,
+            't_span': [float(t) for t in t_span],
+            'initial_conditions': {name: float(value)
+                                   for name, value in initial_conditions.items()},
+            'solver_options': solver_options
+        }
+        canonical = json.dumps(description, sort_keys=True, default=json_default)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Recupera una entrada (arrays mapeados en memoria) o None si no existe"""
+        entry = self.directory / key
+        meta_path = entry / _META_FILE
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as meta_file:
+                meta = json.load(meta_file)
+            results = dict(meta['values'])
+            for name in meta['arrays']:
+                results[name] = np.load(entry / f'{name}.npy', mmap_mode='r')
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+
+        # Registrar el acceso para el orden LRU
+        os.utime(meta_path)
+        self.hits += 1
+        return results
+
+    def store(self, key: str, results: Dict[str, Any]) -> None:
+        """Guarda una entrada y aplica el límite de tamaño"""
+        entry = self.directory / key
+        if entry.exists():
+            return
+
+        arrays = {name: value for name, value in results.items()
+                  if isinstance(value, np.ndarray)}
+        values = {name: value for name, value in results.items()
+                  if name not in arrays}
+
+        # Escritura atómica: directorio temporal renombrado al final
+        staging = Path(tempfile.mkdtemp(prefix=f'.{key[:12]}-', dir=self.directory))
+        try:
+            for name, array in arrays.items():
+                np.save(staging / f'{name}.npy', np.ascontiguousarray(array))
+            with open(staging / _META_FILE, 'w', encoding='utf-8') as meta_file:
+                json.dump({'arrays': sorted(arrays), 'values': values}, meta_file,
+                          default=json_default)
+            os.replace(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if not entry.exists():
+                raise
+            return
+
+        self._evict()
+
+    def clear(self) -> int:
+        """Elimina todas las entradas; retorna cuántas había"""
+        entries = self._entries()
+        for entry in entries:
+            shutil.rmtree(entry, ignore_errors=True)
+        return len(entries)
+
+    def size_bytes(self) -> int:
+        """Tamaño total ocupado por las entradas"""
+        return sum(_entry_size(entry) for entry in self._entries())
+
+    def info(self) -> Dict[str, Any]:
+        """Estadísticas de uso de la caché"""
+        return {
+            'directory': str(self.directory),
+            'entries': len(self._entries()),
+            'size_bytes': self.size_bytes(),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def _entries(self):
+        return [entry for entry in self.directory.iterdir()
+                if entry.is_dir() and not entry.name.startswith('.')]
+
+    def _evict(self) -> None:
+        """Desaloja las entradas usadas hace más tiempo hasta respetar max_bytes"""
+        entries = []
+        for entry in self._entries():
+            try:
+                entries.append(((entry / _META_FILE).stat().st_mtime, _entry_size(entry), entry))
+            except OSError:
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+
+def _entry_size(entry: Path) -> int:
+    return sum(path.stat().st_size for path in entry.iterdir() if path.is_file())
+
+
+# ==================== CACHÉ POR DEFECTO ====================
+
+_default_cache: Optional[TransientDiskCache] = None
+_configured = False
+
+
+def configure(directory: Optional[os.PathLike] = None, enabled: bool = True,
+              max_bytes: int = DEFAULT_MAX_BYTES) -> Optional[TransientDiskCache]:
+    """
+    Configura la caché por defecto que usan los SimulationEngine nuevos
+
+    La caché está deshabilitada hasta que se llama a esta función (o se
+    define la variable de entorno MOTOR_SIM_CACHE_DIR).
+    """
+    global _default_cache, _configured
+    _default_cache = TransientDiskCache(directory, max_bytes) if enabled else None
+    _configured = True
+    return _default_cache
+
+
+def get_default_cache() -> Optional[TransientDiskCache]:
+    """Retorna la caché por defecto (None si está deshabilitada)"""
+    global _default_cache, _configured
+    if not _configured:
+        if os.environ.get('MOTOR_SIM_CACHE_DIR'):
+            _default_cache = TransientDiskCache(os.environ['MOTOR_SIM_CACHE_DIR'])
+        _configured = True
+    return _default_cache
@@ -8,41 +8,41 @@ síncronos trifásicos tanto en régimen permanente como dinámico.
 
 import sys
 import argparse
+import importlib.util
+import json
+import os
+import time
 from pathlib import Path
 
 # Añadir el directorio actual al path para importar módulos locales
 sys.path.insert(0, str(Path(__file__).parent))
 
-def main():
+def main(argv=None):
     """Función principal"""
-    parser = argparse.ArgumentParser(
-        description='Simulador de Motor Síncrono Trifásico',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Ejemplos de uso:
-
-  # Ejecutar interfaz gráfica
-  python main.py
-
-  # Ejecutar con modo verbose
-  python main.py --verbose
-
-  # Mostrar información del sistema
-  python main.py --info
-        """
-    )
-
-    parser.add_argument('--verbose', '-v', action='store_true',
-                       help='Modo verbose con más información')
-    parser.add_argument('--info', action='store_true',
-                       help='Mostrar información del sistema y salir')
-
-    args = parser.parse_args()
+    parser = build_parser()
+    args = parser.parse_args(argv)
 
     if args.info:
         show_system_info()
         return
 
+    if args.clear_cache:
+        clear_disk_cache(args.cache_dir)
+        return
+
+    configure_disk_cache(args.cache_dir, args.no_cache)
+
+    # Subcomandos sin interfaz gráfica (no importan PyQt6 ni matplotlib)
+    if args.command is not None:
+        try:
+            return args.handler(args)
+        except (ValueError, TypeError, KeyError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            if args.verbose:
+                import traceback
+                traceback.print_exc()
+            return 1
+
     if args.verbose:
         print("Iniciando Simulador de Motor Síncrono Trifásico...")
         print("Cargando módulos...")
@@ -71,13 +71,295 @@ Ejemplos de uso:
         sys.exit(1)
 
 
+def build_parser():
+    """Parser de la línea de comandos (interfaz gráfica y subcomandos por lotes)"""
+    parser = argparse.ArgumentParser(
+        description='Simulador de Motor Síncrono Trifásico',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+
+  # Ejecutar interfaz gráfica
+  python main.py
+
+  # Ejecutar con modo verbose
+  python main.py --verbose
+
+  # Mostrar información del sistema
+  python main.py --info
+
+  # Usar caché en disco de simulaciones transitorias
+  python main.py --cache-dir ~/.cache/motor_sincrono
+
+  # Vaciar la caché en disco
+  python main.py --clear-cache
+
+  # Ejecución por lotes sin interfaz gráfica
+  python main.py run-scenario startup_ideal voltage_sag --jobs 2 --output resultados
+  python main.py run-scenario overload_test --arg overload_ratios=[1.2,40] --params motor.json
+  python main.py sweep If 0.5 4.0 --points 200 --jobs 4 --output barrido_If
+  python main.py steady --set T_load=50 --json
+  python main.py bench --jobs 4
+        """
+    )
+
+    parser.add_argument('--verbose', '-v', action='store_true',
+                       help='Modo verbose con más información')
+    parser.add_argument('--info', action='store_true',
+                       help='Mostrar información del sistema y salir')
+    parser.add_argument('--cache-dir', metavar='DIR',
+                       help='Habilitar la caché en disco de simulaciones transitorias en DIR')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='No usar la caché en disco (ni MOTOR_SIM_CACHE_DIR)')
+    parser.add_argument('--clear-cache', action='store_true',
+                       help='Vaciar la caché en disco y salir')
+
+    # Opciones comunes de los subcomandos
+    motor_options = argparse.ArgumentParser(add_help=False)
+    motor_options.add_argument('--params', metavar='ARCHIVO',
+                               help='Archivo JSON con parámetros del motor (campos de MotorParameters)')
+    motor_options.add_argument('--set', metavar='NOMBRE=VALOR', action='append', default=[],
+                               help='Modificar un parámetro del motor (repetible)')
+    jobs_options = argparse.ArgumentParser(add_help=False)
+    jobs_options.add_argument('--jobs', '-j', type=int, default=1,
+                              help='Procesos en paralelo (por defecto 1)')
+
+    commands = parser.add_subparsers(dest='command', metavar='SUBCOMANDO')
+
+    run = commands.add_parser('run-scenario', parents=[motor_options, jobs_options],
+                              help='Ejecutar escenarios y guardar resultados binarios')
+    run.add_argument('scenarios', nargs='*', metavar='ESCENARIO',
+                     help='Escenarios a ejecutar (ver --list)')
+    run.add_argument('--list', action='store_true', help='Listar escenarios disponibles')
+    run.add_argument('--arg', metavar='NOMBRE=VALOR', action='append', default=[],
+                     help='Argumento del escenario, valor en JSON (repetible)')
+    run.add_argument('--output', '-o', default='resultados', metavar='DIR',
+                     help='Directorio de salida (un subdirectorio por escenario)')
+    run.set_defaults(handler=command_run_scenario)
+
+    sweep = commands.add_parser('sweep', parents=[motor_options, jobs_options],
+                                help='Barrido de régimen permanente de un parámetro')
+    sweep.add_argument('parameter', metavar='PARAMETRO')
+    sweep.add_argument('start', type=float, metavar='INICIO')
+    sweep.add_argument('stop', type=float, metavar='FIN')
+    sweep.add_argument('--points', '-n', type=int, default=20, help='Número de puntos')
+    sweep.add_argument('--output', '-o', metavar='DIR',
+                       help='Directorio del resultado columnar (por defecto barrido_<PARAMETRO>)')
+    sweep.set_defaults(handler=command_sweep)
+
+    steady = commands.add_parser('steady', parents=[motor_options],
+                                 help='Régimen permanente para un punto de operación')
+    steady.add_argument('--json', action='store_true', help='Imprimir el resultado en JSON')
+    steady.add_argument('--output', '-o', metavar='DIR',
+                        help='Guardar también como resultado columnar en DIR')
+    steady.set_defaults(handler=command_steady)
+
+    bench = commands.add_parser('bench', parents=[motor_options, jobs_options],
+                                help='Medir el rendimiento del simulador en este equipo')
+    bench.add_argument('--quick', action='store_true', help='Versión corta (para verificación)')
+    bench.add_argument('--output', '-o', metavar='ARCHIVO', help='Guardar las mediciones en JSON')
+    bench.set_defaults(handler=command_bench)
+
+    return parser
+
+
+# ==================== SUBCOMANDOS POR LOTES ====================
+
+def _parse_assignment(text):
+    """'nombre=valor' con el valor interpretado como JSON (o texto si no lo es)"""
+    name, separator, value = text.partition('=')
+    if not separator or not name:
+        raise ValueError(f"Se esperaba NOMBRE=VALOR: '{text}'")
+    try:
+        return name, json.loads(value)
+    except json.JSONDecodeError:
+        return name, value
+
+
+def load_parameters(params_file=None, assignments=()):
+    """MotorParameters a partir de un archivo JSON y asignaciones NOMBRE=VALOR"""
+    from motor_model import MotorParameters
+    from utils import coerce_parameter
+
+    values = {}
+    if params_file:
+        with open(params_file, 'r', encoding='utf-8') as handle:
+            values.update(json.load(handle))
+    values.update(_parse_assignment(text) for text in assignments)
+
+    unknown = set(values) - set(MotorParameters._fields)
+    if unknown:
+        raise ValueError(f"Parámetros del motor desconocidos: {sorted(unknown)}")
+    defaults = MotorParameters()
+    return defaults._replace(**{name: coerce_parameter(name, getattr(defaults, name), value)
+                                for name, value in values.items()})
+
+
+def _scenario_job(name, parameters, scenario_args, output):
+    """Tarea: ejecuta un escenario y guarda el resultado en output/name"""
+    from motor_model import SynchronousMotorModel
+    from scenarios import SimulationScenarios
+    from result_store import SimulationResult
+
+    start = time.perf_counter()
+    scenarios = SimulationScenarios(SynchronousMotorModel(parameters))
+    results = scenarios.run_scenario(name, **scenario_args)
+    stored = SimulationResult.from_results(results, parameters).save(Path(output) / name)
+    return {'scenario': name, 'samples': stored.n_samples, 'path': str(Path(output) / name),
+            'wall_time': time.perf_counter() - start}
+
+
+def command_run_scenario(args):
+    """Subcomando run-scenario"""
+    from scenarios import SimulationScenarios
+    from motor_model import SynchronousMotorModel
+
+    catalog = SimulationScenarios(SynchronousMotorModel())
+    available = catalog.get_available_scenarios()
+    if args.list or not args.scenarios:
+        for name in available:
+            print(f"{name:24s} {catalog.get_scenario_description(name)}")
+        return 0 if args.list else 2
+
+    unknown = [name for name in args.scenarios if name not in available]
+    if unknown:
+        raise ValueError(f"Escenarios desconocidos: {unknown}")
+    parameters = load_parameters(args.params, args.set)
+    scenario_args = dict(_parse_assignment(text) for text in args.arg)
+
+    jobs = [(name, parameters, scenario_args, args.output) for name in args.scenarios]
+    if args.jobs > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            summaries = list(executor.map(_scenario_job, *zip(*jobs)))
+    else:
+        summaries = [_scenario_job(*job) for job in jobs]
+
+    for summary in summaries:
+        print(f"✓ {summary['scenario']}: {summary['samples']} muestras en "
+              f"{summary['path']} ({summary['wall_time']:.2f} s)")
+    return 0
+
+
+def _rows_to_columns(rows):
+    """Lista de resultados (dicts) a columnas de NumPy"""
+    import numpy as np
+    return {name: np.asarray([row[name] for row in rows]) for name in rows[0]}
+
+
+def command_sweep(args):
+    """Subcomando sweep"""
+    from simulation_engine import SimulationEngine
+    from result_store import SimulationResult
+
+    parameters = load_parameters(args.params, args.set)
+    if args.parameter not in parameters._fields:
+        raise ValueError(f"Parámetro desconocido: {args.parameter}")
+
+    engine = SimulationEngine(parameters)
+    start = time.perf_counter()
+    if args.jobs > 1:
+        rows = engine.parallel_parameter_sweep(args.parameter, (args.start, args.stop),
+                                               args.points, max_workers=args.jobs)
+    else:
+        rows = engine.parameter_sweep(args.parameter, (args.start, args.stop), args.points)
+    wall_time = time.perf_counter() - start
+
+    output = args.output or f'barrido_{args.parameter}'
+    metadata = {'parameter': args.parameter, 'range': [args.start, args.stop],
+                'motor_parameters': parameters._asdict()}
+    SimulationResult(_rows_to_columns(rows), metadata).save(output)
+    print(f"✓ Barrido de {args.parameter}: {len(rows)} puntos en {output} ({wall_time:.2f} s)")
+    return 0
+
+
+def command_steady(args):
+    """Subcomando steady"""
+    from simulation_engine import SimulationEngine
+    from result_store import SimulationResult
+    from utils import finite_or_none
+
+    parameters = load_parameters(args.params, args.set)
+    result = SimulationEngine(parameters).solve_steady_state()
+
+    if args.output:
+        SimulationResult(_rows_to_columns([result]),
+                         {'motor_parameters': parameters._asdict()}).save(args.output)
+    if args.json:
+        print(json.dumps(finite_or_none(result), allow_nan=False))
+    else:
+        for name, value in result.items():
+            print(f"{name:20s} {value:.6g}" if isinstance(value, float) else f"{name:20s} {value}")
+    return 0
+
+
+def command_bench(args):
+    """Subcomando bench: mediciones de rendimiento sin interfaz gráfica"""
+    import numpy as np
+    from motor_model import SynchronousMotorModel
+    from simulation_engine import SimulationEngine
+    from realtime import RealTimeStepper
+
+    parameters = load_parameters(args.params, args.set)
+    scale = 10 if args.quick else 1
+    engine = SimulationEngine(parameters)
+    engine.disk_cache = None
+    measurements = {}
+
+    def timed(name, function, count, unit):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        measurements[name] = {'seconds': elapsed, 'rate': count / elapsed, 'unit': unit}
+        print(f"{name:28s} {elapsed:8.3f} s   {count / elapsed:12.0f} {unit}")
+
+    n_batch = 1_000_000 // scale
+    timed('steady_state_batch', lambda: engine.solve_steady_state_batch(
+        If=np.linspace(0.5, 4.0, n_batch)), n_batch, 'puntos/s')
+    t_final = 10.0 / scale
+    timed('transient', lambda: engine.simulate_transient_response((0, t_final)),
+          t_final, 's simulados/s')
+    n_sweep = 2000 // scale
+    timed(f'sweep (jobs={args.jobs})', lambda: engine.parallel_parameter_sweep(
+        'Rs', (0.1, 1.0), n_sweep, max_workers=args.jobs), n_sweep, 'puntos/s')
+    n_steps = 100_000 // scale
+    timed('realtime_step', lambda: RealTimeStepper(SynchronousMotorModel(parameters)).run(
+        n_steps, realtime=False), n_steps, 'pasos/s')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump({'jobs': args.jobs, 'quick': args.quick, 'results': measurements},
+                      handle, indent=2)
+    return 0
+
+
+def configure_disk_cache(cache_dir=None, no_cache=False):
+    """Configura la caché en disco según las opciones de línea de comandos"""
+    import disk_cache
+
+    if no_cache:
+        disk_cache.configure(enabled=False)
+    elif cache_dir:
+        disk_cache.configure(cache_dir)
+
+
+def clear_disk_cache(cache_dir=None):
+    """Vacía la caché en disco indicada (o la configurada por defecto)"""
+    import disk_cache
+
+    cache_dir = cache_dir or os.environ.get('MOTOR_SIM_CACHE_DIR') or disk_cache.DEFAULT_CACHE_DIR
+    removed = disk_cache.TransientDiskCache(cache_dir).clear()
+    print(f"Caché en disco vaciada: {removed} entradas eliminadas de {cache_dir}")
+
+
 def show_system_info():
     """Muestra información del sistema"""
     print("=== Información del Sistema ===")
     print(f"Python version: {sys.version}")
     print(f"Platform: {sys.platform}")
 
-    # Verificar dependencias
+    # Verificar dependencias sin importarlas (PyQt6, matplotlib y scipy
+    # suman varios segundos de arranque en frío)
     print("\n=== Verificación de Dependencias ===")
 
     dependencies = [
@@ -89,10 +371,10 @@ def show_system_info():
 
     for name, module in dependencies:
         try:
-            __import__(module)
-            print(f"✓ {name}: OK")
-        except ImportError:
-            print(f"✗ {name}: NO ENCONTRADO")
+            found = importlib.util.find_spec(module) is not None
+        except ImportError:  # paquete padre ausente
+            found = False
+        print(f"✓ {name}: OK" if found else f"✗ {name}: NO ENCONTRADO")
 
     print("\n=== Información del Simulador ===")
     print("Simulador de Motor Síncrono Trifásico v1.0")
@@ -101,4 +383,4 @@ def show_system_info():
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -7,15 +7,255 @@ Implementa las ecuaciones para:
 - Cálculos de potencias, pares y velocidades
 """
 
+import math
+import threading
 import numpy as np
 import cmath
-from typing import Dict, Tuple, Optional
+from collections import OrderedDict
+from typing import Dict, Tuple, Optional, NamedTuple, Callable, Any, Iterable
 from utils import (
     synchronous_speed_radps, phase_voltage, polar_to_rectangular,
-    rectangular_to_polar, calculate_power_factor, normalize_angle
+    rectangular_to_polar, calculate_power_factor, normalize_angle,
+    calculate_power_factor_array, normalize_angle_array
 )
 
 
+# Constante de proporcionalidad E_f = K_e * If (típica para motores pequeños)
+EMF_CONSTANT = 100.0  # V/A
+
+
+def pull_out_angle(T1, T2):
+    """
+    Ángulo de par máximo de la curva T(δ) = T1·sinδ + T2·sin2δ
+
+    Resuelve dT/dδ = T1·cosδ + 2·T2·cos2δ = 0 en forma cerrada
+    (cuadrática en cosδ). Acepta escalares o arrays.
+    """
+    T1 = np.asarray(T1, dtype=float)
+    T2 = np.asarray(T2, dtype=float)
+    # Raíz estable de 4·T2·c² + T1·c - 2·T2 = 0 (válida también para T2 = 0)
+    cos_delta = 4 * T2 / (T1 + np.sqrt(T1**2 + 32 * T2**2))
+    return np.arccos(np.clip(cos_delta, -1.0, 1.0))
+
+
+def two_axis_current(V_phasor, E_phasor, Rs, Xd, Xq):
+    """
+    Corriente del estator según la teoría de dos reacciones (polos salientes)
+
+    Resuelve V = E + Rs·I + j·Xd·Id + j·Xq·Iq en ejes solidarios a E, con
+    I = (iq + j·id)·e^{j∠E} y V·e^{-j∠E} = Vq + j·Vd:
+
+        Vq - E = Rs·iq - Xd·id        Vd = Rs·id + Xq·iq
+
+    Con Xd = Xq se reduce a (V - E)/(Rs + j·Xs).
+    Acepta escalares o arrays (con broadcasting).
+    """
+    rotation = np.exp(1j * np.angle(E_phasor))
+    V_rotated = V_phasor / rotation
+    V_q, V_d = np.real(V_rotated), np.imag(V_rotated)
+    E = np.abs(E_phasor)
+
+    det = Rs * Rs + Xd * Xq
+    i_q = (Rs * (V_q - E) + Xd * V_d) / det
+    i_d = (Rs * V_d - Xq * (V_q - E)) / det
+    return (i_q + 1j * i_d) * rotation
+
+
+def solve_load_angle(T1, T2, T_load, tol: float = 1e-12,
+                     max_iterations: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Resuelve T1·sinδ + T2·sin2δ = T_load para la rama estable de la curva
+
+    Con T2 = 0 la solución es δ = arcsin(T_load/T1). En el caso general se
+    aplican pasos de Newton con derivada analítica, protegidos por bisección
+    dentro del intervalo [0, δ_max]. Vectorizado sobre arrays.
+
+    Returns:
+        (delta, has_equilibrium): δ es NaN donde |T_load| supera el par máximo
+    """
+    T1, T2, T_load = np.broadcast_arrays(*[np.atleast_1d(np.asarray(x, dtype=float))
+                                           for x in (T1, T2, T_load)])
+    # La curva es impar: se resuelve para |T_L| y se restituye el signo
+    sign = np.where(T_load < 0, -1.0, 1.0)
+    target = np.abs(T_load)
+
+    delta_max = pull_out_angle(T1, T2)
+    T_max = T1 * np.sin(delta_max) + T2 * np.sin(2 * delta_max)
+    has_equilibrium = target <= T_max
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = np.arcsin(np.clip(target / T1, 0.0, 1.0))
+
+    if np.any(T2 != 0):
+        lo = np.zeros_like(delta)
+        hi = delta_max.copy()
+        delta = np.clip(delta, lo, hi)
+        for _ in range(max_iterations):
+            residual = T1 * np.sin(delta) + T2 * np.sin(2 * delta) - target
+            slope = T1 * np.cos(delta) + 2 * T2 * np.cos(2 * delta)
+
+            # Actualizar el intervalo que contiene la raíz
+            lo = np.where(residual < 0, delta, lo)
+            hi = np.where(residual > 0, delta, hi)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                newton = delta - residual / slope
+            inside = np.isfinite(newton) & (newton >= lo) & (newton <= hi)
+            new_delta = np.where(inside, newton, (lo + hi) / 2)
+
+            step = np.abs(new_delta - delta)
+            delta = new_delta
+            if np.all(step[has_equilibrium] < tol):
+                break
+
+    delta = np.where(has_equilibrium, sign * delta, np.nan)
+    return delta, has_equilibrium
+
+
+class MotorParameters(NamedTuple):
+    """
+    Registro inmutable de parámetros y variables de operación del motor
+
+    Es hashable (sirve como clave de memoización), no tiene __dict__
+    (__slots__ vacío) y se copia o serializa a bajo costo, por lo que puede
+    compartirse entre hilos y enviarse a procesos trabajadores sin el modelo.
+    Para obtener una variante se usa _replace(**cambios).
+    """
+    # Parámetros eléctricos por defecto (motor típico de 5 kVA)
+    Rs: float = 0.5  # ohm
+    Xd: float = 5.0  # ohm
+    Xq: float = 3.5  # ohm
+    Rf: float = 0.1  # ohm (opcional)
+
+    # Parámetros mecánicos por defecto
+    J: float = 0.1  # kg·m²
+    B: float = 0.01  # N·m·s/rad
+    p: int = 4  # número de polos
+
+    # Variables de operación
+    V_line: float = 400.0  # V
+    f: float = 50.0  # Hz
+    If: float = 2.0  # A
+    T_load: float = 10.0  # N·m
+    connection: str = 'star'  # 'star' o 'delta'
+
+
+# Entradas que pueden variar en el tiempo durante una simulación dinámica
+INPUT_NAMES = ('T_load', 'V_line', 'If', 'f')
+
+# Parámetros de los que depende cada cálculo memoizado
+STEADY_STATE_FIELDS = ('V_line', 'f', 'If', 'T_load', 'Rs', 'Xd', 'Xq', 'p', 'connection')
+TORQUE_CURVE_FIELDS = ('V_line', 'f', 'If', 'Xd', 'Xq', 'p', 'connection')
+EXCITATION_CURVE_FIELDS = ('V_line', 'f', 'Rs', 'Xd', 'Xq', 'p', 'connection')
+
+
+class ResultCache:
+    """
+    Caché LRU acotada para resultados de cálculos del motor
+
+    La clave es canónica: (nombre del cálculo, tupla con los valores de los
+    parámetros de los que depende, argumentos). Cada entrada recuerda esos
+    parámetros para poder invalidarla selectivamente. Los arrays cacheados
+    se marcan de solo lectura; maxsize = 0 deshabilita la caché.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, name: str, fields: Tuple[str, ...], parameters: MotorParameters,
+                       compute: Callable[..., Any], *args) -> Any:
+        """Retorna el resultado cacheado o lo calcula con compute(*args)"""
+        key = (name, tuple(getattr(parameters, field) for field in fields), args)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = _freeze(compute(*args))
+
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = (frozenset(fields), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+        return value
+
+    def invalidate(self, fields: Optional[Iterable[str]] = None) -> int:
+        """
+        Elimina las entradas que dependen de alguno de los parámetros dados
+        (todas si fields es None). Retorna el número de entradas eliminadas.
+        """
+        with self._lock:
+            if fields is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+
+            fields = set(fields)
+            stale = [key for key, (depends_on, _) in self._entries.items()
+                     if depends_on & fields]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self):
+        """Vacía la caché y reinicia los contadores"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """Estadísticas de uso de la caché"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+
+def _freeze(value: Any) -> Any:
+    """Marca como de solo lectura los arrays de un resultado cacheado"""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+    return value
+
+
+class _ParameterField:
+    """Atributo del modelo respaldado por su registro MotorParameters"""
+
+    __slots__ = ('name',)
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj._parameters, self.name)
+
+    def __set__(self, obj, value):
+        obj._parameters = obj._parameters._replace(**{self.name: value})
+
+
 class SynchronousMotorModel:
     """
     Modelo de motor síncrono trifásico con rotor de polos salientes
@@ -37,67 +277,105 @@ class SynchronousMotorModel:
     - If: corriente de excitación del rotor [A]
     - T_load: par de carga [N·m]
     - connection: tipo de conexión ('star' o 'delta')
+
+    Parámetros y variables de operación se almacenan en un registro inmutable
+    MotorParameters (ver la propiedad `parameters`); los atributos homónimos
+    leen de él y, al asignarse, lo reemplazan por una copia modificada.
     """
 
-    def __init__(self):
-        # Parámetros eléctricos por defecto (motor típico de 5 kVA)
-        self.Rs = 0.5  # ohm
-        self.Xd = 5.0  # ohm
-        self.Xq = 3.5  # ohm
-        self.Rf = 0.1  # ohm (opcional)
-
-        # Parámetros mecánicos por defecto
-        self.J = 0.1  # kg·m²
-        self.B = 0.01  # N·m·s/rad
-        self.p = 4  # número de polos
-
-        # Variables de operación
-        self.V_line = 400.0  # V
-        self.f = 50.0  # Hz
-        self.If = 2.0  # A
-        self.T_load = 10.0  # N·m
-        self.connection = 'star'  # 'star' o 'delta'
+    Rs = _ParameterField()
+    Xd = _ParameterField()
+    Xq = _ParameterField()
+    Rf = _ParameterField()
+    J = _ParameterField()
+    B = _ParameterField()
+    p = _ParameterField()
+    V_line = _ParameterField()
+    f = _ParameterField()
+    If = _ParameterField()
+    T_load = _ParameterField()
+    connection = _ParameterField()
+
+    def __init__(self, parameters: Optional[MotorParameters] = None,
+                 cache_size: int = 128):
+        # Parámetros y variables de operación (valores por defecto en MotorParameters)
+        self._parameters = MotorParameters() if parameters is None else parameters
+
+        # Caché de resultados en régimen permanente y curvas características
+        self.cache = ResultCache(cache_size)
 
         # Estado interno
         self.delta = 0.0  # ángulo de carga eléctrico [rad]
         self.omega_m = 0.0  # velocidad mecánica [rad/s]
         self.time = 0.0  # tiempo de simulación [s]
 
+    @property
+    def parameters(self) -> MotorParameters:
+        """Registro inmutable con los parámetros actuales del motor"""
+        return self._parameters
+
+    @parameters.setter
+    def parameters(self, parameters: MotorParameters):
+        if not isinstance(parameters, MotorParameters):
+            raise TypeError("Se esperaba una instancia de MotorParameters")
+        self._parameters = parameters
+
     def update_parameters(self, **params):
-        """Actualiza parámetros del modelo"""
+        """
+        Actualiza parámetros del modelo
+
+        Raises:
+            ValueError: si un parámetro del motor recibe un array (para varios
+                valores usar steady_state_analysis_batch); no se modifica ninguno
+        """
+        for key, value in params.items():
+            if key in MotorParameters._fields and np.ndim(value) != 0:
+                raise ValueError(f"El parámetro {key} debe ser escalar; para varios "
+                                 "valores use steady_state_analysis_batch()")
+
+        changed = []
         for key, value in params.items():
             if hasattr(self, key):
+                if key in MotorParameters._fields and getattr(self, key) != value:
+                    changed.append(key)
                 setattr(self, key, value)
 
+        # Invalidar resultados cacheados que dependen de los parámetros modificados
+        if changed:
+            self.cache.invalidate(changed)
+
         # Recalcular velocidad síncrona si cambian f o p
         if 'f' in params or 'p' in params:
             self.omega_m = synchronous_speed_radps(self.f, self.p)
 
     def get_electrical_parameters(self) -> Dict[str, float]:
         """Retorna parámetros eléctricos actuales"""
+        params = self._parameters
         return {
-            'Rs': self.Rs,
-            'Xd': self.Xd,
-            'Xq': self.Xq,
-            'Rf': self.Rf,
-            'p': self.p
+            'Rs': params.Rs,
+            'Xd': params.Xd,
+            'Xq': params.Xq,
+            'Rf': params.Rf,
+            'p': params.p
         }
 
     def get_mechanical_parameters(self) -> Dict[str, float]:
         """Retorna parámetros mecánicos actuales"""
+        params = self._parameters
         return {
-            'J': self.J,
-            'B': self.B,
-            'T_load': self.T_load
+            'J': params.J,
+            'B': params.B,
+            'T_load': params.T_load
         }
 
     def get_operating_parameters(self) -> Dict[str, float]:
         """Retorna parámetros de operación actuales"""
+        params = self._parameters
         return {
-            'V_line': self.V_line,
-            'f': self.f,
-            'If': self.If,
-            'connection': self.connection
+            'V_line': params.V_line,
+            'f': params.f,
+            'If': params.If,
+            'connection': params.connection
         }
 
     # ==================== CÁLCULOS BÁSICOS ====================
@@ -121,12 +399,9 @@ class SynchronousMotorModel:
         Calcula la fuerza electromotriz interna E_f
         E_f es proporcional a la corriente de excitación If
         """
-        # Constante de proporcionalidad (puede ajustarse según el motor)
-        K_e = 100.0  # V/A (típico para motores pequeños)
-
         # E_f = K_e * If (magnitud)
         # Fase inicial = 0 (referencia)
-        E_f_magnitude = K_e * self.If
+        E_f_magnitude = EMF_CONSTANT * self.If
 
         # El ángulo de E_f depende del ángulo de carga δ
         # Para motor: E_f está adelantado respecto a V por el ángulo δ
@@ -134,20 +409,12 @@ class SynchronousMotorModel:
 
     def calculate_current_phasor(self, V_phasor: complex, E_phasor: complex) -> complex:
         """
-        Calcula el fasor de corriente usando el modelo simplificado
-        V = E + j Xs I + Rs I
+        Calcula el fasor de corriente con el modelo de polos salientes
+        V = E + Rs I + j Xd Id + j Xq Iq
 
-        Para polos salientes, usamos Xs promedio o consideramos el ángulo.
-        Para simplificar, usamos Xs = (Xd + Xq)/2
+        (ver two_axis_current; con Xd = Xq coincide con V = E + (Rs + j Xs) I)
         """
-        Xs_avg = (self.Xd + self.Xq) / 2
-
-        # Ecuación: V = E + (Rs + j Xs) I
-        # I = (V - E) / (Rs + j Xs)
-        impedance = complex(self.Rs, Xs_avg)
-        I_phasor = (V_phasor - E_phasor) / impedance
-
-        return I_phasor
+        return complex(two_axis_current(V_phasor, E_phasor, self.Rs, self.Xd, self.Xq))
 
     def calculate_load_angle(self, V_phasor: complex, E_phasor: complex) -> float:
         """
@@ -180,20 +447,40 @@ class SynchronousMotorModel:
 
         return T_e
 
-    def calculate_torque_from_angle(self, delta: float) -> float:
+    def torque_coefficients(self, V_line=None, f=None, If=None,
+                            Xd=None, Xq=None, p=None) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Calcula el par electromagnético usando la fórmula clásica
-        T_e = (3 V E / ω_s Xs) * sinδ
+        Coeficientes (T1, T2) de la curva par-ángulo T_e = T1·sinδ + T2·sin2δ
 
-        Donde Xs es la reactancia síncrona promedio
+        Modelo de polos salientes (dos reacciones):
+            T1 = 3 V E / (ω_s Xd)                 (par de excitación)
+            T2 = 3 V² (1/Xq - 1/Xd) / (2 ω_s)     (par de reluctancia)
+        Los argumentos omitidos toman el valor actual del modelo; acepta arrays.
         """
-        V_phase = self.phase_voltage()
-        E_magnitude = abs(self.calculate_internal_voltage())
-        omega_s = self.synchronous_speed()
-        Xs_avg = (self.Xd + self.Xq) / 2
+        V_line = self.V_line if V_line is None else np.asarray(V_line, dtype=float)
+        f = self.f if f is None else np.asarray(f, dtype=float)
+        If = self.If if If is None else np.asarray(If, dtype=float)
+        Xd = self.Xd if Xd is None else np.asarray(Xd, dtype=float)
+        Xq = self.Xq if Xq is None else np.asarray(Xq, dtype=float)
+        p = self.p if p is None else np.asarray(p, dtype=float)
+
+        V_phase = phase_voltage(V_line, self.connection)
+        E_magnitude = EMF_CONSTANT * np.abs(If)
+        omega_s = synchronous_speed_radps(f, p)
+        T1 = 3 * V_phase * E_magnitude / (omega_s * Xd)
+        T2 = 3 * V_phase**2 * (1 / Xq - 1 / Xd) / (2 * omega_s)
+        T1, T2 = (np.array(c) for c in np.broadcast_arrays(T1, T2))
+        return T1, T2
+
+    def calculate_torque_from_angle(self, delta: float) -> float:
+        """
+        Calcula el par electromagnético de un motor de polos salientes
+        T_e = (3/ω_s) [V E/Xd sinδ + V²(1/Xq - 1/Xd)/2 sin2δ]
 
-        T_e_max = 3 * V_phase * E_magnitude / (omega_s * Xs_avg)
-        T_e = T_e_max * np.sin(delta)
+        (par de excitación más par de reluctancia); acepta arrays de δ
+        """
+        T1, T2 = self.torque_coefficients()
+        T_e = T1 * np.sin(delta) + T2 * np.sin(2 * delta)
 
         return T_e
 
@@ -226,6 +513,45 @@ class SynchronousMotorModel:
             'pf_type': pf_type  # 'inductivo', 'capacitivo', 'unidad'
         }
 
+    def trajectory_quantities(self, delta: np.ndarray, V_line=None, f=None, If=None,
+                              Rs=None, Xd=None, Xq=None, p=None) -> Dict[str, np.ndarray]:
+        """
+        Variables derivadas a lo largo de una trayectoria δ(t), en forma vectorizada
+
+        Usa fasores V = V∠0 y E = E∠-δ (E atrasado respecto de V en el motor),
+        la corriente de dos reacciones (two_axis_current) y S = 3 V* I.
+        No modifica el estado del modelo.
+        Las entradas y parámetros pueden ser arrays que hagan broadcasting con δ
+        (entradas variables en el tiempo o parámetros por miembro de un ensamble).
+        """
+        delta = np.asarray(delta, dtype=float)
+        V_line = self.V_line if V_line is None else np.asarray(V_line, dtype=float)
+        If = self.If if If is None else np.asarray(If, dtype=float)
+        Rs = self.Rs if Rs is None else np.asarray(Rs, dtype=float)
+        Xd = self.Xd if Xd is None else np.asarray(Xd, dtype=float)
+        Xq = self.Xq if Xq is None else np.asarray(Xq, dtype=float)
+
+        # Par electromagnético
+        T1, T2 = self.torque_coefficients(V_line=V_line, f=f, If=If, Xd=Xd, Xq=Xq, p=p)
+        T_e = T1 * np.sin(delta) + T2 * np.sin(2 * delta)
+
+        # Fasores y potencias
+        V_phasor = phase_voltage(V_line, self.connection) + 0j
+        E_phasor = EMF_CONSTANT * If * np.exp(-1j * delta)
+        I_phasor = two_axis_current(V_phasor, E_phasor, Rs, Xd, Xq)
+        S_complex = 3 * np.conj(V_phasor) * I_phasor
+
+        P = S_complex.real
+        Q = S_complex.imag
+        pf, _ = calculate_power_factor_array(P, np.abs(S_complex))
+
+        return {
+            'T_e': T_e,  # par electromagnético [N·m]
+            'P': P,  # potencia activa [W]
+            'Q': Q,  # potencia reactiva [VAR]
+            'pf': pf  # factor de potencia [0-1]
+        }
+
     # ==================== ANÁLISIS EN RÉGIMEN PERMANENTE ====================
 
     def steady_state_analysis(self) -> Dict[str, float]:
@@ -233,39 +559,71 @@ class SynchronousMotorModel:
         Realiza análisis completo en régimen permanente
         Retorna todas las variables calculadas
         """
-        # Fasores de tensión (referencia en 0°)
-        V_phase = self.phase_voltage()
-        V_phasor = polar_to_rectangular(V_phase, 0)
+        results = self.cache.get_or_compute('steady_state_analysis', STEADY_STATE_FIELDS,
+                                            self._parameters, self._steady_state_analysis)
+        return dict(results)
+
+    def _steady_state_analysis(self) -> Dict[str, float]:
+        """Análisis en régimen permanente sin caché"""
+        # Caso particular de un único punto de operación
+        batch = self.steady_state_analysis_batch()
+        return {key: values[0].item() for key, values in batch.items()}
+
+    def steady_state_analysis_batch(self, V_line=None, f=None, If=None, T_load=None,
+                                    Rs=None, Xd=None, Xq=None, p=None) -> Dict[str, np.ndarray]:
+        """
+        Análisis en régimen permanente vectorizado sobre múltiples puntos de operación
 
-        # Fuerza electromotriz interna
-        E_phasor = self.calculate_internal_voltage()
+        Cada argumento puede ser un escalar o un array (con broadcasting entre
+        ellos); los argumentos omitidos toman el valor actual del modelo.
+        Retorna un resultado columnar: las mismas claves que steady_state_analysis(),
+        con un array de un elemento por punto de operación.
+        """
+        inputs = {
+            'V_line': V_line, 'f': f, 'If': If, 'T_load': T_load,
+            'Rs': Rs, 'Xd': Xd, 'Xq': Xq, 'p': p
+        }
+        V_line, f, If, T_load, Rs, Xd, Xq, p = np.broadcast_arrays(*[
+            np.atleast_1d(np.asarray(getattr(self, name) if value is None else value, dtype=float))
+            for name, value in inputs.items()
+        ])
 
-        # Corriente
-        I_phasor = self.calculate_current_phasor(V_phasor, E_phasor)
+        # Fasores de tensión (referencia en 0°) y fuerza electromotriz interna
+        V_phase = phase_voltage(V_line, self.connection)
+        V_phasor = V_phase + 0j
+        E_phasor = EMF_CONSTANT * If + 0j
 
-        # Ángulo de carga
-        delta = self.calculate_load_angle(V_phasor, E_phasor)
+        # Corriente según la teoría de dos reacciones (Xd, Xq)
+        I_phasor = two_axis_current(V_phasor, E_phasor, Rs, Xd, Xq)
+        I_magnitude = np.abs(I_phasor)
+        I_angle = np.degrees(np.angle(I_phasor))
 
-        # Par electromagnético
-        T_e = self.calculate_electromagnetic_torque(V_phasor, I_phasor)
+        # Ángulo de carga δ = ∠E - ∠V
+        delta = np.radians(normalize_angle_array(
+            np.degrees(np.angle(E_phasor)) - np.degrees(np.angle(V_phasor))))
 
-        # Potencias
-        powers = self.calculate_powers(V_phasor, I_phasor)
+        # Velocidad
+        omega_s = synchronous_speed_radps(f, p)
+        n_s = 120 * f / p
 
-        # Magnitudes de corriente
-        I_magnitude, I_angle = rectangular_to_polar(I_phasor)
+        # Potencias totales (3 fases) y factor de potencia
+        V_magnitude = np.abs(V_phasor)
+        phi = np.angle(I_phasor) - np.angle(V_phasor)
+        S = 3 * V_magnitude * I_magnitude
+        P = S * np.cos(phi)
+        Q = S * np.sin(phi)
+        pf, pf_type = calculate_power_factor_array(P, S)
 
-        # Velocidad
-        omega_s = self.synchronous_speed()
-        n_s = self.synchronous_speed_rpm()
+        # Par electromagnético T_e = P / ω_s
+        T_e = P / omega_s
 
         return {
             # Parámetros de entrada
-            'V_line': self.V_line,
+            'V_line': V_line,
             'V_phase': V_phase,
-            'f': self.f,
-            'If': self.If,
-            'T_load': self.T_load,
+            'f': f,
+            'If': If,
+            'T_load': T_load,
 
             # Variables calculadas
             'omega_s': omega_s,  # velocidad síncrona [rad/s]
@@ -277,14 +635,44 @@ class SynchronousMotorModel:
             'T_e': T_e,  # par electromagnético [N·m]
 
             # Fasores (magnitudes)
-            'E_magnitude': abs(E_phasor),
-            'V_magnitude': abs(V_phasor),
+            'E_magnitude': np.abs(E_phasor),
+            'V_magnitude': V_magnitude,
 
-            **powers  # potencias
+            # Potencias
+            'S': S,  # potencia aparente [VA]
+            'P': P,  # potencia activa [W]
+            'Q': Q,  # potencia reactiva [VAR]
+            'pf': pf,  # factor de potencia [0-1]
+            'pf_type': pf_type  # 'inductivo', 'capacitivo', 'unidad'
         }
 
     # ==================== MODELO DINÁMICO ====================
 
+    def dynamics_jacobian(self, delta: np.ndarray, V_line=None, f=None, If=None,
+                          Xd=None, Xq=None, p=None, J=None, B=None) -> np.ndarray:
+        """
+        Jacobiano analítico de dynamic_model_derivatives() respecto de (ω_m, δ)
+
+            | ∂ω̇/∂ω  ∂ω̇/∂δ |   | -B/J   K/J |
+            | ∂δ̇/∂ω  ∂δ̇/∂δ | = |  -1     0  |,   K = dT_e/dδ = T1 cosδ + 2 T2 cos2δ
+
+        K es el par sincronizante. Acepta arrays (con broadcasting); retorna
+        un array de forma (..., 2, 2).
+        """
+        delta = np.asarray(delta, dtype=float)
+        J = self.J if J is None else np.asarray(J, dtype=float)
+        B = self.B if B is None else np.asarray(B, dtype=float)
+
+        T1, T2 = self.torque_coefficients(V_line=V_line, f=f, If=If, Xd=Xd, Xq=Xq, p=p)
+        K = T1 * np.cos(delta) + 2 * T2 * np.cos(2 * delta)
+        K, J, B = np.broadcast_arrays(K, J, B)
+
+        jacobian = np.zeros(K.shape + (2, 2))
+        jacobian[..., 0, 0] = -B / J
+        jacobian[..., 0, 1] = K / J
+        jacobian[..., 1, 0] = -1.0
+        return jacobian
+
     def dynamic_model_derivatives(self, state: np.ndarray, t: float) -> np.ndarray:
         """
         Ecuaciones diferenciales para simulación dinámica
@@ -308,9 +696,20 @@ class SynchronousMotorModel:
 
         return np.array([d_omega_m_dt, d_delta_dt])
 
+    def compile_dynamics(self, inputs: Optional[Dict[str, Any]] = None) -> 'CompiledDynamics':
+        """
+        Construye el lado derecho compilado del modelo dinámico
+
+        Precalcula las constantes de dynamic_model_derivatives() para los
+        parámetros actuales; debe reconstruirse si éstos cambian.
+        inputs: entradas variables en el tiempo (ver CompiledDynamics)
+        """
+        return CompiledDynamics(self, inputs)
+
     def simulate_transient(self, t_span: Tuple[float, float],
                           initial_omega: Optional[float] = None,
-                          initial_delta: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+                          initial_delta: Optional[float] = None,
+                          compiled: bool = True) -> Tuple[np.ndarray, np.ndarray]:
         """
         Simula comportamiento transitorio usando integración numérica
         """
@@ -327,9 +726,12 @@ class SynchronousMotorModel:
         # Tiempo de simulación
         t = np.linspace(t_span[0], t_span[1], 1000)
 
+        # Lado derecho: compilado (constantes precalculadas) o de referencia
+        derivatives = self.compile_dynamics().odeint if compiled else self.dynamic_model_derivatives
+
         # Integración numérica
         try:
-            solution = odeint(self.dynamic_model_derivatives, state0, t)
+            solution = odeint(derivatives, state0, t)
             return t, solution
         except Exception as e:
             print(f"Error en simulación dinámica: {e}")
@@ -342,38 +744,168 @@ class SynchronousMotorModel:
         """
         Genera la curva característica T_e vs δ
         """
+        return self.cache.get_or_compute('torque_angle_curve', TORQUE_CURVE_FIELDS,
+                                         self._parameters, self._torque_angle_curve,
+                                         tuple(delta_range), num_points)
+
+    def _torque_angle_curve(self, delta_range: Tuple[float, float],
+                            num_points: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Curva par-ángulo sin caché (evaluación vectorizada)"""
         deltas = np.linspace(delta_range[0], delta_range[1], num_points)
-        torques = np.array([self.calculate_torque_from_angle(delta) for delta in deltas])
+        torques = self.calculate_torque_from_angle(deltas)
 
         return deltas, torques
 
     def maximum_torque(self) -> Tuple[float, float]:
         """
         Calcula el par máximo y el ángulo correspondiente
+
+        Solución exacta en forma cerrada (ver pull_out_torque)
+        """
+        T_max, delta_max = self.pull_out_torque()
+        return float(T_max), float(delta_max)
+
+    def pull_out_torque(self, V_line=None, f=None, If=None, Xd=None, Xq=None,
+                        p=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Par máximo (de pérdida de sincronismo) y su ángulo, vectorizado
+
+        δ_max anula dT/dδ = T1 cosδ + 2 T2 cos2δ (cuadrática en cosδ, ver
+        pull_out_angle). Los argumentos omitidos toman el valor del modelo.
         """
-        deltas, torques = self.torque_angle_curve()
-        max_idx = np.argmax(torques)
-        return torques[max_idx], deltas[max_idx]
+        T1, T2 = self.torque_coefficients(V_line=V_line, f=f, If=If, Xd=Xd, Xq=Xq, p=p)
+        delta_max = pull_out_angle(T1, T2)
+        return T1 * np.sin(delta_max) + T2 * np.sin(2 * delta_max), delta_max
 
     def power_factor_vs_excitation(self, If_range: Tuple[float, float] = (0.1, 5.0),
                                  num_points: int = 50) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Genera curva de factor de potencia vs corriente de excitación
         """
+        return self.cache.get_or_compute('power_factor_vs_excitation', EXCITATION_CURVE_FIELDS,
+                                         self._parameters, self._power_factor_vs_excitation,
+                                         tuple(If_range), num_points)
+
+    def _power_factor_vs_excitation(self, If_range: Tuple[float, float],
+                                    num_points: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Curva de factor de potencia sin caché (evaluación por lotes)"""
         If_values = np.linspace(If_range[0], If_range[1], num_points)
-        pf_values = []
-        pf_types = []
+        results = self.steady_state_analysis_batch(If=If_values)
+
+        return If_values, results['pf'], results['pf_type']
 
-        # Guardar valor actual de If
-        original_If = self.If
 
-        for If in If_values:
-            self.If = If
-            results = self.steady_state_analysis()
-            pf_values.append(results['pf'])
-            pf_types.append(results['pf_type'])
+class CompiledDynamics:
+    """
+    Lado derecho compilado de las ecuaciones dinámicas del motor
+
+    Equivalente a SynchronousMotorModel.dynamic_model_derivatives(), pero con
+    T1, T2, ω_s, T_L, B y J precalculados una sola vez por simulación y
+    aritmética escalar en cada evaluación.
+
+    Entradas variables en el tiempo: `inputs` asocia nombres de INPUT_NAMES a
+    un valor constante o a un perfil (objeto invocable v(t), ver profiles.py)
+    que se evalúa en cada llamada.
+
+    Firmas disponibles:
+    - rhs(t, state): para solve_ivp. Retorna un array nuevo, porque solve_ivp
+      conserva referencias a evaluaciones previas (selección del paso inicial,
+      reintentos de pasos rechazados) y un buffer compartido las corrompería.
+    - rhs.odeint(state, t): para odeint, escribe en un buffer preasignado
+      (odeint copia el resultado de inmediato).
+    - rhs.into(t, state, out): escribe en un array provisto por el llamador,
+      para integradores de paso fijo.
+    """
 
-        # Restaurar valor original
-        self.If = original_If
+    __slots__ = ('T1', 'T2', 'omega_s', 'T_load', 'B', 'J', '_buffer',
+                 '_T_load_profile', '_V_line_profile', '_If_profile', '_f_profile',
+                 '_electrical', '_V_line', '_If', '_f', '_T1_unit', '_T2_unit',
+                 '_omega_s_unit', '_t_hold')
+
+    def __init__(self, motor: SynchronousMotorModel, inputs: Optional[Dict[str, Any]] = None):
+        inputs = dict(inputs or {})
+        unknown = set(inputs) - set(INPUT_NAMES)
+        if unknown:
+            raise ValueError(f"Entradas desconocidas: {sorted(unknown)}")
+
+        # Las entradas constantes sustituyen al parámetro; los perfiles se
+        # evalúan en cada llamada
+        constants = {name: float(value) for name, value in inputs.items()
+                     if not callable(value)}
+        profiles = {name: value for name, value in inputs.items() if callable(value)}
+
+        T1, T2 = motor.torque_coefficients(V_line=constants.get('V_line'),
+                                           f=constants.get('f'), If=constants.get('If'))
+        self.T1 = float(T1)
+        self.T2 = float(T2)
+        self._V_line = constants.get('V_line', float(motor.V_line))
+        self._f = constants.get('f', float(motor.f))
+        self._If = constants.get('If', float(motor.If))
+        self.omega_s = float(synchronous_speed_radps(self._f, motor.p))
+        self.T_load = constants.get('T_load', float(motor.T_load))
+        self.B = float(motor.B)
+        self.J = float(motor.J)
+        self._buffer = np.empty(2)
+
+        self._T_load_profile = profiles.get('T_load')
+
+        # Entradas eléctricas variables: T1 ∝ V·|If|/f, T2 ∝ V²/f y ω_s ∝ f,
+        # con coeficientes por unidad calculados una vez (V = 1 V, If = 1 A, f = 1 Hz)
+        self._V_line_profile = profiles.get('V_line')
+        self._If_profile = profiles.get('If')
+        self._f_profile = profiles.get('f')
+        self._electrical = any(profile is not None for profile in (
+            self._V_line_profile, self._If_profile, self._f_profile))
+        T1_unit, T2_unit = motor.torque_coefficients(V_line=1.0, f=1.0, If=1.0)
+        self._T1_unit = float(T1_unit)
+        self._T2_unit = float(T2_unit)
+        self._omega_s_unit = float(synchronous_speed_radps(1.0, motor.p))
+        self._t_hold = math.inf
+
+    def hold_inputs_before(self, t_end: float) -> None:
+        """
+        Evalúa los perfiles a lo sumo en el límite por izquierda de t_end
 
-        return If_values, np.array(pf_values), np.array(pf_types)
+        Los perfiles escalonados son continuos por derecha: al integrar un
+        tramo [t_i, t_end) por separado, la última etapa de RK45 (en t_end)
+        leería ya el valor del tramo siguiente. Con el límite, las entradas
+        del tramo quedan constantes hasta su extremo. math.inf lo desactiva.
+        """
+        self._t_hold = math.nextafter(t_end, -math.inf) if math.isfinite(t_end) else math.inf
+
+    def update_inputs(self, t: float) -> None:
+        """Evalúa los perfiles de entrada en el instante t (ver hold_inputs_before)"""
+        if t > self._t_hold:
+            t = self._t_hold
+        if self._T_load_profile is not None:
+            self.T_load = self._T_load_profile(t)
+        if self._electrical:
+            self.set_electrical(
+                self._V_line if self._V_line_profile is None else self._V_line_profile(t),
+                self._If if self._If_profile is None else self._If_profile(t),
+                self._f if self._f_profile is None else self._f_profile(t))
+
+    def set_electrical(self, V_line: float, If: float, f: float) -> None:
+        """Actualiza T1, T2 y ω_s para nuevas entradas eléctricas (sin asignar arrays)"""
+        self.T1 = self._T1_unit * V_line * abs(If) / f
+        self.T2 = self._T2_unit * V_line * V_line / f
+        self.omega_s = self._omega_s_unit * f
+
+    def derivatives(self, omega_m: float, delta: float) -> Tuple[float, float]:
+        """Derivadas (dω_m/dt, dδ/dt) para un estado escalar"""
+        T_e = self.T1 * math.sin(delta) + self.T2 * math.sin(2 * delta)
+        return (T_e - self.T_load - self.B * omega_m) / self.J, self.omega_s - omega_m
+
+    def __call__(self, t: float, state: np.ndarray) -> np.ndarray:
+        self.update_inputs(t)
+        omega_m, delta = state.tolist()
+        return np.array(self.derivatives(omega_m, delta))
+
+    def odeint(self, state: np.ndarray, t: float) -> np.ndarray:
+        return self.into(t, state, self._buffer)
+
+    def into(self, t: float, state: np.ndarray, out: np.ndarray) -> np.ndarray:
+        self.update_inputs(t)
+        omega_m, delta = state.tolist()
+        out[0], out[1] = self.derivatives(omega_m, delta)
+        return out
@@ -7,15 +7,21 @@ Implementa:
 - Animación de cambios en tiempo real
 """
 
+from __future__ import annotations
+
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.axes import Axes
-from matplotlib.patches import Arc, FancyArrowPatch
-from typing import Dict, Tuple, Optional, List
-import matplotlib.animation as animation
+from typing import Dict, Tuple, Optional, List, TYPE_CHECKING
 from motor_model import SynchronousMotorModel
-from utils import polar_to_rectangular, rectangular_to_polar
+from utils import polar_to_rectangular, rectangular_to_polar, lazy_import
+
+# matplotlib se importa al crear el primer diagrama, no al importar el módulo
+plt = lazy_import('matplotlib.pyplot')
+patches = lazy_import('matplotlib.patches')
+animation = lazy_import('matplotlib.animation')
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from matplotlib.axes import Axes
 
 
 class PhasorDiagram:
@@ -123,7 +129,7 @@ class PhasorDiagram:
         x, y = phasor.real, phasor.imag
 
         # Dibujar flecha
-        arrow = FancyArrowPatch((0, 0), (x, y),
+        arrow = patches.FancyArrowPatch((0, 0), (x, y),
                                arrowstyle='->',
                                color=color,
                                linewidth=2,
@@ -155,14 +161,17 @@ class PhasorDiagram:
         """
         Dibuja las caídas de tensión en el diagrama fasorial
 
-        V = E + Rs*I + j*Xs*I
+        V = E + Rs*I + j*Xd*Id + j*Xq*Iq
         """
-        # Calcular caídas
+        # Calcular caídas (Iq en fase con E, Id en cuadratura)
         Rs = self.motor.Rs
-        Xs_avg = (self.motor.Xd + self.motor.Xq) / 2
+        E_direction = np.exp(1j * np.angle(E_phasor))
+        I_aligned = I_phasor / E_direction
+        Iq = I_aligned.real * E_direction
+        Id = 1j * I_aligned.imag * E_direction
 
         RsI = complex(Rs, 0) * I_phasor
-        jXsI = complex(0, Xs_avg) * I_phasor
+        jXsI = 1j * (self.motor.Xd * Id + self.motor.Xq * Iq)
 
         # Escalar para visualización
         scale = 1 / self.scale_factor
@@ -176,12 +185,12 @@ class PhasorDiagram:
             self._draw_phasor_component(ax, start_point, end_point,
                                       'RsI', self.colors['RsI'], 'Rs·I')
 
-        # Dibujar jXs*I (caída reactiva)
+        # Dibujar j*Xd*Id + j*Xq*Iq (caída reactiva)
         if abs(jXsI_scaled) > 0.01:
             start_point = E_phasor + RsI_scaled
             end_point = V_phasor
             self._draw_phasor_component(ax, start_point, end_point,
-                                      'jXsI', self.colors['jXsI'], 'j·Xs·I')
+                                      'jXsI', self.colors['jXsI'], 'j·Xd·Id + j·Xq·Iq')
 
     def _draw_phasor_component(self, ax: Axes, start: complex, end: complex,
                               label: str, color: str, label_text: str) -> None:
@@ -197,7 +206,7 @@ class PhasorDiagram:
 
         # Dibujar flecha pequeña
         dx, dy = x_end - x_start, y_end - y_start
-        arrow = FancyArrowPatch((x_start, y_start), (x_end, y_end),
+        arrow = patches.FancyArrowPatch((x_start, y_start), (x_end, y_end),
                                arrowstyle='->',
                                color=color,
                                linewidth=1.5,
@@ -8,19 +8,36 @@ Implementa gráficos y curvas para:
 - Otras visualizaciones relevantes
 """
 
+from __future__ import annotations
+
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.axes import Axes
-from typing import Dict, List, Tuple, Optional, Any
-import matplotlib.patches as patches
+from typing import Dict, List, Tuple, Optional, Any, TYPE_CHECKING
 from motor_model import SynchronousMotorModel
 from simulation_engine import SimulationEngine
+from result_store import SimulationResult
+from utils import lazy_import
+
+# matplotlib se importa al crear el primer gráfico, no al importar el módulo
+plt = lazy_import('matplotlib.pyplot')
+patches = lazy_import('matplotlib.patches')
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from matplotlib.axes import Axes
 
 
 class MotorPlots:
     """
     Generador de gráficos para análisis del motor síncrono
+
+    Resultados transitorios: create_transient_plots() y
+    create_comparison_plot() aceptan diccionarios o SimulationResult
+    (p.ej. columnas mapeadas desde disco) y los submuestrean con
+    _decimated() antes de graficar, de modo que sólo se leen max_points
+    muestras. Los demás gráficos calculan sus propios datos con el motor
+    (curvas par-ángulo, factor de potencia, barridos) o reciben un único
+    punto de régimen permanente (create_motor_status_display), no
+    trayectorias.
     """
 
     def __init__(self, motor_model: SynchronousMotorModel):
@@ -91,15 +108,20 @@ class MotorPlots:
         return fig
 
     def create_transient_plots(self, transient_data: Dict[str, np.ndarray],
-                             figsize: Tuple[float, float] = (12, 8)) -> Figure:
+                             figsize: Tuple[float, float] = (12, 8),
+                             max_points: int = 20000) -> Figure:
         """
         Crea gráficos de evolución temporal para simulación transitoria
 
         Incluye velocidad, ángulo de carga, pares y potencias.
+        transient_data puede ser un diccionario de resultados o un
+        SimulationResult (p.ej. mapeado desde disco); se grafican a lo sumo
+        max_points muestras.
         """
         fig, axes = plt.subplots(2, 2, figsize=figsize)
         fig.suptitle('Evolución Temporal - Simulación Transitoria', fontsize=14)
 
+        transient_data = self._decimated(transient_data, max_points)
         t = transient_data.get('time', np.array([]))
         if len(t) == 0:
             return fig
@@ -250,14 +272,17 @@ class MotorPlots:
 
     def create_comparison_plot(self, results_list: List[Dict[str, Any]],
                               variables: List[str], labels: List[str],
-                              figsize: Tuple[float, float] = (12, 8)) -> Figure:
+                              figsize: Tuple[float, float] = (12, 8),
+                              max_points: int = 20000) -> Figure:
         """
         Crea gráfico comparativo de múltiples simulaciones
 
         Útil para comparar diferentes escenarios o configuraciones.
+        Acepta diccionarios de resultados o SimulationResult.
         """
         if len(results_list) != len(labels):
             raise ValueError("El número de resultados debe coincidir con el número de etiquetas")
+        results_list = [self._decimated(results, max_points) for results in results_list]
 
         num_vars = len(variables)
         fig, axes = plt.subplots((num_vars + 1) // 2, 2, figsize=figsize)
@@ -425,6 +450,14 @@ class MotorPlots:
         connection = self.motor.connection
         ax.text(1, y_pos, f'Conexión: {connection}', fontsize=10)
 
+    def _decimated(self, data: Dict[str, Any], max_points: int) -> Dict[str, Any]:
+        """Resultados submuestreados a lo sumo max_points muestras para graficar"""
+        if not isinstance(data, SimulationResult):
+            if 'time' not in data:
+                return data
+            data = SimulationResult.from_results(data)
+        return data.decimate(max_points)
+
     def _get_parameter_label(self, parameter: str) -> str:
         """Retorna etiqueta descriptiva para parámetros"""
         labels = {
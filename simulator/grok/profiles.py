@@ -0,0 +1,181 @@
+"""
+Perfiles temporales de entrada para el simulador de motor síncrono
+
+Definen la evolución en el tiempo de variables de entrada (par de carga,
+excitación, tensión, frecuencia) para simulaciones dinámicas:
+- Evaluación escalar rápida dentro del lado derecho de las EDO
+- Evaluación vectorizada sobre la malla de salida
+- Instantes de discontinuidad para que el integrador se detenga en ellos
+"""
+
+import bisect
+import hashlib
+import numpy as np
+from typing import Dict, List, Sequence, Tuple, Any
+
+
+class PiecewiseProfile:
+    """
+    Perfil definido por tramos a partir de nodos (t_i, v_i)
+
+    - kind='step': v(t) = v_i para t_i <= t < t_(i+1) (escalonado)
+    - kind='linear': interpolación lineal entre nodos
+
+    Fuera del rango de nodos el perfil mantiene el primer/último valor.
+    """
+
+    def __init__(self, times: Sequence[float], values: Sequence[float], kind: str = 'step'):
+        if kind not in ('step', 'linear'):
+            raise ValueError(f"Tipo de perfil desconocido: {kind}")
+        if len(times) != len(values) or len(times) == 0:
+            raise ValueError("times y values deben tener la misma longitud (no nula)")
+        if np.any(np.diff(times) < 0):
+            raise ValueError("Los instantes del perfil deben estar ordenados")
+
+        self.kind = kind
+        self.times = np.asarray(times, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+
+        # Listas de Python para la evaluación escalar (bisect sin sobrecarga de NumPy)
+        self._times = self.times.tolist()
+        self._values = self.values.tolist()
+
+    @classmethod
+    def steps(cls, levels: Sequence[float], step_duration: float,
+              t_start: float = 0.0) -> 'PiecewiseProfile':
+        """Perfil escalonado con niveles consecutivos de igual duración"""
+        times = t_start + step_duration * np.arange(len(levels))
+        return cls(times, levels, kind='step')
+
+    def __call__(self, t: float) -> float:
+        """Valor del perfil en el instante t (escalar)"""
+        index = bisect.bisect_right(self._times, t) - 1
+        if index < 0:
+            return self._values[0]
+        if index >= len(self._times) - 1:
+            return self._values[-1]
+        if self.kind == 'step':
+            return self._values[index]
+
+        t0, t1 = self._times[index], self._times[index + 1]
+        v0, v1 = self._values[index], self._values[index + 1]
+        return v0 + (v1 - v0) * (t - t0) / (t1 - t0)
+
+    def evaluate(self, t: np.ndarray) -> np.ndarray:
+        """Valor del perfil sobre un array de instantes"""
+        t = np.asarray(t, dtype=float)
+        if self.kind == 'linear':
+            return np.interp(t, self.times, self.values)
+
+        index = np.searchsorted(self.times, t, side='right') - 1
+        return self.values[np.clip(index, 0, len(self.values) - 1)]
+
+    def breakpoints(self, t_span: Tuple[float, float]) -> List[float]:
+        """Instantes de discontinuidad estrictamente dentro de t_span"""
+        return [t for t in self._times if t_span[0] < t < t_span[1]]
+
+    def describe(self) -> Dict[str, Any]:
+        """Descripción serializable (para claves de caché y metadatos)"""
+        return {
+            'type': type(self).__name__,
+            'kind': self.kind,
+            'times': self._times,
+            'values': self._values
+        }
+
+
+class InterpolatedProfile:
+    """
+    Perfil continuo interpolado a partir de muestras (p.ej. datos registrados)
+
+    - kind='linear': interpolación lineal entre muestras
+    - kind='cubic': spline cúbico (condición not-a-knot)
+
+    Los coeficientes de cada intervalo se calculan una sola vez. La evaluación
+    escalar recuerda el intervalo de la llamada anterior: como el integrador
+    avanza casi siempre en instantes cercanos, la búsqueda suele resolverse en
+    ese intervalo o el siguiente, y el costo no crece con el largo del perfil.
+
+    Fuera del rango de muestras el perfil mantiene el primer/último valor.
+    """
+
+    def __init__(self, times: Sequence[float], values: Sequence[float], kind: str = 'linear'):
+        if kind not in ('linear', 'cubic'):
+            raise ValueError(f"Tipo de interpolación desconocido: {kind}")
+        times = np.asarray(times, dtype=float)
+        values = np.asarray(values, dtype=float)
+        if times.ndim != 1 or times.shape != values.shape or len(times) < 2:
+            raise ValueError("times y values deben ser vectores de igual longitud (>= 2)")
+        if np.any(np.diff(times) <= 0):
+            raise ValueError("Los instantes del perfil deben ser estrictamente crecientes")
+
+        self.kind = kind
+        self.times = times
+        self.values = values
+
+        # Coeficientes por intervalo en potencias de (t - t_i), de mayor a menor grado
+        if kind == 'cubic':
+            from scipy.interpolate import CubicSpline
+            self.coefficients = CubicSpline(times, values).c
+        else:
+            slopes = np.diff(values) / np.diff(times)
+            self.coefficients = np.vstack([slopes, values[:-1]])
+
+        # Listas de Python para la evaluación escalar dentro del lado derecho
+        self._times = times.tolist()
+        self._coefficients = self.coefficients.T.tolist()
+        self._last = len(self._times) - 2
+        self._index = 0
+
+    def _locate(self, t: float) -> int:
+        """Índice del intervalo [t_i, t_(i+1)) que contiene t, partiendo del último usado"""
+        times = self._times
+        index = self._index
+        if times[index] <= t < times[index + 1]:
+            return index
+        if index < self._last and times[index + 1] <= t < times[index + 2]:
+            index += 1
+        else:
+            index = min(max(bisect.bisect_right(times, t) - 1, 0), self._last)
+        self._index = index
+        return index
+
+    def __call__(self, t: float) -> float:
+        """Valor del perfil en el instante t (escalar)"""
+        if t <= self._times[0]:
+            t = self._times[0]
+        elif t >= self._times[-1]:
+            t = self._times[-1]
+
+        index = self._locate(t)
+        dt = t - self._times[index]
+        value = 0.0
+        for coefficient in self._coefficients[index]:
+            value = value * dt + coefficient
+        return value
+
+    def evaluate(self, t: np.ndarray) -> np.ndarray:
+        """Valor del perfil sobre un array de instantes"""
+        t = np.clip(np.asarray(t, dtype=float), self.times[0], self.times[-1])
+        index = np.clip(np.searchsorted(self.times, t, side='right') - 1,
+                        0, len(self.times) - 2)
+        dt = t - self.times[index]
+
+        value = np.zeros_like(dt)
+        for coefficient in self.coefficients:
+            value = value * dt + coefficient[index]
+        return value
+
+    def breakpoints(self, t_span: Tuple[float, float]) -> List[float]:
+        """Perfil continuo: no tiene discontinuidades"""
+        return []
+
+    def describe(self) -> Dict[str, Any]:
+        """Descripción serializable; las muestras se resumen con un hash"""
+        digest = hashlib.sha256(self.times.tobytes() + self.values.tobytes()).hexdigest()
+        return {
+            'type': type(self).__name__,
+            'kind': self.kind,
+            'samples': len(self._times),
+            'sha256': digest
+        }
@@ -0,0 +1,263 @@
+"""
+Simulación en tiempo real con paso fijo para ensayos hardware-in-the-loop
+
+El modelo mecánico del motor (ω_m, δ) avanza con pasos fijos (p.ej. 100 µs)
+sincronizados con el reloj de pared, en lugar de integrar con RK45 adaptativo
+sobre un t_span conocido de antemano:
+- Runge-Kutta clásico de orden 4 sobre floats de Python (sin arrays por paso)
+- Entradas (T_load, If, V_line, f) modificables entre pasos
+- Estadísticas por paso: tiempo de cómputo, vencimientos de plazo y jitter
+- Benchmark que verifica que el paso se sostiene a 10 kHz en un núcleo
+
+Ejecutar `python realtime.py` para el benchmark.
+"""
+
+import math
+import time
+import numpy as np
+from typing import Dict, Optional, Callable, Any
+from motor_model import SynchronousMotorModel, CompiledDynamics, solve_load_angle
+
+
+# Por debajo de este margen la espera hasta el próximo plazo es activa:
+# time.sleep() no garantiza resolución de decenas de µs
+_SPIN_THRESHOLD = 1e-3  # s
+
+
+class RealTimeStepper:
+    """
+    Integrador de paso fijo del modelo dinámico, sincronizable con el reloj
+
+    Cada paso es un RK4 sobre CompiledDynamics.derivatives(), con el estado en
+    atributos float (omega_m, delta, t). set_inputs() cambia las entradas entre
+    pasos recalculando sólo los coeficientes T1, T2 y ω_s.
+
+        stepper = RealTimeStepper(motor, dt=1e-4)
+        for k in range(n):
+            stepper.set_inputs(T_load=leer_freno())
+            stepper.step()
+            escribir_salida(stepper.omega_m, stepper.electromagnetic_torque())
+
+    run() agrega el ritmo de tiempo real: el paso k se programa para
+    t0 + k·dt de reloj; se registran el tiempo de cómputo, el retraso del
+    inicio respecto del programado (jitter) y los pasos que terminan después
+    de su plazo (overruns). Las muestras se guardan en buffers circulares
+    preasignados de `history` elementos.
+    """
+
+    def __init__(self, motor: SynchronousMotorModel, dt: float = 1e-4,
+                 initial_conditions: Optional[Dict[str, float]] = None,
+                 history: int = 1 << 16, clock: Callable[[], float] = time.perf_counter):
+        if dt <= 0:
+            raise ValueError("El paso dt debe ser positivo")
+
+        self.dt = float(dt)
+        self.clock = clock
+        self._dynamics = CompiledDynamics(motor)
+        self._V_line = float(motor.V_line)
+        self._If = float(motor.If)
+        self._f = float(motor.f)
+
+        if initial_conditions is None:
+            # Régimen permanente síncrono para la carga actual (incluye fricción)
+            dynamics = self._dynamics
+            delta, _ = solve_load_angle(dynamics.T1, dynamics.T2,
+                                        dynamics.T_load + dynamics.B * dynamics.omega_s)
+            initial_conditions = {'omega_m': dynamics.omega_s, 'delta': float(delta[0])}
+        self.omega_m = float(initial_conditions.get('omega_m', 0.0))
+        self.delta = float(initial_conditions.get('delta', 0.0))
+        self.t = 0.0
+        self.steps = 0
+
+        # Estadísticas (buffers circulares preasignados)
+        self._compute_times = np.zeros(history)
+        self._lateness = np.zeros(history)
+        self.reset_statistics()
+
+    # ==================== ENTRADAS Y SALIDAS ====================
+
+    def set_inputs(self, T_load: Optional[float] = None, If: Optional[float] = None,
+                   V_line: Optional[float] = None, f: Optional[float] = None) -> None:
+        """Actualiza entradas para los pasos siguientes (las omitidas no cambian)"""
+        if T_load is not None:
+            self._dynamics.T_load = T_load
+        if If is not None or V_line is not None or f is not None:
+            if If is not None:
+                self._If = If
+            if V_line is not None:
+                self._V_line = V_line
+            if f is not None:
+                self._f = f
+            self._dynamics.set_electrical(self._V_line, self._If, self._f)
+
+    def electromagnetic_torque(self) -> float:
+        """Par electromagnético en el estado actual"""
+        dynamics = self._dynamics
+        return dynamics.T1 * math.sin(self.delta) + dynamics.T2 * math.sin(2 * self.delta)
+
+    def state(self) -> Dict[str, float]:
+        """Estado e instante actuales"""
+        return {'time': self.t, 'omega_m': self.omega_m, 'delta': self.delta}
+
+    # ==================== INTEGRACIÓN ====================
+
+    def step(self) -> None:
+        """Avanza un paso dt (RK4 clásico)"""
+        derivatives = self._dynamics.derivatives
+        h = self.dt
+        w, d = self.omega_m, self.delta
+
+        k1w, k1d = derivatives(w, d)
+        k2w, k2d = derivatives(w + 0.5 * h * k1w, d + 0.5 * h * k1d)
+        k3w, k3d = derivatives(w + 0.5 * h * k2w, d + 0.5 * h * k2d)
+        k4w, k4d = derivatives(w + h * k3w, d + h * k3d)
+
+        self.omega_m = w + h / 6 * (k1w + 2 * k2w + 2 * k3w + k4w)
+        self.delta = d + h / 6 * (k1d + 2 * k2d + 2 * k3d + k4d)
+        self.steps += 1
+        self.t = self.steps * h
+
+    def run(self, n_steps: int, realtime: bool = True,
+            callback: Optional[Callable[['RealTimeStepper'], Any]] = None) -> Dict[str, float]:
+        """
+        Ejecuta n_steps pasos
+
+        Args:
+            n_steps: número de pasos
+            realtime: sincronizar cada paso con el reloj (False: tan rápido como sea posible)
+            callback: función llamada antes de cada paso (E/S con el banco de ensayo,
+                set_inputs...); su tiempo cuenta como cómputo del paso
+
+        Returns:
+            Estadísticas de la corrida (ver statistics())
+        """
+        clock = self.clock
+        dt = self.dt
+        compute_times, lateness = self._compute_times, self._lateness
+        size = len(compute_times)
+
+        self.reset_statistics()
+        start = clock()
+        for k in range(n_steps):
+            scheduled = start + k * dt
+            if realtime:
+                _wait_until(scheduled, clock)
+            begin = clock()
+
+            if callback is not None:
+                callback(self)
+            self.step()
+
+            end = clock()
+            slot = self._recorded % size
+            compute_times[slot] = end - begin
+            lateness[slot] = begin - scheduled
+            self._recorded += 1
+            if realtime and end > scheduled + dt:
+                self.overruns += 1
+
+        self._wall_time = clock() - start
+        return self.statistics()
+
+    # ==================== ESTADÍSTICAS ====================
+
+    def reset_statistics(self) -> None:
+        """Descarta las muestras registradas"""
+        self._recorded = 0
+        self.overruns = 0
+        self._wall_time = 0.0
+
+    def statistics(self) -> Dict[str, float]:
+        """
+        Estadísticas de la última corrida (sobre las últimas `history` muestras)
+
+        - compute_*: tiempo de cómputo por paso (s)
+        - jitter_*: retraso del inicio de cada paso respecto del programado (s)
+        - overruns: pasos terminados después de su plazo
+        - realtime_factor: tiempo simulado / tiempo de reloj
+        """
+        n = min(self._recorded, len(self._compute_times))
+        compute = self._compute_times[:n]
+        lateness = self._lateness[:n]
+        empty = n == 0
+        return {
+            'steps': self._recorded,
+            'dt': self.dt,
+            'compute_mean': float('nan') if empty else float(compute.mean()),
+            'compute_p50': float('nan') if empty else float(np.percentile(compute, 50)),
+            'compute_p99': float('nan') if empty else float(np.percentile(compute, 99)),
+            'compute_max': float('nan') if empty else float(compute.max()),
+            'jitter_mean': float('nan') if empty else float(lateness.mean()),
+            'jitter_std': float('nan') if empty else float(lateness.std()),
+            'jitter_p99': float('nan') if empty else float(np.percentile(lateness, 99)),
+            'jitter_max': float('nan') if empty else float(lateness.max()),
+            'overruns': self.overruns,
+            'overrun_fraction': self.overruns / self._recorded if self._recorded else 0.0,
+            'wall_time': self._wall_time,
+            'realtime_factor': (self._recorded * self.dt / self._wall_time
+                                if self._wall_time > 0 else float('inf'))
+        }
+
+
+def _wait_until(deadline: float, clock: Callable[[], float]) -> None:
+    """Espera hasta el instante deadline: sleep si falta mucho, espera activa al final"""
+    remaining = deadline - clock()
+    if remaining > _SPIN_THRESHOLD:
+        time.sleep(remaining - _SPIN_THRESHOLD)
+    while clock() < deadline:
+        pass
+
+
+def benchmark(rate_hz: float = 10_000.0, duration: float = 1.0,
+              motor: Optional[SynchronousMotorModel] = None,
+              max_overrun_fraction: float = 1e-3) -> Dict[str, Any]:
+    """
+    Verifica que el paso fijo se sostiene a rate_hz en un núcleo
+
+    Corre primero sin ritmo (capacidad máxima en pasos/s) y luego sincronizado
+    con el reloj durante `duration` segundos, con un cambio de carga por paso
+    para incluir el costo de set_inputs().
+
+    Se considera que sostiene el ritmo si el p99 del cómputo por paso usa menos
+    de la mitad del plazo, la corrida no se atrasa respecto del reloj y la
+    fracción de pasos vencidos no supera max_overrun_fraction. El valor por
+    defecto tolera vencimientos aislados por desalojo del proceso (planificador
+    del sistema operativo); con 0.0 se exige no vencer ningún plazo.
+
+    Returns:
+        {'max_rate_hz', 'free_running': estadísticas, 'realtime': estadísticas,
+         'max_overrun_fraction', 'keeps_up': bool}
+    """
+    motor = motor or SynchronousMotorModel()
+    dt = 1.0 / rate_hz
+    n_steps = max(1, int(round(duration * rate_hz)))
+    T_load = motor.T_load
+
+    def vary_load(stepper: RealTimeStepper) -> None:
+        stepper.set_inputs(T_load=T_load * (1.0 + 0.1 * math.sin(stepper.t)))
+
+    free_running = RealTimeStepper(motor, dt).run(n_steps, realtime=False, callback=vary_load)
+    paced = RealTimeStepper(motor, dt).run(n_steps, realtime=True, callback=vary_load)
+
+    return {
+        'rate_hz': rate_hz,
+        'max_rate_hz': 1.0 / free_running['compute_mean'],
+        'free_running': free_running,
+        'realtime': paced,
+        'max_overrun_fraction': max_overrun_fraction,
+        'keeps_up': (paced['compute_p99'] < dt / 2 and paced['realtime_factor'] > 0.99
+                     and paced['overrun_fraction'] <= max_overrun_fraction)
+    }
+
+
+if __name__ == '__main__':
+    report = benchmark()
+    paced = report['realtime']
+    print(f"Paso fijo a {report['rate_hz']:.0f} Hz "
+          f"(capacidad máxima {report['max_rate_hz']:.0f} pasos/s)")
+    print(f"  cómputo por paso: media {paced['compute_mean'] * 1e6:.1f} µs, "
+          f"p99 {paced['compute_p99'] * 1e6:.1f} µs, máx {paced['compute_max'] * 1e6:.1f} µs")
+    print(f"  jitter: p99 {paced['jitter_p99'] * 1e6:.1f} µs, máx {paced['jitter_max'] * 1e6:.1f} µs")
+    print(f"  vencimientos: {paced['overruns']} de {paced['steps']} pasos "
+          f"(máximo admitido {report['max_overrun_fraction']:.1%})")
+    print("✓ Sostiene el tiempo real" if report['keeps_up'] else "✗ No sostiene el tiempo real")
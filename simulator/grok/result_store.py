@@ -0,0 +1,243 @@
+"""
+Almacenamiento columnar de resultados de simulación
+
+Contenedor compacto para las salidas de las simulaciones:
+- Columnas tipadas de igual longitud (time, omega_m, delta, T_e, P, Q, pf, ...)
+- Metadatos serializables (configuración del escenario, parámetros del motor)
+- Formato en disco mapeable en memoria: un archivo binario por columna y un
+  meta.json, de modo que corridas de 10⁸ muestras pueden recortarse o
+  diezmarse para graficar sin cargarlas en RAM
+- Escritura incremental por bloques (ver SimulationEngine.iter_transient_response)
+"""
+
+import json
+import os
+import numpy as np
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Any, Optional, Iterator, Iterable
+from utils import json_default
+
+
+# Identificador del formato en disco
+FORMAT_VERSION = 'motor-sim-result-v1'
+
+_META_FILE = 'meta.json'
+
+
+class SimulationResult(Mapping):
+    """
+    Resultado de simulación con columnas tipadas y metadatos
+
+    Se comporta como el diccionario de resultados del que proviene:
+    result['delta'] retorna la columna y result['event'] el metadato.
+    Las columnas pueden ser arrays en memoria o mapeados desde disco.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray],
+                 metadata: Optional[Dict[str, Any]] = None):
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Todas las columnas deben tener la misma longitud")
+
+        self.columns = {name: column for name, column in columns.items()}
+        self.metadata = dict(metadata or {})
+
+    @classmethod
+    def from_results(cls, results: Dict[str, Any],
+                     parameters: Optional[Any] = None) -> 'SimulationResult':
+        """
+        Construye el contenedor a partir de un diccionario de resultados
+
+        Los arrays 1-D con la misma longitud que 'time' pasan a ser columnas;
+        el resto (configuración, listas, escalares) queda como metadatos.
+        Sin 'time' (p.ej. la prueba de sobrecarga) todo queda como metadatos.
+
+        Args:
+            results: diccionario retornado por el motor de simulación o un escenario
+            parameters: MotorParameters a registrar en los metadatos
+        """
+        n_samples = len(results['time']) if 'time' in results else None
+        columns, metadata = {}, {}
+        for name, value in results.items():
+            if (n_samples is not None and isinstance(value, np.ndarray)
+                    and value.ndim == 1 and len(value) == n_samples):
+                columns[name] = value
+            else:
+                metadata[name] = value
+
+        if parameters is not None:
+            metadata['motor_parameters'] = (parameters._asdict()
+                                            if hasattr(parameters, '_asdict') else parameters)
+        return cls(columns, metadata)
+
+    @property
+    def n_samples(self) -> int:
+        """Número de muestras de cada columna"""
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self.columns:
+            return self.columns[name]
+        return self.metadata[name]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.columns
+        yield from (name for name in self.metadata if name not in self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns) + len(set(self.metadata) - set(self.columns))
+
+    def __repr__(self) -> str:
+        return (f"SimulationResult({self.n_samples} muestras, "
+                f"columnas={list(self.columns)})")
+
+    def slice(self, start: Optional[int] = None, stop: Optional[int] = None,
+              step: Optional[int] = None) -> 'SimulationResult':
+        """Subconjunto de muestras (vistas: no copia columnas mapeadas)"""
+        window = slice(start, stop, step)
+        return SimulationResult({name: column[window] for name, column in self.columns.items()},
+                                self.metadata)
+
+    def time_window(self, t_start: float, t_end: float) -> 'SimulationResult':
+        """Muestras con t_start <= time <= t_end (búsqueda binaria sobre 'time')"""
+        time = self.columns['time']
+        start = int(np.searchsorted(time, t_start, side='left'))
+        stop = int(np.searchsorted(time, t_end, side='right'))
+        return self.slice(start, stop)
+
+    def decimate(self, max_points: int) -> 'SimulationResult':
+        """Submuestreo uniforme a lo sumo max_points muestras (para graficar)"""
+        step = max(1, int(np.ceil(self.n_samples / max_points)))
+        return self if step == 1 else self.slice(step=step)
+
+    def to_structured(self) -> np.ndarray:
+        """Copia como array estructurado de NumPy (un campo por columna)"""
+        dtype = [(name, column.dtype) for name, column in self.columns.items()]
+        structured = np.empty(self.n_samples, dtype=dtype)
+        for name, column in self.columns.items():
+            structured[name] = column
+        return structured
+
+    def save(self, path: os.PathLike, chunk_size: int = 1 << 20) -> 'SimulationResult':
+        """Guarda el resultado en el directorio path; retorna la versión mapeada"""
+        with ResultWriter(path, self.metadata) as writer:
+            for start in range(0, max(self.n_samples, 1), chunk_size):
+                writer.append(self.slice(start, start + chunk_size).columns)
+        return writer.result
+
+    @classmethod
+    def load(cls, path: os.PathLike, mmap: bool = True) -> 'SimulationResult':
+        """
+        Carga un resultado guardado
+
+        Con mmap=True las columnas se mapean en memoria (sólo lectura) y
+        únicamente se leen las partes del archivo que se acceden.
+        """
+        path = Path(path)
+        with open(path / _META_FILE, 'r', encoding='utf-8') as meta_file:
+            meta = json.load(meta_file)
+        if meta.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Formato de resultado no soportado: {meta.get('format')}")
+
+        columns = {}
+        for name, dtype in meta['columns'].items():
+            column_path = path / f'{name}.bin'
+            if meta['n_samples'] == 0:
+                columns[name] = np.empty(0, dtype=dtype)
+            elif mmap:
+                columns[name] = np.memmap(column_path, dtype=dtype, mode='r',
+                                          shape=(meta['n_samples'],))
+            else:
+                columns[name] = np.fromfile(column_path, dtype=dtype)
+        return cls(columns, meta['metadata'])
+
+
+class ResultWriter:
+    """
+    Escritura incremental de un resultado columnar en disco
+
+    Cada bloque agrega sus columnas al final de los archivos binarios; los
+    valores que no son columnas (p.ej. 'event' del último bloque) se suman a
+    los metadatos. El meta.json se escribe al cerrar, así que un resultado
+    incompleto no puede cargarse por error; al escribir sobre un resultado
+    existente, su meta.json se elimina antes de truncar las columnas.
+    Metadatos no serializables en JSON producen TypeError al cerrar.
+
+        with ResultWriter('corrida', metadata) as writer:
+            for chunk in engine.iter_transient_response(t_span):
+                writer.append(chunk)
+        result = writer.result
+    """
+
+    def __init__(self, path: os.PathLike, metadata: Optional[Dict[str, Any]] = None):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Un meta.json previo describiría columnas a punto de truncarse
+        (self.path / _META_FILE).unlink(missing_ok=True)
+        self.metadata = dict(metadata or {})
+        self.n_samples = 0
+        self.result: Optional[SimulationResult] = None
+        self._dtypes: Optional[Dict[str, np.dtype]] = None
+        self._files = {}
+
+    def append(self, chunk: Dict[str, Any]) -> None:
+        """Agrega un bloque de muestras"""
+        lengths = [len(value) for value in chunk.values()
+                   if isinstance(value, np.ndarray) and value.ndim == 1]
+        n_samples = len(chunk['time']) if 'time' in chunk else max(lengths, default=0)
+        columns = {name: value for name, value in chunk.items()
+                   if isinstance(value, np.ndarray) and value.ndim == 1
+                   and len(value) == n_samples}
+
+        if self._dtypes is None:
+            self._dtypes = {name: column.dtype for name, column in columns.items()}
+            for name in columns:
+                self._files[name] = open(self.path / f'{name}.bin', 'wb')
+        elif set(columns) != set(self._dtypes):
+            raise ValueError("Todos los bloques deben tener las mismas columnas")
+
+        for name, column in columns.items():
+            self._files[name].write(np.ascontiguousarray(column, dtype=self._dtypes[name]).tobytes())
+        self.n_samples += n_samples
+        self.metadata.update({name: value for name, value in chunk.items()
+                              if name not in columns})
+
+    def extend(self, chunks: Iterable[Dict[str, Any]]) -> None:
+        """Agrega todos los bloques de un iterable"""
+        for chunk in chunks:
+            self.append(chunk)
+
+    def close(self) -> SimulationResult:
+        """Cierra los archivos, escribe meta.json y retorna el resultado mapeado"""
+        for column_file in self._files.values():
+            column_file.close()
+        self._files = {}
+
+        meta = {
+            'format': FORMAT_VERSION,
+            'n_samples': self.n_samples,
+            'columns': {name: dtype.str for name, dtype in (self._dtypes or {}).items()},
+            'metadata': self.metadata
+        }
+        staging = self.path / f'.{_META_FILE}.tmp'
+        try:
+            with open(staging, 'w', encoding='utf-8') as meta_file:
+                json.dump(meta, meta_file, default=json_default)
+        except (TypeError, ValueError):
+            staging.unlink(missing_ok=True)
+            raise
+        os.replace(staging, self.path / _META_FILE)
+
+        self.result = SimulationResult.load(self.path)
+        return self.result
+
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            for column_file in self._files.values():
+                column_file.close()
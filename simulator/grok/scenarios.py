@@ -9,9 +9,11 @@ Define configuraciones preestablecidas para casos típicos de simulación:
 """
 
 import numpy as np
-from typing import Dict, List, Tuple, Any
-from motor_model import SynchronousMotorModel
-from simulation_engine import SimulationEngine
+from typing import Dict, List, Tuple, Any, Optional
+from motor_model import SynchronousMotorModel, pull_out_angle, solve_load_angle
+from profiles import PiecewiseProfile, InterpolatedProfile
+from utils import synchronous_speed_radps
+from simulation_engine import SimulationEngine, SteadyStateEvent, pole_slip_event
 
 
 class SimulationScenarios:
@@ -66,12 +68,16 @@ class SimulationScenarios:
         return scenario_methods[scenario_name](**params)
 
     def scenario_startup_ideal(self, t_final: float = 3.0,
-                              initial_omega_ratio: float = 0.0) -> Dict[str, Any]:
+                              initial_omega_ratio: float = 0.0,
+                              settle_tolerance: float = 0.01,
+                              settle_time: float = 0.1) -> Dict[str, Any]:
         """
         Escenario 1: Arranque ideal del motor
 
         El motor arranca desde reposo (o desde una velocidad inicial)
         hasta alcanzar la velocidad síncrona con carga nominal.
+        La simulación termina antes de t_final si la velocidad permanece
+        a menos de settle_tolerance rad/s de la síncrona durante settle_time s.
         """
         # Configuración del escenario
         config = {
@@ -79,7 +85,9 @@ class SimulationScenarios:
             'description': 'Arranque ideal desde reposo hasta velocidad síncrona',
             'parameters': {
                 't_final': t_final,
-                'initial_omega_ratio': initial_omega_ratio
+                'initial_omega_ratio': initial_omega_ratio,
+                'settle_tolerance': settle_tolerance,
+                'settle_time': settle_time
             }
         }
 
@@ -94,9 +102,10 @@ class SimulationScenarios:
         original_T_load = self.motor.T_load
         self.motor.T_load = 0.0  # arranque sin carga
 
-        # Simulación
+        # Simulación (termina al alcanzar el régimen permanente)
+        settled = SteadyStateEvent(omega_s, settle_tolerance, settle_time)
         results = self.engine.simulate_transient_response(
-            (0, t_final), initial_conditions
+            (0, t_final), initial_conditions, events=[settled]
         )
 
         # Restaurar carga
@@ -131,46 +140,23 @@ class SimulationScenarios:
         # Carga nominal
         T_nominal = self.motor.T_load
 
-        # Simular múltiples etapas de carga
-        all_results = []
-        current_time = 0.0
-
-        for step in range(load_steps + 1):
-            # Calcular carga para este paso
-            load_ratio = step * max_load_ratio / load_steps
-            self.motor.T_load = T_nominal * load_ratio
-
-            # Tiempo para este paso
-            step_duration = t_final / load_steps
-            t_span = (current_time, current_time + step_duration)
-
-            # Condiciones iniciales (continuar desde estado anterior)
-            if step == 0:
-                initial_conditions = {'omega_m': self.motor.synchronous_speed(), 'delta': 0.1}
-            else:
-                # Usar estado final del paso anterior
-                prev_results = all_results[-1]
-                initial_conditions = {
-                    'omega_m': prev_results['omega_m'][-1],
-                    'delta': prev_results['delta'][-1]
-                }
-
-            # Simular este paso
-            step_results = self.engine.simulate_transient_response(t_span, initial_conditions)
-            step_results['load_ratio'] = load_ratio
-            step_results['T_load_step'] = self.motor.T_load
-
-            all_results.append(step_results)
-            current_time += step_duration
-
-        # Combinar todos los resultados
-        combined_results = self._combine_step_results(all_results)
-        combined_results.update(config)
+        # Perfil escalonado T_L(t): un nivel por paso, integrado de una sola vez
+        # (el solver se reinicia exactamente en cada escalón de carga)
+        load_ratios = [step * max_load_ratio / load_steps for step in range(load_steps + 1)]
+        step_duration = t_final / load_steps
+        T_load_profile = PiecewiseProfile.steps(
+            [T_nominal * ratio for ratio in load_ratios], step_duration)
 
-        # Restaurar carga nominal
-        self.motor.T_load = T_nominal
+        t_span = (0.0, (load_steps + 1) * step_duration)
+        initial_conditions = {'omega_m': self.motor.synchronous_speed(), 'delta': 0.1}
 
-        return combined_results
+        results = self.engine.simulate_transient_response(
+            t_span, initial_conditions, inputs={'T_load': T_load_profile},
+            num_points=1000 * (load_steps + 1))
+        results['load_steps'] = load_ratios
+        results.update(config)
+
+        return results
 
     def scenario_excitation_sub_to_over(self, t_final: float = 4.0,
                                        If_initial: float = 0.5,
@@ -211,65 +197,43 @@ class SimulationScenarios:
             }
         }
 
-        # Condiciones iniciales con excitación inicial
-        original_If = self.motor.If
-        self.motor.If = If_initial
+        # Rampa de excitación If(t) como entrada del modelo dinámico
+        If_profile = PiecewiseProfile([0.0, t_final], [If_initial, If_final], kind='linear')
 
         initial_conditions = {'omega_m': self.motor.synchronous_speed(), 'delta': 0.2}
+        results = self.engine.simulate_transient_response(
+            (0, t_final), initial_conditions, inputs={'If': If_profile})
 
-        # Simulación básica (simplificada - en realidad necesitaríamos
-        # un modelo más completo para cambios dinámicos de excitación)
-        results = self.engine.simulate_transient_response((0, t_final), initial_conditions)
-
-        # Crear perfil de excitación
-        t_eval = results['time']
-        If_profile = If_initial + (If_final - If_initial) * t_eval / t_final
-
-        # Calcular cómo cambian las variables con la excitación
-        pf_profile = []
-        P_profile = []
-        Q_profile = []
-
-        for If in If_profile[::10]:  # Muestrear cada 10 puntos para eficiencia
-            self.motor.If = If
-            steady_results = self.motor.steady_state_analysis()
-            pf_profile.extend([steady_results['pf']] * 10)
-            P_profile.extend([steady_results['P']] * 10)
-            Q_profile.extend([steady_results['Q']] * 10)
-
-        # Ajustar longitud
-        pf_profile = pf_profile[:len(t_eval)]
-        P_profile = P_profile[:len(t_eval)]
-        Q_profile = Q_profile[:len(t_eval)]
-
+        # pf, P y Q ya se calculan sobre la trayectoria con If(t)
         results.update({
-            'If_profile': If_profile,
-            'pf_profile': pf_profile,
-            'P_profile': P_profile,
-            'Q_profile': Q_profile
+            'If_profile': If_profile.evaluate(results['time']),
+            'pf_profile': results['pf'],
+            'P_profile': results['P'],
+            'Q_profile': results['Q']
         })
 
         results.update(config)
 
-        # Restaurar excitación original
-        self.motor.If = original_If
-
         return results
 
     def scenario_overload_test(self, overload_ratios: List[float] = [1.1, 1.3, 1.5],
-                              t_final: float = 2.0) -> Dict[str, Any]:
+                              t_final: float = 2.0, find_limit: bool = False,
+                              limit_tol: float = 1e-3) -> Dict[str, Any]:
         """
         Escenario 5: Prueba de sobrecarga
 
         Aplica diferentes niveles de sobrecarga para determinar
-        el límite de estabilidad del motor.
+        el límite de estabilidad del motor. Con find_limit=True además
+        busca la razón de sobrecarga crítica con tolerancia limit_tol
+        (ver SimulationEngine.find_stability_limit).
         """
         config = {
             'name': 'overload_test',
             'description': f'Prueba de sobrecarga con ratios: {overload_ratios}',
             'parameters': {
                 'overload_ratios': overload_ratios,
-                't_final': t_final
+                't_final': t_final,
+                'find_limit': find_limit
             }
         }
 
@@ -283,8 +247,9 @@ class SimulationScenarios:
             # Condiciones iniciales
             initial_conditions = {'omega_m': self.motor.synchronous_speed(), 'delta': 0.3}
 
-            # Simular
-            results = self.engine.simulate_transient_response((0, t_final), initial_conditions)
+            # Simular (termina al detectar el deslizamiento de polo)
+            results = self.engine.simulate_transient_response(
+                (0, t_final), initial_conditions, events=[pole_slip_event()])
             results['overload_ratio'] = ratio
             results['stable'] = self._check_stability(results)
 
@@ -297,17 +262,32 @@ class SimulationScenarios:
         # Restaurar carga nominal
         self.motor.T_load = T_nominal
 
+        if find_limit:
+            combined_results['stability_limit'] = self.engine.find_stability_limit(
+                tol=limit_tol, t_final=t_final)
+
         return combined_results
 
     def scenario_frequency_variation(self, t_final: float = 6.0,
                                     f_initial: float = 50.0,
                                     f_min: float = 48.0,
-                                    f_max: float = 52.0) -> Dict[str, Any]:
+                                    f_max: float = 52.0,
+                                    sample_rate: float = 10000.0,
+                                    kind: str = 'cubic',
+                                    frequency_data: Optional[Tuple[np.ndarray, np.ndarray]] = None
+                                    ) -> Dict[str, Any]:
         """
         Escenario 6: Variación de frecuencia
 
         Simula cambios en la frecuencia de la red y su efecto
-        en la operación del motor.
+        en la operación del motor. La frecuencia es una entrada f(t) del
+        modelo dinámico: ω_s y el par máximo varían con ella.
+
+        Args:
+            frequency_data: (tiempos, frecuencias) registrados; si se omite se
+                            genera una excursión f_initial → f_min → f_max →
+                            f_initial muestreada a sample_rate Hz
+            kind: interpolación del perfil ('linear' o 'cubic')
         """
         config = {
             'name': 'frequency_variation',
@@ -316,75 +296,126 @@ class SimulationScenarios:
                 't_final': t_final,
                 'f_initial': f_initial,
                 'f_min': f_min,
-                'f_max': f_max
+                'f_max': f_max,
+                'sample_rate': sample_rate,
+                'kind': kind
             }
         }
 
-        # Este escenario requiere un modelo más avanzado
-        # Por ahora, devolver configuración básica
-        results = {
-            'time': np.linspace(0, t_final, 100),
-            'frequency_profile': f_initial * np.ones(100),  # placeholder
-            'note': 'Este escenario requiere implementación avanzada del modelo dinámico'
-        }
+        if frequency_data is None:
+            frequency_data = self._frequency_excursion(t_final, f_initial, f_min,
+                                                       f_max, sample_rate)
+        f_profile = InterpolatedProfile(*frequency_data, kind=kind)
+
+        # Condiciones iniciales: régimen permanente a la frecuencia inicial
+        initial_conditions = self._synchronous_initial_conditions(f=f_profile(0.0))
+
+        results = self.engine.simulate_transient_response(
+            (0, t_final), initial_conditions, inputs={'f': f_profile},
+            events=[pole_slip_event()])
+
+        # Velocidad síncrona y par máximo instantáneos
+        f = results['f']
+        T1, T2 = self.motor.torque_coefficients(f=f)
+        delta_max = pull_out_angle(T1, T2)
+        results.update({
+            'frequency_profile': f,
+            'omega_s_profile': synchronous_speed_radps(f, self.motor.p),
+            'T_max_profile': T1 * np.sin(delta_max) + T2 * np.sin(2 * delta_max)
+        })
 
         results.update(config)
         return results
 
+    @staticmethod
+    def _frequency_excursion(t_final: float, f_initial: float, f_min: float,
+                             f_max: float, sample_rate: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Excursión suave de frecuencia muestreada como un registro de red"""
+        keyframe_times = t_final * np.array([0.0, 0.15, 0.35, 0.6, 0.85, 1.0])
+        keyframe_values = np.array([f_initial, f_initial, f_min, f_max, f_initial, f_initial])
+
+        times = np.linspace(0, t_final, int(round(t_final * sample_rate)) + 1)
+        index = np.clip(np.searchsorted(keyframe_times, times, side='right') - 1,
+                        0, len(keyframe_times) - 2)
+        fraction = ((times - keyframe_times[index]) /
+                    (keyframe_times[index + 1] - keyframe_times[index]))
+
+        # Transiciones de medio coseno entre los valores clave
+        ease = (1 - np.cos(np.pi * fraction)) / 2
+        values = keyframe_values[index] + (keyframe_values[index + 1] - keyframe_values[index]) * ease
+        return times, values
+
     def scenario_voltage_sag(self, t_final: float = 3.0,
                             sag_magnitude: float = 0.8,
                             sag_duration: float = 0.5,
-                            sag_start: float = 1.0) -> Dict[str, Any]:
+                            sag_start: float = 1.0,
+                            sags: Optional[List[Tuple[float, float, float]]] = None
+                            ) -> Dict[str, Any]:
         """
         Escenario 7: Caída de tensión (voltage sag)
 
         Simula una caída temporal de tensión y la respuesta del motor.
+        La tensión es una entrada escalonada V(t): el integrador se reinicia
+        exactamente al inicio y al final de cada caída desde el estado continuo,
+        y cada tramo se integra con su propia tensión hasta el flanco siguiente.
+
+        Args:
+            sags: lista de caídas (inicio, duración, magnitud en p.u.), p.ej. un
+                  registro de perturbaciones; si se omite se usa una sola caída
+                  definida por sag_start, sag_duration y sag_magnitude
         """
+        if sags is None:
+            sags = [(sag_start, sag_duration, sag_magnitude)]
+        sags = sorted(sags)
+
         config = {
             'name': 'voltage_sag',
-            'description': f'Caída de tensión al {sag_magnitude*100:.0f}% durante {sag_duration}s',
+            'description': (f'Caída de tensión al {sag_magnitude*100:.0f}% durante {sag_duration}s'
+                            if len(sags) == 1 else f'{len(sags)} caídas de tensión'),
             'parameters': {
                 't_final': t_final,
                 'sag_magnitude': sag_magnitude,
                 'sag_duration': sag_duration,
-                'sag_start': sag_start
+                'sag_start': sag_start,
+                'sags': sags
             }
         }
 
-        # Perfil de tensión
-        t_eval = np.linspace(0, t_final, 1000)
-        V_profile = np.ones_like(t_eval)
+        # Perfil de tensión: nominal, con un escalón de bajada y otro de
+        # recuperación por cada caída
+        V_nominal = self.motor.V_line
+        times, levels = [0.0], [1.0]
+        for start, duration, magnitude in sags:
+            if start < times[-1] or duration <= 0:
+                raise ValueError("Las caídas de tensión no deben superponerse")
+            times.extend([start, start + duration])
+            levels.extend([magnitude, 1.0])
+        V_profile = PiecewiseProfile(times, [V_nominal * level for level in levels])
 
-        # Aplicar sag
-        sag_mask = (t_eval >= sag_start) & (t_eval <= sag_start + sag_duration)
-        V_profile[sag_mask] = sag_magnitude
+        # Condiciones iniciales: régimen permanente a tensión nominal
+        initial_conditions = self._synchronous_initial_conditions()
 
-        results = {
-            'time': t_eval,
-            'V_profile': V_profile,
-            'note': 'Este escenario requiere implementación avanzada del modelo dinámico'
-        }
+        results = self.engine.simulate_transient_response(
+            (0, t_final), initial_conditions, inputs={'V_line': V_profile},
+            events=[pole_slip_event()])
+        results['V_profile'] = results['V_line'] / V_nominal
+        results['stable'] = results['event'] != 'pole_slip'
 
         results.update(config)
         return results
 
-    def _combine_step_results(self, step_results: List[Dict]) -> Dict:
-        """Combina resultados de múltiples pasos de simulación"""
-        if not step_results:
-            return {}
-
-        # Concatenar arrays temporales
-        combined = {
-            'time': np.concatenate([r['time'] for r in step_results]),
-            'omega_m': np.concatenate([r['omega_m'] for r in step_results]),
-            'delta': np.concatenate([r['delta'] for r in step_results]),
-            'delta_deg': np.concatenate([r['delta_deg'] for r in step_results]),
-            'T_e': np.concatenate([r['T_e'] for r in step_results]),
-            'T_load': np.concatenate([r['T_load'] for r in step_results]),
-            'load_steps': [r.get('load_ratio', 0) for r in step_results]
-        }
+    def _synchronous_initial_conditions(self, f: Optional[float] = None) -> Dict[str, float]:
+        """
+        Equilibrio del modelo dinámico a velocidad síncrona
 
-        return combined
+        El par electromagnético equilibra la carga más el rozamiento B·ω_s;
+        sin equilibrio (sobrecarga) se parte de δ = 0.
+        """
+        f = self.motor.f if f is None else f
+        omega_s = synchronous_speed_radps(f, self.motor.p)
+        T1, T2 = self.motor.torque_coefficients(f=f)
+        delta, _ = solve_load_angle(T1, T2, self.motor.T_load + self.motor.B * omega_s)
+        return {'omega_m': omega_s, 'delta': float(np.nan_to_num(delta[0]))}
 
     def _combine_overload_results(self, overload_results: List[Dict]) -> Dict:
         """Combina resultados de pruebas de sobrecarga"""
@@ -396,7 +427,9 @@ class SimulationScenarios:
             'stability_results': [r['stable'] for r in overload_results],
             'max_deltas': [np.max(r['delta']) for r in overload_results],
             'max_omega_deviations': [np.max(np.abs(r['omega_m'] - self.motor.synchronous_speed()))
-                                    for r in overload_results]
+                                    for r in overload_results],
+            'pole_slip_times': [r['event_time'] if r['event'] == 'pole_slip' else None
+                                for r in overload_results]
         }
 
         return combined
@@ -9,35 +9,290 @@ Maneja:
 """
 
 import numpy as np
-from scipy.integrate import odeint, solve_ivp
-from scipy.optimize import fsolve
-from typing import Dict, List, Tuple, Callable, Optional, Any
-from motor_model import SynchronousMotorModel
+from typing import Dict, List, Tuple, Callable, Optional, Any, Iterator, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from disk_cache import TransientDiskCache, get_default_cache
+from itertools import repeat
+import os
+from profiles import PiecewiseProfile
+from utils import synchronous_speed_radps
+from motor_model import (
+    SynchronousMotorModel, MotorParameters, TORQUE_CURVE_FIELDS,
+    pull_out_angle, solve_load_angle
+)
 import time
 
 
+# Parámetros que steady_state_analysis_batch() acepta como arrays
+_BATCH_FIELDS = ('V_line', 'f', 'If', 'T_load', 'Rs', 'Xd', 'Xq', 'p')
+
+
+def _sweep_chunk(snapshot: MotorParameters, parameter: str,
+                 values: np.ndarray) -> List[Dict[str, float]]:
+    """Tarea de barrido: resuelve el estado estacionario para un bloque de valores"""
+    engine = SimulationEngine(snapshot)
+    results = []
+    for value in values:
+        setattr(engine.motor, parameter, value)
+        result = engine.solve_steady_state()
+        result[f'parameter_{parameter}'] = value
+        results.append(result)
+    return results
+
+
+def _sweep_chunk_vectorized(snapshot: MotorParameters, parameter: str,
+                            values: np.ndarray) -> List[Dict[str, float]]:
+    """Tarea de barrido vectorizada (resolución por lotes de todo el bloque)"""
+    if parameter not in _BATCH_FIELDS:
+        return _sweep_chunk(snapshot, parameter, values)
+
+    return _steady_state_rows(SimulationEngine(snapshot), parameter, values)
+
+
+def _steady_state_rows(engine: 'SimulationEngine', parameter: str,
+                       values: np.ndarray) -> List[Dict[str, float]]:
+    """Barrido resuelto por lotes, con las mismas filas que solve_steady_state()"""
+    batch = engine.solve_steady_state_batch(**{parameter: values})
+    batch.pop('T_max')
+
+    # Conversión por columna (tolist) en lugar de por elemento (.item())
+    columns = {key: column.tolist() for key, column in batch.items()}
+    columns[f'parameter_{parameter}'] = list(values)
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def _describe_inputs(inputs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Descripción serializable de las entradas (None si alguna no la tiene)"""
+    description = {}
+    for name, value in inputs.items():
+        if hasattr(value, 'describe'):
+            description[name] = value.describe()
+        elif callable(value):
+            return None
+        else:
+            description[name] = float(value)
+    return description
+
+
+def _describe_events(events: Optional[List[Callable]]) -> Optional[List[Dict[str, Any]]]:
+    """Descripción serializable de los eventos (None si alguno no la tiene)"""
+    description = []
+    for event in events or []:
+        if not hasattr(event, 'describe'):
+            return None
+        description.append(event.describe())
+    return description
+
+
+def _sample_inputs(inputs: Dict[str, Any], t_eval: np.ndarray) -> Dict[str, np.ndarray]:
+    """Evalúa las entradas (constantes o perfiles) sobre la malla de salida"""
+    samples = {}
+    for name, value in inputs.items():
+        if hasattr(value, 'evaluate'):
+            samples[name] = value.evaluate(t_eval)
+        elif callable(value):
+            samples[name] = np.array([value(t) for t in t_eval])
+        else:
+            samples[name] = np.full_like(t_eval, float(value))
+    return samples
+
+
+def pole_slip_event(delta_limit: float = np.pi) -> Callable:
+    """
+    Evento terminal de pérdida de sincronismo para solve_ivp
+
+    Se dispara cuando el ángulo de carga cruza delta_limit en sentido creciente
+    (por defecto π: el rotor pasa el punto de equilibrio inestable y desliza un polo).
+    """
+    def event(t, state):
+        return state[1] - delta_limit
+
+    event.terminal = True
+    event.direction = 1
+    event.name = 'pole_slip'
+    event.describe = lambda: {'type': 'pole_slip', 'delta_limit': float(delta_limit)}
+    return event
+
+
+class SteadyStateEvent:
+    """
+    Evento terminal de régimen permanente para solve_ivp
+
+    Se dispara cuando |ω_m - ω_s| < tolerance se mantiene durante hold_time
+    segundos. Tiene estado: recuerda desde cuándo la velocidad está dentro de
+    la banda. Sólo las evaluaciones que avanzan en el tiempo lo actualizan;
+    las de la búsqueda de la raíz dentro de un paso (instantes anteriores)
+    únicamente lo consultan, de modo que la función vale
+
+        hold_time                      fuera de la banda
+        hold_time - (t - t_entrada)    dentro de la banda
+
+    y cruza cero, decreciendo, al cumplirse el tiempo de permanencia.
+    """
+
+    terminal = True
+    direction = -1
+    name = 'steady_state'
+
+    def __init__(self, omega_s: float, tolerance: float = 1e-3, hold_time: float = 0.1):
+        self.omega_s = omega_s
+        self.tolerance = tolerance
+        self.hold_time = hold_time
+        self.reset()
+
+    def describe(self) -> Dict[str, Any]:
+        """Descripción serializable (para claves de caché)"""
+        return {'type': 'steady_state', 'omega_s': float(self.omega_s),
+                'tolerance': float(self.tolerance), 'hold_time': float(self.hold_time)}
+
+    def reset(self) -> None:
+        """Olvida el historial (al empezar una simulación nueva)"""
+        self._since = None
+        self._last_t = -np.inf
+
+    def __call__(self, t: float, state: np.ndarray) -> float:
+        inside = abs(state[0] - self.omega_s) < self.tolerance
+        if t > self._last_t:
+            self._last_t = t
+            if not inside:
+                self._since = None
+            elif self._since is None:
+                self._since = t
+
+        if not inside or self._since is None:
+            return self.hold_time
+        return self.hold_time - (t - self._since)
+
+
+def _event_name(event: Callable, events: List[Callable]) -> str:
+    """Nombre con el que se informa un evento"""
+    return getattr(event, 'name', getattr(event, '__name__', f'event_{events.index(event)}'))
+
+
+def _terminal_event(events: List[Callable], sol) -> Tuple[Optional[str], Optional[float]]:
+    """Nombre e instante del evento terminal que detuvo la integración"""
+    for index, event in enumerate(events):
+        if getattr(event, 'terminal', False) and len(sol.t_events[index]):
+            return _event_name(event, events), float(sol.t_events[index][-1])
+    return None, None
+
+
+def _bracketed_newton(residual: Callable, slope: Callable, lo: np.ndarray, hi: np.ndarray,
+                      x0: np.ndarray, tol: float = 1e-12,
+                      max_iterations: int = 60) -> np.ndarray:
+    """
+    Newton vectorizado protegido por bisección
+
+    Requiere residual(lo) y residual(hi) de signos opuestos en cada elemento;
+    los pasos de Newton que salen del intervalo se reemplazan por bisección.
+    """
+    lo, hi = lo.copy(), hi.copy()
+    lo_sign = np.sign(residual(lo))
+    x = np.clip(x0, np.minimum(lo, hi), np.maximum(lo, hi))
+    for _ in range(max_iterations):
+        value = residual(x)
+        same_side = np.sign(value) == lo_sign
+        lo = np.where(same_side, x, lo)
+        hi = np.where(same_side, hi, x)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = x - value / slope(x)
+        inside = np.isfinite(newton) & (newton > np.minimum(lo, hi)) & (newton < np.maximum(lo, hi))
+        new_x = np.where(inside, newton, (lo + hi) / 2)
+
+        step = np.abs(new_x - x)
+        x = new_x
+        if np.all((step < tol) | ~np.isfinite(step)):
+            break
+    return x
+
+
+def _overload_trial(snapshot: MotorParameters, ratio: float, t_final: float,
+                    initial_conditions: Dict[str, float], rtol: float,
+                    atol: float) -> Optional[float]:
+    """Tarea de búsqueda del límite: instante de deslizamiento de polo (None si no ocurre)"""
+    engine = SimulationEngine(snapshot._replace(T_load=snapshot.T_load * ratio))
+    engine.rtol, engine.atol = rtol, atol
+    return engine.pole_slip_time(t_final, initial_conditions)
+
+
 class SimulationEngine:
     """
     Motor de simulación para análisis dinámico y estático del motor síncrono
     """
 
-    def __init__(self, motor_model: SynchronousMotorModel):
+    def __init__(self, motor_model: Union[SynchronousMotorModel, MotorParameters],
+                 disk_cache: Optional[TransientDiskCache] = None):
+        # Un registro de parámetros basta para construir un motor propio
+        if isinstance(motor_model, MotorParameters):
+            motor_model = SynchronousMotorModel(motor_model)
         self.motor = motor_model
         self.tolerance = 1e-6
         self.max_iterations = 100
         self.time_step = 0.01  # s
 
-    def solve_steady_state(self, **fixed_params) -> Dict[str, float]:
+        # Tolerancias del integrador para simulaciones transitorias
+        self.rtol = 1e-8
+        self.atol = 1e-10
+
+        # Caché en disco opcional (por defecto, la configurada en disk_cache)
+        self.disk_cache = disk_cache if disk_cache is not None else get_default_cache()
+
+    @contextmanager
+    def _temporary_parameters(self, **params):
+        """Aplica parámetros al motor y garantiza su restauración al salir"""
+        original_params = {}
+        try:
+            for param, value in params.items():
+                if hasattr(self.motor, param):
+                    original_params[param] = getattr(self.motor, param)
+                    setattr(self.motor, param, value)
+            yield self.motor
+        finally:
+            for param, value in original_params.items():
+                setattr(self.motor, param, value)
+
+    def solve_steady_state(self, method: str = 'analytic', **fixed_params) -> Dict[str, float]:
         """
         Resuelve el estado estacionario del motor
         Encuentra el ángulo de carga δ que satisface T_e = T_L
+
+        Args:
+            method: 'analytic' (arcsin / Newton protegido, por defecto) o 'fsolve'
+            fixed_params: parámetros a aplicar temporalmente al motor
+
+        Los resultados incluyen 'delta_equilibrium' y 'has_equilibrium'; si
+        T_L supera el par máximo no existe equilibrio y δ se reporta como NaN.
         """
-        # Guardar parámetros actuales
-        original_params = {}
-        for param in fixed_params:
-            if hasattr(self.motor, param):
-                original_params[param] = getattr(self.motor, param)
-                setattr(self.motor, param, fixed_params[param])
+        if method not in ('analytic', 'fsolve'):
+            raise ValueError(f"Método de resolución desconocido: {method}")
+
+        with self._temporary_parameters(**fixed_params):
+            if method == 'analytic':
+                T1, T2 = self.motor.torque_coefficients()
+                delta, has_equilibrium = solve_load_angle(T1, T2, self.motor.T_load,
+                                                          tol=self.tolerance,
+                                                          max_iterations=self.max_iterations)
+                delta_solution, has_equilibrium = float(delta[0]), bool(has_equilibrium[0])
+            else:
+                delta_solution, has_equilibrium = self._solve_load_angle_fsolve()
+
+            if has_equilibrium:
+                # Actualizar el motor con la solución encontrada
+                self.motor.delta = delta_solution
+
+            # Calcular todas las variables
+            results = self.motor.steady_state_analysis()
+
+        results['delta_equilibrium'] = delta_solution
+        results['has_equilibrium'] = has_equilibrium
+
+        return results
+
+    def _solve_load_angle_fsolve(self) -> Tuple[float, bool]:
+        """Resuelve T_e(δ) - T_L = 0 numéricamente con fsolve"""
+        from scipy.optimize import fsolve
 
         def equilibrium_equation(delta):
             """Ecuación: T_e(δ) - T_L = 0"""
@@ -47,43 +302,74 @@ class SimulationEngine:
         # Estimación inicial del ángulo de carga
         delta_guess = 0.1  # rad
 
-        try:
-            # Resolver numéricamente
-            delta_solution = fsolve(equilibrium_equation, delta_guess,
-                                  xtol=self.tolerance, maxfev=self.max_iterations)
+        delta_solution, _, ier, message = fsolve(equilibrium_equation, delta_guess,
+                                                 xtol=self.tolerance, maxfev=self.max_iterations,
+                                                 full_output=True)
+        if ier != 1:
+            print(f"Sin equilibrio en estado estacionario: {message}")
+            return float('nan'), False
 
-            # Actualizar el motor con la solución encontrada
-            self.motor.delta = delta_solution[0]
+        return float(delta_solution[0]), True
 
-            # Calcular todas las variables
-            results = self.motor.steady_state_analysis()
+    def solve_steady_state_batch(self, **operating_points) -> Dict[str, np.ndarray]:
+        """
+        Resuelve el estado estacionario para arrays de puntos de operación
 
-        except Exception as e:
-            print(f"Error resolviendo estado estacionario: {e}")
-            # Fallback: análisis básico
-            results = self.motor.steady_state_analysis()
+        Args:
+            operating_points: arrays (con broadcasting) de V_line, f, If, T_load,
+                              Rs, Xd, Xq y/o p; los omitidos toman el valor del motor
+
+        Returns:
+            Resultado columnar de steady_state_analysis_batch() más
+            'delta_equilibrium', 'has_equilibrium' y 'T_max' por punto
+        """
+        results = self.motor.steady_state_analysis_batch(**operating_points)
+
+        T1, T2 = self.motor.torque_coefficients(
+            V_line=results['V_line'], f=results['f'], If=results['If'],
+            Xd=operating_points.get('Xd'), Xq=operating_points.get('Xq'),
+            p=operating_points.get('p'))
+        delta, has_equilibrium = solve_load_angle(T1, T2, results['T_load'],
+                                                  tol=self.tolerance,
+                                                  max_iterations=self.max_iterations)
+        delta_max = pull_out_angle(T1, T2)
 
-        # Restaurar parámetros originales
-        for param, value in original_params.items():
-            setattr(self.motor, param, value)
+        results['delta_equilibrium'] = delta
+        results['has_equilibrium'] = has_equilibrium
+        results['T_max'] = T1 * np.sin(delta_max) + T2 * np.sin(2 * delta_max)
 
         return results
 
     def simulate_transient_response(self,
                                   t_span: Tuple[float, float],
                                   initial_conditions: Optional[Dict[str, float]] = None,
-                                  events: Optional[List[Callable]] = None) -> Dict[str, np.ndarray]:
+                                  events: Optional[List[Callable]] = None,
+                                  compiled: bool = True,
+                                  inputs: Optional[Dict[str, Any]] = None,
+                                  num_points: int = 1000) -> Dict[str, np.ndarray]:
         """
         Simula respuesta transitoria completa del motor
 
         Args:
             t_span: (t_inicio, t_final)
             initial_conditions: condiciones iniciales {'omega_m': ..., 'delta': ...}
-            events: funciones para detectar eventos durante la simulación
+            events: funciones para detectar eventos durante la simulación; la
+                    caché en disco sólo se usa si todos tienen describe()
+            compiled: usar el lado derecho compilado (constantes precalculadas)
+            inputs: entradas variables en el tiempo, p.ej. {'T_load': perfil}
+                    (ver profiles.py); requieren compiled=True
+            num_points: número de muestras de la salida
 
         Returns:
-            Diccionario con arrays temporales de todas las variables
+            Diccionario con arrays temporales de todas las variables, más
+            'event'/'event_time' (evento terminal que detuvo la integración) y
+            'event_times': {nombre: [instantes]} con los cruces de todos los
+            eventos, terminales o no
         """
+        inputs = dict(inputs or {})
+        if inputs and not compiled:
+            raise ValueError("Las entradas variables requieren compiled=True")
+
         # Condiciones iniciales por defecto
         if initial_conditions is None:
             initial_conditions = {
@@ -93,68 +379,390 @@ class SimulationEngine:
 
         omega_m_0 = initial_conditions.get('omega_m', 0.0)
         delta_0 = initial_conditions.get('delta', 0.0)
-        state0 = np.array([omega_m_0, delta_0])
 
-        # Función de derivadas
-        def derivatives(t, state):
-            return self.motor.dynamic_model_derivatives(state, t)
+        # Caché en disco (no aplica con entradas o eventos sin describe())
+        cache_key = None
+        input_description = _describe_inputs(inputs)
+        event_description = _describe_events(events)
+        if (self.disk_cache is not None and input_description is not None
+                and event_description is not None):
+            solver_options = {'method': 'RK45', 'rtol': self.rtol, 'atol': self.atol,
+                              'num_points': num_points, 'compiled': compiled}
+            if input_description:
+                solver_options['inputs'] = input_description
+            if event_description:
+                solver_options['events'] = event_description
+            cache_key = self.disk_cache.make_key(
+                self.motor.parameters, t_span, {'omega_m': omega_m_0, 'delta': delta_0},
+                solver_options)
+            cached = self.disk_cache.load(cache_key)
+            if cached is not None:
+                return cached
+
+        results = self._integrate_transient(t_span, np.array([omega_m_0, delta_0]),
+                                            events, compiled, inputs, num_points)
+
+        if cache_key is not None and results:
+            self.disk_cache.store(cache_key, results)
 
-        # Simulación con solve_ivp (más robusto que odeint)
-        sol = solve_ivp(derivatives, t_span, state0,
-                       method='RK45', rtol=1e-8, atol=1e-10,
-                       dense_output=True, events=events)
+        return results
+
+    def _integrate_transient(self, t_span: Tuple[float, float], state0: np.ndarray,
+                             events: Optional[List[Callable]], compiled: bool,
+                             inputs: Optional[Dict[str, Any]] = None,
+                             num_points: int = 1000) -> Dict[str, np.ndarray]:
+        """
+        Integración de la respuesta transitoria (sin caché)
+
+        Si alguna entrada tiene discontinuidades (breakpoints), se integra por
+        tramos reiniciando el solver exactamente en cada una: el paso adaptativo
+        nunca cruza un salto de la entrada, y dentro de cada tramo las entradas
+        se evalúan con su límite por izquierda en el extremo final.
+        """
+        from scipy.integrate import solve_ivp
 
-        if not sol.success:
-            print(f"Error en simulación: {sol.message}")
-            return {}
+        inputs = inputs or {}
 
-        # Arrays temporales
-        t_eval = np.linspace(t_span[0], t_span[1], 1000)
-        states = sol.sol(t_eval)
+        # Función de derivadas
+        if compiled:
+            derivatives = self.motor.compile_dynamics(inputs)
+        else:
+            def derivatives(t, state):
+                return self.motor.dynamic_model_derivatives(state, t)
+
+        # Instantes de discontinuidad de las entradas
+        breakpoints = set()
+        for profile in inputs.values():
+            if hasattr(profile, 'breakpoints'):
+                breakpoints.update(profile.breakpoints(t_span))
+        bounds = [t_span[0]] + sorted(breakpoints) + [t_span[1]]
+
+        # Los eventos con estado (SteadyStateEvent) empiezan cada simulación desde cero
+        events = list(events or [])
+        for event in events:
+            if hasattr(event, 'reset'):
+                event.reset()
+
+        # Simulación con solve_ivp (más robusto que odeint), un tramo por vez
+        segment_starts = []
+        segments = []
+        fired_event, event_time = None, None
+        event_times = {_event_name(event, events): [] for event in events}
+        state = state0
+        first_step = None
+        for t_start, t_end in zip(bounds[:-1], bounds[1:]):
+            # Al reiniciar en una discontinuidad se conserva el último paso
+            # aceptado: evita repetir la selección del paso inicial en cada tramo
+            if first_step is not None:
+                first_step = min(first_step, t_end - t_start)
+            if compiled:
+                derivatives.hold_inputs_before(t_end)
+            sol = solve_ivp(derivatives, (t_start, t_end), state,
+                           method='RK45', rtol=self.rtol, atol=self.atol,
+                           dense_output=True, events=events or None,
+                           first_step=first_step)
+
+            if not sol.success:
+                print(f"Error en simulación: {sol.message}")
+                return {}
+
+            segment_starts.append(t_start)
+            segments.append(sol.sol)
+            for event, times in zip(events, sol.t_events or []):
+                event_times[_event_name(event, events)].extend(float(t) for t in times)
+            if sol.status == 1:  # evento terminal: la salida termina en él
+                fired_event, event_time = _terminal_event(events, sol)
+                break
+            state = sol.y[:, -1]
+            if len(sol.t) > 1:
+                # El último paso suele estar recortado para caer en t_end
+                first_step = float(np.max(np.diff(sol.t[-3:])))
+        t_stop = sol.t[-1]
+
+        # Arrays temporales: cada instante se evalúa en el tramo [t_i, t_(i+1))
+        # que lo contiene (el último tramo incluye su extremo final)
+        t_eval = np.linspace(t_span[0], t_stop, num_points)
+        segment_index = np.searchsorted(segment_starts[1:], t_eval, side='right')
+
+        states = np.empty((2, num_points))
+        for index, interpolant in enumerate(segments):
+            mask = segment_index == index
+            if np.any(mask):
+                states[:, mask] = interpolant(t_eval[mask])
 
         omega_m = states[0]
         delta = states[1]
 
         # Calcular variables dependientes en cada instante
+        results = self._derived_quantities(t_eval, omega_m, delta,
+                                           **_sample_inputs(inputs, t_eval))
+        results['event'] = fired_event
+        results['event_time'] = event_time
+        results['event_times'] = event_times
+        return results
+
+    def _derived_quantities(self, t_eval: np.ndarray, omega_m: np.ndarray,
+                            delta: np.ndarray, **inputs) -> Dict[str, np.ndarray]:
+        """
+        Calcula las variables dependientes sobre toda la trayectoria
+
+        Evaluación vectorizada de T_e(t), P(t), Q(t) y pf(t) sin modificar el
+        estado interno del motor. inputs: entradas muestreadas sobre t_eval.
+        """
+        T_load = inputs.pop('T_load', self.motor.T_load)
+
         results = {
             'time': t_eval,
             'omega_m': omega_m,
             'delta': delta,
             'delta_deg': np.degrees(delta),
-            'T_load': np.full_like(t_eval, self.motor.T_load)
+            'T_load': np.broadcast_to(np.asarray(T_load, dtype=float), t_eval.shape).copy()
         }
+        results.update(inputs)  # entradas variables, muestreadas sobre t_eval
+        results.update(self.motor.trajectory_quantities(delta, **inputs))
 
-        # Calcular T_e(t), potencias, etc. en cada punto
-        T_e_array = []
-        P_array = []
-        Q_array = []
-        pf_array = []
+        return results
 
-        for i, t in enumerate(t_eval):
-            # Actualizar estado temporal del motor
-            self.motor.delta = delta[i]
-            self.motor.omega_m = omega_m[i]
-            self.motor.time = t
+    def iter_transient_response(self, t_span: Tuple[float, float],
+                                initial_conditions: Optional[Dict[str, float]] = None,
+                                sample_interval: float = 1e-3, chunk_size: int = 10000,
+                                inputs: Optional[Dict[str, Any]] = None,
+                                events: Optional[List[Callable]] = None
+                                ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Respuesta transitoria como flujo de bloques de tamaño fijo
 
-            # Calcular par electromagnético
-            T_e = self.motor.calculate_torque_from_angle(delta[i])
-            T_e_array.append(T_e)
+        Integra paso a paso (RK45, mismas tolerancias que
+        simulate_transient_response) y muestrea cada paso con su propio
+        interpolante: la memoria queda acotada por chunk_size,
+        independientemente de la duración simulada. Pensado para ciclos de
+        trabajo largos cuyo resultado se escribe a disco o se grafica
+        incrementalmente.
 
-            # Para potencias necesitamos análisis fasorial completo
-            # (esto es una aproximación simplificada)
-            omega_s = self.motor.synchronous_speed()
-            P_inst = T_e * omega_s  # P = T_e * ω_s
-            P_array.append(P_inst)
+        Args:
+            t_span: (t_inicio, t_final)
+            initial_conditions: condiciones iniciales {'omega_m': ..., 'delta': ...}
+            sample_interval: separación uniforme entre muestras (s)
+            chunk_size: muestras por bloque (el último puede ser menor)
+            inputs: entradas variables en el tiempo (ver simulate_transient_response)
+            events: eventos; los terminales detienen la integración
+
+        Yields:
+            Diccionarios con las mismas columnas que simulate_transient_response
+            (time, omega_m, delta, T_e, P, Q, pf, ...). El último bloque
+            incluye además 'event', 'event_time' y 'event_times' (todos los
+            cruces, terminales o no, como en simulate_transient_response).
+        """
+        from scipy.integrate import RK45
+        from scipy.optimize import brentq
+
+        inputs = dict(inputs or {})
+        if initial_conditions is None:
+            initial_conditions = {'omega_m': 0.0, 'delta': 0.0}
+        state = np.array([initial_conditions.get('omega_m', 0.0),
+                          initial_conditions.get('delta', 0.0)])
+
+        derivatives = self.motor.compile_dynamics(inputs)
+        t_start, t_final = t_span
+        n_samples = int(np.floor((t_final - t_start) / sample_interval + 1e-9)) + 1
+
+        breakpoints = set()
+        for profile in inputs.values():
+            if hasattr(profile, 'breakpoints'):
+                breakpoints.update(profile.breakpoints(t_span))
+        bounds = [t_start] + sorted(breakpoints) + [t_final]
+
+        events = list(events or [])
+        for event in events:
+            if hasattr(event, 'reset'):
+                event.reset()
+        event_values = [event(t_start, state) for event in events]
+
+        # Búfer del bloque en curso; la primera muestra es el estado inicial
+        chunk_time = np.empty(chunk_size)
+        chunk_states = np.empty((2, chunk_size))
+        chunk_time[0], chunk_states[:, 0] = t_start, state
+        filled, next_sample = 1, 1
+
+        fired_event, event_time = None, None
+        event_times = {_event_name(event, events): [] for event in events}
+        first_step = None
+        for segment_start, segment_end in zip(bounds[:-1], bounds[1:]):
+            if first_step is not None:
+                first_step = min(first_step, segment_end - segment_start)
+            derivatives.hold_inputs_before(segment_end)
+            solver = RK45(derivatives, segment_start, state, segment_end,
+                          rtol=self.rtol, atol=self.atol, first_step=first_step)
+
+            while solver.status == 'running':
+                solver.step()
+                if solver.status == 'failed':
+                    raise RuntimeError(f"Error en simulación: {solver.message}")
+                step_interpolant = solver.dense_output()
+                step_end = solver.t
+
+                # Eventos: cambio de signo en el paso, raíz sobre el interpolante.
+                # Se registran en orden hasta el primer evento terminal
+                new_values = [event(step_end, solver.y) for event in events]
+                crossings = []
+                for event, old, new in zip(events, event_values, new_values):
+                    direction = getattr(event, 'direction', 0)
+                    rising, falling = old <= 0 <= new, old >= 0 >= new
+                    crossed = rising if direction > 0 else falling if direction < 0 else (
+                        rising or falling)
+                    if crossed and old != new:
+                        root = brentq(lambda t: event(t, step_interpolant(t)),
+                                      solver.t_old, step_end)
+                        crossings.append((root, event))
+                for root, event in sorted(crossings, key=lambda crossing: crossing[0]):
+                    event_times[_event_name(event, events)].append(root)
+                    if getattr(event, 'terminal', False):
+                        fired_event, event_time = _event_name(event, events), root
+                        break
+                event_values = new_values
+                if fired_event is not None:
+                    step_end = event_time
+
+                # Muestras uniformes que caen dentro del paso
+                last_sample = min(n_samples,
+                                  int(np.floor((step_end - t_start) / sample_interval + 1e-9)) + 1)
+                if fired_event is None and solver.status == 'finished' and segment_end == t_final:
+                    last_sample = n_samples
+                while next_sample < last_sample:
+                    count = min(last_sample - next_sample, chunk_size - filled)
+                    sample_times = t_start + sample_interval * np.arange(next_sample,
+                                                                         next_sample + count)
+                    chunk_time[filled:filled + count] = sample_times
+                    chunk_states[:, filled:filled + count] = step_interpolant(sample_times)
+                    filled += count
+                    next_sample += count
+                    if filled == chunk_size:
+                        yield self._streamed_chunk(chunk_time, chunk_states, filled, inputs)
+                        filled = 0
+
+                if fired_event is not None:
+                    break
+
+            if fired_event is not None:
+                break
+            state = solver.y
+            first_step = solver.step_size
+
+        final_chunk = self._streamed_chunk(chunk_time, chunk_states, filled, inputs)
+        final_chunk['event'] = fired_event
+        final_chunk['event_time'] = event_time
+        final_chunk['event_times'] = event_times
+        yield final_chunk
+
+    def _streamed_chunk(self, chunk_time: np.ndarray, chunk_states: np.ndarray,
+                        filled: int, inputs: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """Variables derivadas de un bloque (copia: el búfer se reutiliza)"""
+        t = chunk_time[:filled].copy()
+        omega_m, delta = chunk_states[:, :filled].copy()
+        return self._derived_quantities(t, omega_m, delta, **_sample_inputs(inputs, t))
+
+    def simulate_ensemble(self, t_span: Tuple[float, float],
+                          parameters: Dict[str, Any],
+                          initial_conditions: Optional[Dict[str, Any]] = None,
+                          num_points: int = 1000,
+                          dt: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Simula un ensamble de N motores en una única integración vectorizada
 
-            # Q y pf requieren cálculo fasorial completo - aproximación
-            Q_array.append(0.0)  # TODO: implementar cálculo completo
-            pf_array.append(1.0)  # TODO: implementar cálculo completo
+        Integra el sistema de 2N estados con Runge-Kutta de orden 4 y paso
+        fijo en NumPy, apto para estudios de Monte-Carlo de tolerancias.
 
+        Args:
+            t_span: (t_inicio, t_final)
+            parameters: arrays de N valores (o escalares) para J, B, Rs, Xd, Xq,
+                        T_load, V_line, f, If y/o p; los omitidos se toman del motor
+            initial_conditions: {'omega_m': ..., 'delta': ...}, escalares o arrays de N
+            num_points: número de muestras temporales T de la salida
+            dt: paso de integración; por defecto se elige según la frecuencia
+                natural más alta del ensamble
+
+        Returns:
+            Diccionario con 'time' (T,) y un array (N, T) por variable
+        """
+        names = ('J', 'B', 'Rs', 'Xd', 'Xq', 'T_load', 'V_line', 'f', 'If', 'p')
+        unknown = set(parameters) - set(names)
+        if unknown:
+            raise ValueError(f"Parámetros de ensamble desconocidos: {sorted(unknown)}")
+
+        members = dict(zip(names, np.broadcast_arrays(*[
+            np.atleast_1d(np.asarray(parameters.get(name, getattr(self.motor, name)), dtype=float))
+            for name in names
+        ])))
+        if members['J'].ndim != 1:
+            raise ValueError("Los parámetros del ensamble deben ser arrays unidimensionales")
+        n_members = members['J'].size
+
+        # Constantes por miembro
+        T1, T2 = self.motor.torque_coefficients(
+            V_line=members['V_line'], f=members['f'], If=members['If'],
+            Xd=members['Xd'], Xq=members['Xq'], p=members['p'])
+        omega_s = 2 * np.pi * members['f'] / members['p']
+        T_load, B, J = members['T_load'], members['B'], members['J']
+        salient = bool(np.any(T2 != 0))
+
+        # Condiciones iniciales
+        if initial_conditions is None:
+            initial_conditions = {'omega_m': 0.0, 'delta': 0.0}
+        omega_m = np.broadcast_to(np.asarray(initial_conditions.get('omega_m', 0.0),
+                                             dtype=float), (n_members,)).copy()
+        delta = np.broadcast_to(np.asarray(initial_conditions.get('delta', 0.0),
+                                           dtype=float), (n_members,)).copy()
+
+        # Malla de salida y paso de integración (entero de subpasos por muestra)
+        t_eval = np.linspace(t_span[0], t_span[1], num_points)
+        sample_dt = (t_span[1] - t_span[0]) / max(num_points - 1, 1)
+        if dt is None:
+            natural_frequency = np.sqrt(np.max(np.abs(T1) + 2 * np.abs(T2)) / np.min(J))
+            dt = min(sample_dt, 0.05 / natural_frequency)
+        substeps = max(1, int(np.ceil(sample_dt / dt)))
+        h = sample_dt / substeps
+
+        # Coeficientes normalizados por J para reducir operaciones por etapa
+        a1, a2, c0, b0 = T1 / J, T2 / J, T_load / J, B / J
+
+        def derivatives(omega_m, delta):
+            d_omega = a1 * np.sin(delta)
+            if salient:
+                d_omega += a2 * np.sin(2 * delta)
+            d_omega -= c0 + b0 * omega_m
+            return d_omega, omega_s - omega_m
+
+        omega_history = np.empty((n_members, num_points))
+        delta_history = np.empty((n_members, num_points))
+        omega_history[:, 0] = omega_m
+        delta_history[:, 0] = delta
+
+        for k in range(1, num_points):
+            for _ in range(substeps):
+                k1_w, k1_d = derivatives(omega_m, delta)
+                k2_w, k2_d = derivatives(omega_m + 0.5 * h * k1_w, delta + 0.5 * h * k1_d)
+                k3_w, k3_d = derivatives(omega_m + 0.5 * h * k2_w, delta + 0.5 * h * k2_d)
+                k4_w, k4_d = derivatives(omega_m + h * k3_w, delta + h * k3_d)
+                omega_m = omega_m + h / 6 * (k1_w + 2 * k2_w + 2 * k3_w + k4_w)
+                delta = delta + h / 6 * (k1_d + 2 * k2_d + 2 * k3_d + k4_d)
+            omega_history[:, k] = omega_m
+            delta_history[:, k] = delta
+
+        # Variables derivadas con parámetros por miembro (columnas (N, 1))
+        column = {name: members[name][:, None]
+                  for name in ('V_line', 'f', 'If', 'Rs', 'Xd', 'Xq', 'p')}
+        results = {
+            'time': t_eval,
+            'omega_m': omega_history,
+            'delta': delta_history,
+            'delta_deg': np.degrees(delta_history),
+            'T_load': np.broadcast_to(T_load[:, None], (n_members, num_points))
+        }
+        results.update(self.motor.trajectory_quantities(delta_history, **column))
         results.update({
-            'T_e': np.array(T_e_array),
-            'P': np.array(P_array),
-            'Q': np.array(Q_array),
-            'pf': np.array(pf_array)
+            'parameters': members,
+            'n_members': n_members,
+            'dt': h
         })
 
         return results
@@ -172,30 +780,91 @@ class SimulationEngine:
 
         Returns:
             Lista de diccionarios con resultados para cada valor del parámetro
+
+        Los parámetros de _BATCH_FIELDS se resuelven en una sola llamada a
+        solve_steady_state_batch(); el resto, punto por punto.
         """
         values = np.linspace(value_range[0], value_range[1], num_points)
         results = []
 
-        # Guardar valor original
-        original_value = getattr(self.motor, parameter)
+        # Los parámetros del motor se restauran aun si ocurre una excepción
+        with self._temporary_parameters(**fixed_params):
+            if parameter in _BATCH_FIELDS:
+                return _steady_state_rows(self, parameter, values)
+            for value in values:
+                with self._temporary_parameters(**{parameter: value}):
+                    # Resolver estado estacionario
+                    result = self.solve_steady_state()
+                result[f'parameter_{parameter}'] = value
+                results.append(result)
 
-        for value in values:
-            # Actualizar parámetro
-            setattr(self.motor, parameter, value)
+        return results
 
-            # Aplicar parámetros fijos
-            for param, val in fixed_params.items():
-                setattr(self.motor, param, val)
+    def parallel_parameter_sweep(self, parameter: str, value_range: Tuple[float, float],
+                                 num_points: int = 20, max_workers: Optional[int] = None,
+                                 chunksize: Optional[int] = None, backend: str = 'process',
+                                 **fixed_params) -> List[Dict[str, float]]:
+        """
+        Barrido de parámetros en paralelo; mismos resultados que parameter_sweep()
 
-            # Resolver estado estacionario
-            result = self.solve_steady_state()
-            result[f'parameter_{parameter}'] = value
-            results.append(result)
+        Ver iter_parallel_parameter_sweep() para la descripción de los argumentos.
+        """
+        return list(self.iter_parallel_parameter_sweep(
+            parameter, value_range, num_points, max_workers=max_workers,
+            chunksize=chunksize, backend=backend, **fixed_params))
+
+    def iter_parallel_parameter_sweep(self, parameter: str, value_range: Tuple[float, float],
+                                      num_points: int = 20, max_workers: Optional[int] = None,
+                                      chunksize: Optional[int] = None, backend: str = 'process',
+                                      **fixed_params) -> Iterator[Dict[str, float]]:
+        """
+        Barrido de parámetros en paralelo como flujo ordenado de resultados
 
-        # Restaurar valor original
-        setattr(self.motor, parameter, original_value)
+        El motor no se modifica: cada tarea recibe una copia inmutable de los
+        parámetros y construye su propio modelo.
 
-        return results
+        Args:
+            parameter: nombre del parámetro a variar
+            value_range: (valor_min, valor_max)
+            num_points: número de puntos en el barrido
+            max_workers: número de procesos/hilos (por defecto, núcleos disponibles)
+            chunksize: puntos por tarea (por defecto, ~4 tareas por trabajador)
+            backend: 'process' (ProcessPoolExecutor) o 'thread' (ThreadPoolExecutor
+                     con resolución vectorizada de cada bloque)
+            fixed_params: otros parámetros a mantener fijos
+
+        Yields:
+            Diccionarios de resultados en el orden de los valores del barrido
+        """
+        if backend not in ('process', 'thread'):
+            raise ValueError(f"Backend de barrido desconocido: {backend}")
+        if not hasattr(self.motor, parameter):
+            raise AttributeError(f"El motor no tiene el parámetro '{parameter}'")
+
+        values = np.linspace(value_range[0], value_range[1], num_points)
+        snapshot = self._parameter_snapshot(**fixed_params)
+
+        max_workers = max_workers or os.cpu_count() or 1
+        if chunksize is None:
+            chunksize = max(1, int(np.ceil(num_points / (4 * max_workers))))
+        chunks = [values[i:i + chunksize] for i in range(0, num_points, chunksize)]
+
+        if backend == 'process':
+            executor_class, task = ProcessPoolExecutor, _sweep_chunk
+        else:
+            executor_class, task = ThreadPoolExecutor, _sweep_chunk_vectorized
+
+        with executor_class(max_workers=max_workers) as executor:
+            # executor.map conserva el orden de envío de los bloques
+            for chunk_results in executor.map(task, repeat(snapshot), repeat(parameter), chunks):
+                yield from chunk_results
+
+    def _parameter_snapshot(self, **overrides) -> MotorParameters:
+        """Copia inmutable de los parámetros del motor, con cambios opcionales"""
+        return self.motor.parameters._replace(**{
+            name: value for name, value in overrides.items()
+            if name in MotorParameters._fields
+        })
 
     def stability_analysis(self, delta_range: Tuple[float, float] = (-np.pi/2, np.pi/2),
                           num_points: int = 100) -> Dict[str, np.ndarray]:
@@ -205,10 +874,18 @@ class SimulationEngine:
         Returns:
             Diccionario con curvas de estabilidad
         """
+        results = self.motor.cache.get_or_compute('stability_analysis', TORQUE_CURVE_FIELDS,
+                                                  self.motor.parameters, self._stability_analysis,
+                                                  tuple(delta_range), num_points)
+        return dict(results)
+
+    def _stability_analysis(self, delta_range: Tuple[float, float],
+                            num_points: int) -> Dict[str, np.ndarray]:
+        """Análisis de estabilidad sin caché"""
         deltas = np.linspace(delta_range[0], delta_range[1], num_points)
 
         # Curva par-ángulo
-        T_e_curve = np.array([self.motor.calculate_torque_from_angle(delta) for delta in deltas])
+        T_e_curve = self.motor.calculate_torque_from_angle(deltas)
 
         # Derivada dT_e/dδ (estabilidad local)
         dTe_ddelta = np.gradient(T_e_curve, deltas)
@@ -230,6 +907,341 @@ class SimulationEngine:
             'delta_max': delta_max
         }
 
+    def small_signal_analysis(self, delta: Optional[np.ndarray] = None,
+                              **operating_points) -> Dict[str, np.ndarray]:
+        """
+        Linealización del modelo dinámico y modo electromecánico, por lotes
+
+        Alternativa rápida a la simulación temporal: en cada punto de
+        operación evalúa el Jacobiano analítico y sus autovalores, raíces de
+
+            λ² + (B/J) λ + K/J = 0
+
+        con ω_n = √(K/J) y ζ = B / (2 J ω_n). El punto es estable si ambos
+        autovalores tienen parte real negativa (K > 0 y B > 0).
+
+        Args:
+            delta: ángulos de linealización; por defecto, el equilibrio del
+                   modelo dinámico (T_e = T_L + B·ω_s)
+            operating_points: arrays (con broadcasting) de V_line, f, If,
+                              T_load, Xd, Xq, p, J y/o B; los omitidos toman
+                              el valor del motor
+
+        Returns:
+            Diccionario columnar con 'delta', 'has_equilibrium',
+            'synchronizing_torque', 'jacobian' (N, 2, 2), 'eigenvalues' (N, 2),
+            'natural_frequency' (rad/s), 'damped_frequency' (rad/s),
+            'damping_ratio' y 'stable'
+        """
+        unknown = set(operating_points) - set(_BATCH_FIELDS) - {'J', 'B'}
+        if unknown:
+            raise ValueError(f"Parámetros no vectorizables: {sorted(unknown)}")
+
+        motor = self.motor
+        values = {name: np.asarray(operating_points.get(name, getattr(motor, name)), dtype=float)
+                  for name in ('V_line', 'f', 'If', 'T_load', 'Xd', 'Xq', 'p', 'J', 'B')}
+        electrical = {name: values[name] for name in ('V_line', 'f', 'If', 'Xd', 'Xq', 'p')}
+
+        T1, T2 = motor.torque_coefficients(**electrical)
+        if delta is None:
+            omega_s = synchronous_speed_radps(values['f'], values['p'])
+            delta, has_equilibrium = solve_load_angle(
+                T1, T2, values['T_load'] + values['B'] * omega_s,
+                tol=self.tolerance, max_iterations=self.max_iterations)
+        else:
+            delta = np.atleast_1d(np.asarray(delta, dtype=float))
+            has_equilibrium = np.ones(np.broadcast(delta, T1).shape, dtype=bool)
+
+        jacobian = motor.dynamics_jacobian(delta, J=values['J'], B=values['B'], **electrical)
+        a = -jacobian[..., 0, 0]   # B/J
+        b = jacobian[..., 0, 1]    # K/J
+
+        # Raíces de λ² + a λ + b = 0 (discriminante complejo si hay oscilación)
+        root = np.sqrt((a * a / 4 - b).astype(complex))
+        eigenvalues = np.stack([-a / 2 + root, -a / 2 - root], axis=-1)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            natural_frequency = np.where(b > 0, np.sqrt(np.abs(b)), np.nan)
+            damping_ratio = a / (2 * natural_frequency)
+
+        return {
+            'delta': np.broadcast_to(delta, b.shape).copy(),
+            'has_equilibrium': np.broadcast_to(has_equilibrium, b.shape).copy(),
+            'synchronizing_torque': b * np.broadcast_to(values['J'], b.shape),
+            'jacobian': jacobian,
+            'eigenvalues': eigenvalues,
+            'natural_frequency': natural_frequency,
+            'damped_frequency': np.abs(eigenvalues[..., 0].imag),
+            'damping_ratio': damping_ratio,
+            'stable': np.all(eigenvalues.real < 0, axis=-1) & has_equilibrium
+        }
+
+    def equal_area_analysis(self, voltage_factor=1.0, T_load_during=None,
+                            T_load_post=None, T_load_pre=None, n_quadrature: int = 32,
+                            verify: bool = False, t_final: float = 2.0,
+                            verify_margin: float = 0.02) -> Dict[str, np.ndarray]:
+        """
+        Criterio de igualdad de áreas: ángulo y tiempo crítico de despeje, por lotes
+
+        Cada caso es una perturbación aplicada en t = 0 desde el equilibrio
+        previo y despejada en t_c: durante ella la tensión cae a
+        voltage_factor·V (T1 ∝ V, T2 ∝ V²) y la carga pasa a T_load_during;
+        después la tensión vuelve a V y la carga a T_load_post. El rozamiento
+        a velocidad síncrona (B·ω_s) se suma a la carga; se desprecia el
+        amortiguamiento de las oscilaciones, como es usual en el criterio.
+
+        El ángulo crítico δ_cc iguala la energía ganada durante la perturbación
+        con el área de desaceleración disponible hasta el equilibrio inestable
+        posterior δ_u:
+
+            ∫[δ0, δcc] (T_L,d - T_e,d) dδ = ∫[δcc, δu] (T_e - T_L,post) dδ
+
+        con integrales en forma cerrada y Newton protegido para δ_cc. El tiempo
+        crítico resulta de  t = ∫ dδ / √(2 W(δ)/J),  W la energía cinética
+        acumulada, integrada por cuadratura de Gauss-Legendre con δ = δ0 + u²
+        (elimina la singularidad en δ0). Es exacto si la perturbación frena
+        al rotor en todo [δ0, δ_cc] (T_e,d < T_L,d), el caso de interés.
+
+        Args:
+            voltage_factor: tensión durante la perturbación (p.u.)
+            T_load_during, T_load_post, T_load_pre: cargas (por defecto T_load)
+            n_quadrature: nodos de la cuadratura del tiempo crítico
+            verify: comprobar cada caso con dos simulaciones completas, con
+                    despeje en t_cc·(1 ∓ verify_margin)
+            t_final: horizonte de las simulaciones de verificación
+
+        Returns:
+            Diccionario columnar con 'delta_0', 'delta_post', 'delta_unstable',
+            'critical_clearing_angle', 'critical_clearing_time' (inf si la
+            perturbación no necesita despejarse, 0 si el estado posterior no
+            es estable) y 'stable_without_clearing'; con verify además
+            'verified' (False en los casos sin tiempo crítico finito)
+        """
+        motor = self.motor
+        T_nominal = motor.T_load
+        T_load_pre = T_nominal if T_load_pre is None else T_load_pre
+        T_load_during = T_load_pre if T_load_during is None else T_load_during
+        T_load_post = T_load_pre if T_load_post is None else T_load_post
+
+        friction = motor.B * motor.synchronous_speed()
+        k, T_pre, T_during, T_post = np.broadcast_arrays(
+            *[np.atleast_1d(np.asarray(x, dtype=float))
+              for x in (voltage_factor, T_load_pre, T_load_during, T_load_post)])
+        T_pre, T_during, T_post = T_pre + friction, T_during + friction, T_post + friction
+
+        T1, T2 = (float(c) for c in motor.torque_coefficients())
+        T1_d, T2_d = k * T1, k * k * T2
+
+        def torque(delta, T1, T2):
+            return T1 * np.sin(delta) + T2 * np.sin(2 * delta)
+
+        def antiderivative(delta, T1, T2):
+            return -T1 * np.cos(delta) - T2 / 2 * np.cos(2 * delta)
+
+        # Equilibrios: previo, posterior estable y posterior inestable
+        delta_0, has_pre = solve_load_angle(T1, T2, T_pre)
+        delta_post, has_post = solve_load_angle(T1, T2, T_post)
+        valid = has_pre & has_post
+        delta_pull = float(pull_out_angle(T1, T2))
+        delta_unstable = np.where(valid, _bracketed_newton(
+            lambda d: torque(d, T1, T2) - T_post,
+            lambda d: T1 * np.cos(d) + 2 * T2 * np.cos(2 * d),
+            np.full_like(T_post, delta_pull), np.full_like(T_post, np.pi),
+            np.pi - np.nan_to_num(delta_post)), np.nan)
+
+        delta_0_safe = np.nan_to_num(delta_0)
+        delta_u_safe = np.nan_to_num(delta_unstable, nan=np.pi)
+
+        def energy(delta, delta_0=delta_0_safe, T_during=T_during, T1_d=T1_d, T2_d=T2_d):
+            """Energía ganada durante la perturbación, W(δ)"""
+            return (T_during * (delta - delta_0)
+                    - antiderivative(delta, T1_d, T2_d) + antiderivative(delta_0, T1_d, T2_d))
+
+        def margin(delta):
+            """W(δ) menos el área de desaceleración disponible tras despejar en δ"""
+            decelerating = (antiderivative(delta_u_safe, T1, T2) - antiderivative(delta, T1, T2)
+                            - T_post * (delta_u_safe - delta))
+            return energy(delta) - decelerating
+
+        def margin_slope(delta):
+            return (T_during - torque(delta, T1_d, T2_d)) + (torque(delta, T1, T2) - T_post)
+
+        unstable_after = valid & (margin(delta_0_safe) >= 0)
+        stable_without_clearing = valid & ~unstable_after & (margin(delta_u_safe) <= 0)
+        solvable = valid & ~unstable_after & ~stable_without_clearing
+
+        clearing_angle = _bracketed_newton(margin, margin_slope, delta_0_safe, delta_u_safe,
+                                           (delta_0_safe + delta_u_safe) / 2)
+        clearing_angle = np.where(solvable, clearing_angle, np.nan)
+        clearing_angle = np.where(unstable_after, delta_0, clearing_angle)
+        clearing_angle = np.where(stable_without_clearing, delta_unstable, clearing_angle)
+
+        # Tiempo crítico: t = ∫ 2u du / √(2 W(δ0 + u²)/J),  u ∈ [0, √(δcc - δ0)]
+        nodes, weights = np.polynomial.legendre.leggauss(n_quadrature)
+        u_max = np.sqrt(np.where(solvable, clearing_angle - delta_0_safe, 0.0))[..., None]
+        u = u_max * (nodes + 1) / 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            W = energy(delta_0_safe[..., None] + u * u, delta_0_safe[..., None],
+                       T_during[..., None], T1_d[..., None], T2_d[..., None])
+            integrand = 2 * u / np.sqrt(2 * W / motor.J)
+        clearing_time = np.sum(integrand * weights, axis=-1) * u_max[..., 0] / 2
+        clearing_time = np.where(solvable, clearing_time, np.nan)
+        clearing_time = np.where(unstable_after, 0.0, clearing_time)
+        clearing_time = np.where(stable_without_clearing, np.inf, clearing_time)
+
+        results = {
+            'voltage_factor': k,
+            'T_load_pre': T_pre - friction,
+            'T_load_during': T_during - friction,
+            'T_load_post': T_post - friction,
+            'delta_0': delta_0,
+            'delta_post': delta_post,
+            'delta_unstable': delta_unstable,
+            'critical_clearing_angle': clearing_angle,
+            'critical_clearing_time': clearing_time,
+            'stable_without_clearing': stable_without_clearing
+        }
+
+        if verify:
+            results['verified'] = self._verify_clearing_times(results, t_final, verify_margin)
+        return results
+
+    def _verify_clearing_times(self, results: Dict[str, np.ndarray], t_final: float,
+                               verify_margin: float) -> np.ndarray:
+        """Comprueba cada tiempo crítico con simulaciones despejando antes y después"""
+        V_nominal = self.motor.V_line
+        omega_s = self.motor.synchronous_speed()
+        verified = np.zeros(len(results['critical_clearing_time']), dtype=bool)
+
+        for i, t_critical in enumerate(results['critical_clearing_time']):
+            if not np.isfinite(t_critical) or t_critical <= 0:
+                continue
+
+            outcomes = []
+            for t_clear in (t_critical * (1 - verify_margin), t_critical * (1 + verify_margin)):
+                inputs = {
+                    'V_line': PiecewiseProfile([0.0, t_clear], [
+                        V_nominal * results['voltage_factor'][i], V_nominal]),
+                    'T_load': PiecewiseProfile([0.0, t_clear], [
+                        results['T_load_during'][i], results['T_load_post'][i]])
+                }
+                with self._temporary_parameters(T_load=results['T_load_pre'][i]):
+                    simulation = self.simulate_transient_response(
+                        (0, max(t_final, 2 * t_clear)),
+                        {'omega_m': omega_s, 'delta': results['delta_0'][i]},
+                        events=[pole_slip_event()], inputs=inputs, num_points=2)
+                outcomes.append(simulation['event'] == 'pole_slip')
+
+            # Estable despejando antes del tiempo crítico, inestable después
+            verified[i] = outcomes == [False, True]
+        return verified
+
+    def pole_slip_time(self, t_final: float,
+                       initial_conditions: Dict[str, float]) -> Optional[float]:
+        """
+        Integra hasta t_final o hasta el deslizamiento de polo, lo que ocurra antes
+
+        Returns:
+            Instante de pérdida de sincronismo, o None si el motor se mantiene
+            en sincronismo durante todo el intervalo
+        """
+        from scipy.integrate import solve_ivp
+
+        state0 = [initial_conditions.get('omega_m', self.motor.synchronous_speed()),
+                  initial_conditions.get('delta', 0.0)]
+        sol = solve_ivp(self.motor.compile_dynamics(), (0, t_final), state0,
+                       method='RK45', rtol=self.rtol, atol=self.atol,
+                       events=[pole_slip_event()])
+
+        if sol.status == 1:
+            return float(sol.t_events[0][0])
+        return None
+
+    def find_stability_limit(self, bracket: Optional[Tuple[float, float]] = None,
+                             tol: float = 1e-3, t_final: float = 2.0,
+                             initial_conditions: Optional[Dict[str, float]] = None,
+                             batch_size: Optional[int] = None,
+                             max_workers: Optional[int] = None,
+                             backend: str = 'process') -> Dict[str, Any]:
+        """
+        Busca la razón de sobrecarga crítica a la que el motor pierde sincronismo
+
+        Cada iteración simula en paralelo un lote de n razones equiespaciadas
+        dentro del intervalo [estable, inestable] y lo reduce al subintervalo
+        donde cambia el resultado (búsqueda por k-sección: con n = 1 es
+        bisección). Cada simulación termina en cuanto se detecta el
+        deslizamiento de polo.
+
+        Args:
+            bracket: (razón estable, razón inestable); por defecto
+                     (1, T_max/T_nominal), el límite estático
+            tol: ancho final del intervalo
+            t_final: horizonte de cada simulación; una razón es estable si no
+                     hay deslizamiento de polo antes de t_final
+            initial_conditions: condiciones iniciales de cada prueba
+            batch_size: razones por iteración (por defecto, max_workers)
+            max_workers: número de procesos/hilos (por defecto, núcleos disponibles)
+            backend: 'process' o 'thread'
+
+        Returns:
+            Diccionario con la razón crítica, el intervalo final, el número de
+            simulaciones y el tiempo de cálculo
+        """
+        if backend not in ('process', 'thread'):
+            raise ValueError(f"Backend de búsqueda desconocido: {backend}")
+
+        start_time = time.perf_counter()
+        T_nominal = self.motor.T_load
+        if bracket is None:
+            T_max, _ = self.motor.maximum_torque()
+            bracket = (1.0, T_max / T_nominal)
+        if initial_conditions is None:
+            initial_conditions = {'omega_m': self.motor.synchronous_speed(), 'delta': 0.3}
+
+        max_workers = max_workers or os.cpu_count() or 1
+        batch_size = batch_size or max_workers
+        snapshot = self._parameter_snapshot()
+        executor_class = ProcessPoolExecutor if backend == 'process' else ThreadPoolExecutor
+
+        lower, upper = bracket
+        n_simulations = 0
+        n_iterations = 0
+
+        with executor_class(max_workers=max_workers) as executor:
+            def slipped(ratios):
+                return [slip_time is not None for slip_time in executor.map(
+                    _overload_trial, repeat(snapshot), ratios, repeat(t_final),
+                    repeat(initial_conditions), repeat(self.rtol), repeat(self.atol))]
+
+            # Verificar que el intervalo inicial encierre el límite
+            lower_slips, upper_slips = slipped([lower, upper])
+            n_simulations += 2
+            if lower_slips or not upper_slips:
+                raise ValueError(f"El intervalo {bracket} no encierra el límite de estabilidad")
+
+            while upper - lower > tol:
+                ratios = lower + (upper - lower) * np.arange(1, batch_size + 1) / (batch_size + 1)
+                outcomes = slipped(ratios)
+                n_simulations += batch_size
+                n_iterations += 1
+
+                # Se supone monotonía: estable por debajo del límite, inestable por encima
+                first_unstable = outcomes.index(True) if True in outcomes else batch_size
+                if first_unstable > 0:
+                    lower = float(ratios[first_unstable - 1])
+                if first_unstable < batch_size:
+                    upper = float(ratios[first_unstable])
+
+        critical_ratio = (lower + upper) / 2
+        return {
+            'critical_ratio': critical_ratio,
+            'critical_load': critical_ratio * T_nominal,
+            'bracket': (lower, upper),
+            'n_simulations': n_simulations,
+            'n_iterations': n_iterations,
+            'wall_time': time.perf_counter() - start_time
+        }
+
     def find_operating_point(self, target_parameter: str, target_value: float,
                            vary_parameter: str, param_range: Tuple[float, float]) -> Optional[float]:
         """
@@ -246,6 +1258,8 @@ class SimulationEngine:
         Returns:
             Valor del parámetro que produce el resultado deseado
         """
+        from scipy.optimize import fsolve
+
         def objective_function(param_value):
             setattr(self.motor, vary_parameter, param_value)
             results = self.motor.steady_state_analysis()
@@ -293,7 +1307,10 @@ class SimulationEngine:
         original_T_load = self.motor.T_load
         self.motor.T_load = 0.0
 
-        results = self.simulate_transient_response(t_span, initial_conditions)
+        # La simulación termina al alcanzar el régimen permanente
+        settled = SteadyStateEvent(self.motor.synchronous_speed(), tolerance=0.01, hold_time=0.1)
+        results = self.simulate_transient_response(t_span, initial_conditions,
+                                                   events=[settled])
 
         # Restaurar T_load
         self.motor.T_load = original_T_load
@@ -309,23 +1326,16 @@ class SimulationEngine:
         t_span = (0, t_final)
         initial_conditions = {'omega_m': self.motor.synchronous_speed(), 'delta': 0.1}
 
-        # Crear perfil de carga que aumenta gradualmente
-        t_eval = np.linspace(0, t_final, 1000)
-        T_load_profile = np.zeros_like(t_eval)
-
-        for i in range(load_steps):
-            t_start = i * t_final / load_steps
-            t_end = (i + 1) * t_final / load_steps
-            mask = (t_eval >= t_start) & (t_eval <= t_end)
-            T_load_profile[mask] = (i + 1) * self.motor.T_load / load_steps
+        # Perfil de carga que aumenta gradualmente, integrado como entrada T_L(t)
+        levels = [(i + 1) * self.motor.T_load / load_steps for i in range(load_steps)]
+        T_load_profile = PiecewiseProfile.steps(levels, t_final / load_steps)
 
-        # Esta es una simplificación - en un modelo más completo
-        # necesitaríamos simular con carga variable
-        results = self.simulate_transient_response(t_span, initial_conditions)
+        results = self.simulate_transient_response(t_span, initial_conditions,
+                                                   inputs={'T_load': T_load_profile})
 
         results['scenario'] = 'load_increase'
         results['description'] = f'Aumento gradual de carga en {load_steps} pasos'
-        results['T_load_profile'] = T_load_profile
+        results['T_load_profile'] = results['T_load']
 
         return results
 
@@ -336,16 +1346,15 @@ class SimulationEngine:
         t_span = (0, t_final)
         initial_conditions = {'omega_m': self.motor.synchronous_speed(), 'delta': 0.2}
 
-        # Perfil de excitación que cambia linealmente
-        t_eval = np.linspace(0, t_final, 1000)
-        If_profile = If_initial + (If_final - If_initial) * t_eval / t_final
+        # Perfil de excitación que cambia linealmente, integrado como entrada If(t)
+        If_profile = PiecewiseProfile([0.0, t_final], [If_initial, If_final], kind='linear')
 
-        # Simulación básica (simplificada)
-        results = self.simulate_transient_response(t_span, initial_conditions)
+        results = self.simulate_transient_response(t_span, initial_conditions,
+                                                   inputs={'If': If_profile})
 
         results['scenario'] = 'excitation_change'
         results['description'] = f'Cambio de excitación: {If_initial}A → {If_final}A'
-        results['If_profile'] = If_profile
+        results['If_profile'] = results['If']
 
         return results
 
@@ -359,7 +1368,9 @@ class SimulationEngine:
         original_T_load = self.motor.T_load
         self.motor.T_load = original_T_load * overload_factor
 
-        results = self.simulate_transient_response(t_span, initial_conditions)
+        # La simulación termina si el motor pierde el sincronismo
+        results = self.simulate_transient_response(t_span, initial_conditions,
+                                                   events=[pole_slip_event()])
 
         # Restaurar carga original
         self.motor.T_load = original_T_load
@@ -0,0 +1,173 @@
+"""
+Tiempo de arranque: costo de importar los módulos del simulador
+
+El modelo y el motor de simulación cargan sólo NumPy al importarse; scipy,
+matplotlib y PyQt6 se importan en el primer uso (integradores, gráficos,
+interfaz); main (la línea de comandos) no importa ni NumPy. Este módulo lo
+mide con `python -X importtime` en un intérprete nuevo por corrida, de modo
+que cachés de importación del proceso actual no afectan el resultado, y
+compara contra dos límites:
+- Relativo: el costo de importar NumPy, medido en las mismas condiciones, más
+  un margen proporcional a ese costo. Vale en cualquier máquina y con carga,
+  porque la carga encarece a ambos en la misma proporción.
+- Absoluto: un presupuesto en ms por módulo, para una máquina sin carga.
+
+Ejecutar `python startup.py` para el reporte.
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Any
+
+
+# Presupuesto de importación en frío por módulo (ms). NumPy sola ronda
+# 100-150 ms; scipy.integrate o matplotlib.pyplot agregan 400-600 ms cada uno,
+# así que importarlos en el nivel de módulo excede el presupuesto.
+IMPORT_BUDGETS_MS = {
+    'main': 100.0,
+    'motor_model': 300.0,
+    'simulation_engine': 400.0,
+    'scenarios': 400.0,
+    'dq_model': 300.0,
+    'plots': 400.0,
+    'phasor_diagram': 300.0,
+}
+
+# Costo admitido por encima de importar NumPy, en múltiplos de ese costo. Los
+# módulos propios cuestan hoy menos de 2 veces NumPy (con o sin carga), e
+# importar scipy.integrate o matplotlib.pyplot en el nivel de módulo agregaría
+# de 4 a 6 veces el costo de NumPy
+CORE_IMPORT_MARGIN = 2.0
+
+# Dependencias pesadas que sólo deben importarse en el primer uso
+DEFERRED_MODULES = ('scipy', 'matplotlib', 'PyQt6')
+
+# Módulos que no deben importar NumPy (arranque de la línea de comandos)
+NUMPY_FREE_MODULES = ('main',)
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """Filas de -X importtime: {'module', 'self_ms', 'cumulative_ms', 'depth'}"""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # encabezado
+        name = fields[2].rstrip()
+        rows.append({
+            'module': name.strip(),
+            'self_ms': int(fields[0]) / 1000.0,
+            'cumulative_ms': int(fields[1]) / 1000.0,
+            'depth': (len(name) - len(name.lstrip())) // 2
+        })
+    return rows
+
+
+def measure_import(module: str, repeats: int = 3, slowest: int = 5) -> Dict[str, Any]:
+    """
+    Mide el costo de importar module en un intérprete nuevo
+
+    Args:
+        module: nombre del módulo (importable desde el directorio del simulador)
+        repeats: corridas independientes; se reporta la más rápida (la menos
+            afectada por otros procesos)
+        slowest: cantidad de importaciones más costosas (tiempo propio) a listar
+
+    Returns:
+        {'module', 'cumulative_ms', 'runs_ms', 'deferred_loaded': dependencias
+         pesadas presentes en sys.modules tras importar, 'numpy_loaded': bool,
+         'slowest': [(módulo, ms)]}
+    """
+    watched = set(DEFERRED_MODULES) | {'numpy'}
+    code = (f"import {module}, sys; "
+            f"print(' '.join(sorted({{name.split('.')[0] for name in sys.modules}}"
+            f" & {watched!r})))")
+    runs, best_rows, loaded = [], None, []
+    for _ in range(max(1, repeats)):
+        done = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                              cwd=_HERE, capture_output=True, text=True, timeout=120)
+        if done.returncode != 0:
+            raise RuntimeError(f"No se pudo importar {module}: {done.stderr.strip()}")
+
+        rows = _parse_importtime(done.stderr)
+        target = [row for row in rows if row['module'] == module and row['depth'] == 0]
+        cumulative = target[-1]['cumulative_ms']
+        if not runs or cumulative < min(runs):
+            best_rows = rows
+        runs.append(cumulative)
+        loaded = done.stdout.split()
+
+    ranking = sorted(best_rows, key=lambda row: row['self_ms'], reverse=True)[:slowest]
+    return {
+        'module': module,
+        'cumulative_ms': min(runs),
+        'runs_ms': runs,
+        'deferred_loaded': [name for name in loaded if name in DEFERRED_MODULES],
+        'numpy_loaded': 'numpy' in loaded,
+        'slowest': [(row['module'], row['self_ms']) for row in ranking]
+    }
+
+
+def benchmark(budgets: Optional[Dict[str, float]] = None, repeats: int = 3,
+              margin: float = CORE_IMPORT_MARGIN) -> Dict[str, Any]:
+    """
+    Mide cada módulo con presupuesto, junto con NumPy como referencia
+
+    Returns:
+        {'numpy_ms', 'modules': {nombre: medición + 'budget_ms', 'limit_ms',
+         'imports_ok', 'within_limit', 'within_budget'},
+         'imports_ok', 'within_limit', 'within_budget': bool}
+
+        - imports_ok: no se importó ninguna dependencia de DEFERRED_MODULES
+          (ni NumPy en NUMPY_FREE_MODULES)
+        - within_limit: imports_ok y costo <= limit_ms = numpy_ms · (1 + margin)
+        - within_budget: imports_ok y costo <= budget_ms (presupuesto absoluto)
+    """
+    budgets = IMPORT_BUDGETS_MS if budgets is None else budgets
+    numpy_ms = measure_import('numpy', repeats)['cumulative_ms']
+    limit_ms = numpy_ms * (1.0 + margin)
+    modules = {}
+    for module, budget in budgets.items():
+        measurement = measure_import(module, repeats)
+        cumulative = measurement['cumulative_ms']
+        imports_ok = not measurement['deferred_loaded'] and not (
+            module in NUMPY_FREE_MODULES and measurement['numpy_loaded'])
+        measurement.update({
+            'budget_ms': budget,
+            'limit_ms': limit_ms,
+            'imports_ok': imports_ok,
+            'within_limit': imports_ok and cumulative <= limit_ms,
+            'within_budget': imports_ok and cumulative <= budget
+        })
+        modules[module] = measurement
+    return {
+        'numpy_ms': numpy_ms,
+        'modules': modules,
+        **{key: all(m[key] for m in modules.values())
+           for key in ('imports_ok', 'within_limit', 'within_budget')}
+    }
+
+
+if __name__ == '__main__':
+    report = benchmark()
+    print(f"NumPy: {report['numpy_ms']:.1f} ms "
+          f"(límite relativo: NumPy + {CORE_IMPORT_MARGIN:.0%} de NumPy)")
+    print(f"{'módulo':20s} {'import (ms)':>12s} {'límite':>12s} {'presupuesto':>12s}  "
+          f"importaciones indebidas")
+    for name, measurement in report['modules'].items():
+        mark = '✓' if measurement['within_budget'] else '✗'
+        loaded = list(measurement['deferred_loaded'])
+        if name in NUMPY_FREE_MODULES and measurement['numpy_loaded']:
+            loaded.append('numpy')
+        print(f"{mark} {name:18s} {measurement['cumulative_ms']:12.1f} "
+              f"{measurement['limit_ms']:12.1f} {measurement['budget_ms']:12.1f}  "
+              f"{', '.join(loaded) or '-'}")
+        if not measurement['within_budget']:
+            for module, self_ms in measurement['slowest']:
+                print(f"      {module:40s} {self_ms:8.1f} ms")
+    sys.exit(0 if report['within_budget'] else 1)
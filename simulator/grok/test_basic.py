@@ -70,6 +70,149 @@ def test_motor_model():
         return False
 
 
+def test_motor_parameters():
+    """Prueba el registro inmutable de parámetros del motor"""
+    print("\nProbando registro de parámetros...")
+
+    try:
+        import pickle
+        from motor_model import SynchronousMotorModel, MotorParameters
+        from simulation_engine import SimulationEngine
+
+        params = MotorParameters(If=3.0)
+        assert hash(params) == hash(MotorParameters(If=3.0))
+        assert not hasattr(params, '__dict__')
+        try:
+            params.If = 1.0
+            raise AssertionError("MotorParameters debe ser inmutable")
+        except AttributeError:
+            pass
+        assert pickle.loads(pickle.dumps(params)) == params
+        print("✓ Registro inmutable, hashable y serializable")
+
+        # El modelo expone sus atributos como vistas del registro
+        motor = SynchronousMotorModel(params)
+        assert motor.If == 3.0 and motor.parameters is params
+        motor.T_load = 15.0
+        assert motor.parameters == params._replace(T_load=15.0)
+        assert params.T_load == 10.0
+        assert motor.get_mechanical_parameters()['T_load'] == 15.0
+        print("✓ Atributos del modelo respaldados por el registro")
+
+        # El motor de simulación acepta el registro directamente
+        engine = SimulationEngine(params)
+        assert engine.motor.parameters is params
+        print("✓ SimulationEngine construido desde MotorParameters")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en registro de parámetros: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_result_cache():
+    """Prueba la caché LRU de resultados del motor"""
+    print("\nProbando caché de resultados...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+
+        motor = SynchronousMotorModel(cache_size=4)
+        first = motor.steady_state_analysis()
+        first['P'] = None  # el llamador no puede alterar la entrada cacheada
+        second = motor.steady_state_analysis()
+        assert second['P'] is not None
+        assert motor.cache.info()['hits'] == 1 and motor.cache.info()['misses'] == 1
+        print("✓ Resultados repetidos servidos desde la caché")
+
+        # Un cambio relevante invalida las entradas dependientes
+        deltas, torques = motor.torque_angle_curve()
+        assert not torques.flags.writeable
+        SimulationEngine(motor).stability_analysis()
+        assert motor.cache.info()['size'] == 3
+        motor.update_parameters(J=0.2)  # J no afecta a estos cálculos
+        assert motor.cache.info()['size'] == 3
+        motor.update_parameters(T_load=20.0)  # solo afecta al régimen permanente
+        assert motor.cache.info()['size'] == 2
+        motor.update_parameters(If=3.0)
+        assert motor.cache.info()['size'] == 0
+        assert motor.steady_state_analysis()['If'] == 3.0
+        motor.update_parameters(If=3.0)  # mismo valor: no invalida
+        assert motor.cache.info()['size'] == 1
+        try:
+            motor.update_parameters(T_load=0.0, If=np.array([1.0, 2.0]))
+            raise AssertionError("Se aceptó un array como parámetro")
+        except ValueError as e:
+            assert 'If' in str(e)
+        assert motor.T_load == 20.0 and motor.cache.info()['size'] == 1
+        print("✓ Invalidación explícita al actualizar parámetros")
+
+        # Tamaño acotado con desalojo LRU
+        for If in np.linspace(1.0, 2.0, 10):
+            motor.If = If
+            motor.steady_state_analysis()
+        assert motor.cache.info()['size'] == 4
+        print("✓ Tamaño máximo respetado")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en caché de resultados: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_steady_state_batch():
+    """Prueba el análisis en régimen permanente vectorizado"""
+    print("\nProbando análisis en régimen permanente por lotes...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+
+        motor = SynchronousMotorModel()
+        If_values = np.linspace(0.5, 4.0, 7)
+        V_values = np.array([380.0, 400.0, 420.0])[:, None]
+
+        batch = motor.steady_state_analysis_batch(V_line=V_values, If=If_values)
+        assert batch['P'].shape == (3, 7)
+
+        # Cada punto del lote debe coincidir con el análisis escalar
+        for i, V_line in enumerate(V_values[:, 0]):
+            for j, If in enumerate(If_values):
+                motor.V_line, motor.If = V_line, If
+                scalar = motor.steady_state_analysis()
+                for key in ('I_magnitude', 'T_e', 'P', 'Q', 'pf'):
+                    assert np.isclose(batch[key][i, j], scalar[key]), key
+                assert batch['pf_type'][i, j] == scalar['pf_type']
+
+        print(f"✓ Lote de {batch['P'].size} puntos coincide con el análisis escalar")
+
+        # parameter_sweep usa el lote; cada fila coincide con la ruta escalar
+        from simulation_engine import SimulationEngine
+        engine = SimulationEngine(SynchronousMotorModel())
+        for parameter, value_range in (('If', (0.2, 4.0)), ('T_load', (0.0, 600.0))):
+            sweep = engine.parameter_sweep(parameter, value_range, 25, Rs=0.8)
+            for row in sweep:
+                scalar = engine.solve_steady_state(Rs=0.8, **{parameter: row[f'parameter_{parameter}']})
+                assert set(row) == set(scalar) | {f'parameter_{parameter}'}
+                for key, value in scalar.items():
+                    if isinstance(value, (str, bool)):
+                        assert row[key] == value, key
+                    else:
+                        assert np.isclose(row[key], value, equal_nan=True), key
+        assert not all(row['has_equilibrium'] for row in sweep)  # T_load > T_max incluido
+        assert engine.motor.Rs == SynchronousMotorModel().Rs
+        print("✓ Barrido por lotes coincide con la resolución punto por punto")
+        return True
+    except Exception as e:
+        print(f"✗ Error en análisis por lotes: {e}")
+        traceback.print_exc()
+        return False
+
+
 def test_simulation_engine():
     """Prueba básica del motor de simulación"""
     print("\nProbando motor de simulación...")
@@ -94,6 +237,1332 @@ def test_simulation_engine():
         return False
 
 
+def test_salient_pole():
+    """Prueba el par de dos reacciones y el par máximo en forma cerrada"""
+    print("\nProbando modelo de polos salientes...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel, MotorParameters, two_axis_current
+
+        motor = SynchronousMotorModel()
+        V = motor.V_line / np.sqrt(3)
+        E = abs(motor.calculate_internal_voltage())
+        omega_s = motor.synchronous_speed()
+
+        # Par de excitación más par de reluctancia
+        delta = np.linspace(-np.pi, np.pi, 101)
+        expected = 3 / omega_s * (V * E / motor.Xd * np.sin(delta)
+                                  + V**2 * (1 / motor.Xq - 1 / motor.Xd) / 2 * np.sin(2 * delta))
+        assert np.allclose(motor.calculate_torque_from_angle(delta), expected)
+        print("✓ T_e = (3/ω_s)[VE/Xd sinδ + V²(1/Xq - 1/Xd)/2 sin2δ]")
+
+        # Par máximo exacto frente a una malla densa
+        T_max, delta_max = motor.maximum_torque()
+        grid = np.linspace(0, np.pi, 2_000_001)
+        torque = motor.calculate_torque_from_angle(grid)
+        assert np.isclose(T_max, torque.max(), rtol=1e-12)
+        assert abs(delta_max - grid[np.argmax(torque)]) < 1e-5
+        assert np.pi / 4 < delta_max < np.pi / 2
+        print(f"✓ Par máximo {T_max:.3f} N·m en δ = {np.degrees(delta_max):.4f}°")
+
+        # Vectorizado sobre puntos de operación
+        T_batch, delta_batch = motor.pull_out_torque(V_line=[400.0, 200.0], If=[2.0, 0.0])
+        assert np.isclose(T_batch[0], T_max) and np.isclose(delta_batch[1], np.pi / 4)
+
+        # Con Xd = Xq se recupera el modelo de rotor cilíndrico
+        round_rotor = SynchronousMotorModel(MotorParameters(Xd=4.0, Xq=4.0))
+        T_max, delta_max = round_rotor.maximum_torque()
+        assert np.isclose(delta_max, np.pi / 2)
+        assert np.isclose(T_max, 3 * V * E / (omega_s * 4.0))
+        V_phasor, E_phasor = complex(V, 0), E * np.exp(-0.4j)
+        assert np.isclose(round_rotor.calculate_current_phasor(V_phasor, E_phasor),
+                          (V_phasor - E_phasor) / (round_rotor.Rs + 4.0j))
+        print("✓ Xd = Xq equivale al rotor cilíndrico")
+
+        # La corriente satisface V = E + Rs I + j Xd Id + j Xq Iq
+        E_phasor = E * np.exp(-1j * delta)
+        I_phasor = two_axis_current(V, E_phasor, motor.Rs, motor.Xd, motor.Xq)
+        aligned = I_phasor / np.exp(1j * np.angle(E_phasor))
+        I_q = aligned.real * np.exp(1j * np.angle(E_phasor))
+        I_d = 1j * aligned.imag * np.exp(1j * np.angle(E_phasor))
+        assert np.allclose(E_phasor + motor.Rs * I_phasor + 1j * (motor.Xd * I_d + motor.Xq * I_q), V)
+
+        # Sin pérdidas la potencia activa es ω_s T_e
+        lossless = SynchronousMotorModel(MotorParameters(Rs=0.0))
+        I_phasor = two_axis_current(V, E_phasor, 0.0, lossless.Xd, lossless.Xq)
+        P = 3 * np.real(V * np.conj(I_phasor))
+        assert np.allclose(P, omega_s * lossless.calculate_torque_from_angle(delta))
+        print("✓ Corriente de dos reacciones consistente con el par")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en modelo de polos salientes: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_steady_state_solver():
+    """Prueba el solver analítico de estado estacionario frente a fsolve"""
+    print("\nProbando solver analítico de estado estacionario...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel, solve_load_angle
+        from simulation_engine import SimulationEngine
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+
+        for T_load in (0.0, 10.0, 150.0, 350.0):
+            analytic = engine.solve_steady_state(T_load=T_load)
+            numeric = engine.solve_steady_state(method='fsolve', T_load=T_load)
+            assert np.isclose(analytic['delta_equilibrium'], numeric['delta_equilibrium'])
+        print("✓ Solución analítica coincide con fsolve")
+
+        # Sin equilibrio: T_L > T_max se reporta explícitamente
+        overloaded = engine.solve_steady_state(T_load=1e4)
+        assert not overloaded['has_equilibrium']
+        assert np.isnan(overloaded['delta_equilibrium'])
+        print("✓ Sobrecarga sin equilibrio reportada")
+
+        # Forma de polos salientes (Newton protegido) y barrido vectorizado
+        delta, ok = solve_load_angle(100.0, 20.0, np.linspace(-110, 110, 41))
+        assert np.allclose(100 * np.sin(delta[ok]) + 20 * np.sin(2 * delta[ok]),
+                           np.linspace(-110, 110, 41)[ok])
+        batch = engine.solve_steady_state_batch(T_load=np.linspace(0, 500, 1000))
+        assert np.all(batch['has_equilibrium'] == (batch['T_load'] <= batch['T_max']))
+        print("✓ Barrido vectorizado de carga resuelto")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en solver de estado estacionario: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_transient_quantities():
+    """Prueba el cálculo vectorizado de variables derivadas del transitorio"""
+    print("\nProbando variables derivadas de la simulación transitoria...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+        state_before = (motor.delta, motor.omega_m, motor.time)
+
+        results = engine.simulate_transient_response(
+            (0, 0.5), {'omega_m': motor.synchronous_speed(), 'delta': 0.3})
+        assert (motor.delta, motor.omega_m, motor.time) == state_before
+        print("✓ El estado del modelo no se modifica")
+
+        # T_e coincide con la evaluación punto a punto
+        T_e_ref = [motor.calculate_torque_from_angle(d) for d in results['delta'][::50]]
+        assert np.allclose(results['T_e'][::50], T_e_ref)
+
+        # Q y pf provienen del cálculo fasorial: S² = P² + Q²
+        S = np.hypot(results['P'], results['Q'])
+        assert np.allclose(results['pf'], np.abs(results['P']) / S)
+        assert np.any(results['Q'] != 0)
+        print("✓ T_e, P, Q y pf calculados sobre toda la trayectoria")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en variables derivadas: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_compiled_dynamics():
+    """Prueba el lado derecho compilado del modelo dinámico"""
+    print("\nProbando lado derecho compilado...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+
+        motor = SynchronousMotorModel()
+        rhs = motor.compile_dynamics()
+        out = np.empty(2)
+
+        for state in ([0.0, 0.0], [78.5, 0.3], [70.0, -1.2]):
+            state = np.array(state)
+            reference = motor.dynamic_model_derivatives(state, 0.0)
+            assert np.allclose(rhs(0.0, state), reference)
+            assert np.allclose(rhs.odeint(state, 0.0), reference)
+            assert rhs.into(0.0, state, out) is out and np.allclose(out, reference)
+        print("✓ Derivadas compiladas coinciden con las de referencia")
+
+        engine = SimulationEngine(motor)
+        initial = {'omega_m': motor.synchronous_speed(), 'delta': 0.3}
+        fast = engine.simulate_transient_response((0, 0.5), initial)
+        slow = engine.simulate_transient_response((0, 0.5), initial, compiled=False)
+        assert np.allclose(fast['delta'], slow['delta'])
+        print("✓ Simulación compilada coincide con la de referencia")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en lado derecho compilado: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_time_varying_load():
+    """Prueba perfiles de entrada y simulación con carga variable"""
+    print("\nProbando carga variable en el tiempo...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+        from scenarios import SimulationScenarios
+        from profiles import PiecewiseProfile
+
+        profile = PiecewiseProfile.steps([0.0, 5.0, 10.0], 1.0)
+        assert profile(0.5) == 0.0 and profile(1.0) == 5.0 and profile(7.0) == 10.0
+        assert np.array_equal(profile.evaluate([0.5, 1.0, 7.0]), [0.0, 5.0, 10.0])
+        assert profile.breakpoints((0.0, 3.0)) == [1.0, 2.0]
+        ramp = PiecewiseProfile([0.0, 2.0], [1.0, 3.0], kind='linear')
+        assert ramp(1.0) == 2.0 and np.isclose(ramp.evaluate(1.5), 2.5)
+        print("✓ Perfiles escalonado y lineal")
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+        initial = {'omega_m': motor.synchronous_speed(), 'delta': 0.1}
+
+        # Un perfil constante reproduce la simulación con carga fija
+        constant = PiecewiseProfile([0.0], [motor.T_load])
+        fixed = engine.simulate_transient_response((0, 0.5), initial)
+        varying = engine.simulate_transient_response((0, 0.5), initial,
+                                                     inputs={'T_load': constant})
+        assert np.allclose(fixed['delta'], varying['delta'])
+
+        # Dentro de un tramo la entrada se evalúa con su límite por izquierda
+        steps = PiecewiseProfile([0.0, 0.3, 0.6], [10.0, 200.0, 50.0])
+        dynamics = motor.compile_dynamics({'T_load': steps})
+        dynamics.hold_inputs_before(0.3)
+        dynamics(0.3, np.array([initial['omega_m'], 0.1]))
+        assert dynamics.T_load == 10.0
+
+        # Referencia: integración encadenada con carga constante por tramo
+        engine.disk_cache = None
+        stepped = engine.simulate_transient_response((0, 1.0), initial,
+                                                     inputs={'T_load': steps})
+        state = initial
+        for t_start, t_end, T_load in ((0.0, 0.3, 10.0), (0.3, 0.6, 200.0), (0.6, 1.0, 50.0)):
+            segment = engine.simulate_transient_response((t_start, t_end), state,
+                                                         inputs={'T_load': T_load})
+            state = {'omega_m': segment['omega_m'][-1], 'delta': segment['delta'][-1]}
+        assert abs(stepped['omega_m'][-1] - state['omega_m']) < 2e-7
+        assert abs(stepped['delta'][-1] - state['delta']) < 1e-8
+        print("✓ Escalones exactos respecto de la referencia constante por tramos")
+
+        scenarios = SimulationScenarios(motor)
+        results = scenarios.scenario_load_increase_gradual(t_final=2.0, load_steps=2)
+        assert np.all(np.diff(results['time']) > 0)
+        assert len(results['time']) == 3000
+        assert np.allclose(np.unique(results['T_load']), [0.0, 6.0, 12.0])
+        assert results['load_steps'] == [0.0, 0.6, 1.2]
+        assert motor.T_load == 10.0
+        print("✓ Escenario de carga creciente en una sola integración")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en carga variable: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_time_varying_excitation():
+    """Prueba la excitación If(t) como entrada del modelo dinámico"""
+    print("\nProbando excitación variable en el tiempo...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+        from scenarios import SimulationScenarios
+        from profiles import PiecewiseProfile
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+        initial = {'omega_m': motor.synchronous_speed(), 'delta': 0.2}
+
+        # Un perfil constante equivale a cambiar el parámetro If
+        varying = engine.simulate_transient_response(
+            (0, 0.5), initial, inputs={'If': PiecewiseProfile([0.0], [3.0])})
+        motor.update_parameters(If=3.0)
+        fixed = engine.simulate_transient_response((0, 0.5), initial)
+        motor.update_parameters(If=2.0)
+        assert np.allclose(fixed['delta'], varying['delta'])
+        assert np.allclose(fixed['Q'], varying['Q'])
+        print("✓ Perfil de excitación constante equivale al parámetro fijo")
+
+        results = SimulationScenarios(motor).scenario_excitation_sub_to_over(t_final=1.0)
+        reference = motor.trajectory_quantities(results['delta'], If=results['If_profile'])
+        assert len(results['pf_profile']) == len(results['time'])
+        assert np.allclose(results['Q_profile'], reference['Q'])
+        assert results['Q_profile'][0] * results['Q_profile'][-1] < 0
+        assert motor.If == 2.0
+        print("✓ pf, P y Q calculados sobre la trayectoria con If(t)")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en excitación variable: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_frequency_variation():
+    """Prueba la frecuencia de red variable con perfil interpolado"""
+    print("\nProbando variación de frecuencia...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+        from scenarios import SimulationScenarios
+        from profiles import InterpolatedProfile
+
+        times = np.linspace(0, 2.0, 20001)
+        for kind, tolerance in (('linear', 1e-7), ('cubic', 1e-12)):
+            profile = InterpolatedProfile(times, np.sin(times), kind=kind)
+            samples = np.random.default_rng(0).uniform(0, 2.0, 200)
+            scalar = np.array([profile(t) for t in np.sort(samples)])
+            assert np.allclose(scalar, profile.evaluate(np.sort(samples)), rtol=0, atol=1e-14)
+            assert np.allclose(scalar, np.sin(np.sort(samples)), rtol=0, atol=tolerance)
+        assert profile(-1.0) == profile.values[0] and profile(5.0) == profile.values[-1]
+        print("✓ Interpolación lineal y cúbica con índice en caché")
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+
+        # Un perfil de 60 Hz constante equivale al parámetro f = 60
+        initial = {'omega_m': 2 * np.pi * 60 / motor.p, 'delta': 0.1}
+        constant = InterpolatedProfile([0.0, 1.0], [60.0, 60.0])
+        varying = engine.simulate_transient_response((0, 0.5), initial, inputs={'f': constant})
+        with engine._temporary_parameters(f=60.0):
+            fixed = engine.simulate_transient_response((0, 0.5), initial)
+        assert np.allclose(fixed['delta'], varying['delta'])
+        assert np.allclose(fixed['T_e'], varying['T_e'])
+        print("✓ Perfil de frecuencia constante equivale al parámetro fijo")
+
+        results = SimulationScenarios(motor).scenario_frequency_variation(
+            t_final=2.0, sample_rate=1000.0)
+        assert results['frequency_profile'].min() < 48.1 and results['frequency_profile'].max() > 51.9
+        T_max_ratio = results['T_max_profile'] * results['frequency_profile']
+        assert np.allclose(T_max_ratio, T_max_ratio[0])
+        assert results['event'] is None and motor.f == 50.0
+        print("✓ Escenario de variación de frecuencia")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en variación de frecuencia: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_voltage_sag():
+    """Prueba el escenario de caída de tensión con reinicios en las discontinuidades"""
+    print("\nProbando caída de tensión...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+        from scenarios import SimulationScenarios
+        from profiles import PiecewiseProfile
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+        initial = {'omega_m': motor.synchronous_speed(), 'delta': 0.1}
+
+        # Un perfil de tensión constante equivale al parámetro V_line
+        varying = engine.simulate_transient_response(
+            (0, 0.5), initial, inputs={'V_line': PiecewiseProfile([0.0], [320.0])})
+        with engine._temporary_parameters(V_line=320.0):
+            fixed = engine.simulate_transient_response((0, 0.5), initial)
+        assert np.allclose(fixed['delta'], varying['delta'])
+        assert np.allclose(fixed['P'], varying['P'])
+        print("✓ Perfil de tensión constante equivale al parámetro fijo")
+
+        scenarios = SimulationScenarios(motor)
+        results = scenarios.scenario_voltage_sag(t_final=2.0, sag_start=0.5, sag_duration=0.5)
+        time_axis = results['time']
+        during = (time_axis >= 0.5) & (time_axis < 1.0)
+        assert np.all(results['V_profile'][during] == 0.8)
+        assert np.all(results['V_profile'][~during] == 1.0)
+        assert np.ptp(results['delta'][time_axis < 0.5]) < 1e-8  # régimen permanente previo
+        assert np.ptp(results['delta'][during]) > 1e-3
+        assert results['stable'] and motor.V_line == 400.0
+        print("✓ Caída de tensión única")
+
+        sags = [(0.1 + 0.05 * k, 0.02, 0.5) for k in range(20)]
+        results = scenarios.scenario_voltage_sag(t_final=1.5, sags=sags)
+        assert np.count_nonzero(np.diff(results['V_profile']) < 0) == 20
+        assert results['stable']
+
+        # Equivale a encadenar simulaciones con tensión fija entre discontinuidades
+        edges = [0.0] + [t for start, duration, _ in sags[:3]
+                         for t in (start, start + duration)] + [0.3]
+        state = scenarios._synchronous_initial_conditions()
+        for k, (t_start, t_end) in enumerate(zip(edges[:-1], edges[1:])):
+            with engine._temporary_parameters(V_line=400.0 * (0.5 if k % 2 else 1.0)):
+                chained = engine.simulate_transient_response((t_start, t_end), state)
+            state = {'omega_m': chained['omega_m'][-1], 'delta': chained['delta'][-1]}
+        results = scenarios.scenario_voltage_sag(t_final=0.3, sags=sags[:3])
+        assert np.isclose(results['delta'][-1], state['delta'], rtol=0, atol=1e-8)
+        assert np.isclose(results['omega_m'][-1], state['omega_m'], rtol=0, atol=1e-7)
+        print("✓ Registro de múltiples caídas en una sola simulación")
+
+        # En cada flanco, la tensión del tramo es la previa al flanco
+        V_profile = PiecewiseProfile(edges[:-1], [400.0, 200.0] * 3 + [400.0])
+        dynamics = motor.compile_dynamics({'V_line': V_profile})
+        for t_start, t_end in zip(edges[:-1], edges[1:]):
+            dynamics.hold_inputs_before(t_end)
+            dynamics.update_inputs(t_end)
+            inside = motor.compile_dynamics({'V_line': V_profile(t_start)})
+            assert np.isclose(dynamics.T1, inside.T1, rtol=1e-12, atol=0)
+            assert np.isclose(dynamics.T2, inside.T2, rtol=1e-12, atol=0)
+        print("✓ Flancos de la caída aplicados exactamente en sus instantes")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en caída de tensión: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_streaming_transient():
+    """Prueba la salida por bloques de simulaciones transitorias"""
+    print("\nProbando salida por bloques...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine, pole_slip_event
+        from profiles import PiecewiseProfile
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+        initial = {'omega_m': motor.synchronous_speed(), 'delta': 0.3}
+
+        chunks = list(engine.iter_transient_response(
+            (0, 2.0), initial, sample_interval=1e-3, chunk_size=300))
+        assert [len(chunk['time']) for chunk in chunks] == [300] * 6 + [201]
+        assert chunks[-1]['event'] is None
+        streamed = {name: np.concatenate([chunk[name] for chunk in chunks])
+                    for name in ('time', 'delta', 'T_e', 'pf')}
+
+        reference = engine.simulate_transient_response((0, 2.0), initial, num_points=2001)
+        for name, column in streamed.items():
+            assert np.allclose(column, reference[name], rtol=0, atol=1e-9)
+        print("✓ Bloques coinciden con la simulación completa")
+
+        # Entradas con discontinuidades y eventos terminales
+        load = PiecewiseProfile([0.0, 0.5], [10.0, 400.0])
+        chunks = list(engine.iter_transient_response(
+            (0, 2.0), initial, chunk_size=1000, inputs={'T_load': load},
+            events=[pole_slip_event()]))
+        reference = engine.simulate_transient_response(
+            (0, 2.0), initial, inputs={'T_load': load}, events=[pole_slip_event()])
+        assert chunks[-1]['event'] == 'pole_slip'
+        assert np.isclose(chunks[-1]['event_time'], reference['event_time'], atol=1e-9)
+        assert chunks[-1]['time'][-1] <= chunks[-1]['event_time']
+        print(f"✓ Evento terminal en t = {chunks[-1]['event_time']:.4f} s")
+
+        # Eventos no terminales: mismos cruces en ambas interfaces
+        def quarter_turn(t, state):
+            return state[1] - np.pi / 2
+        quarter_turn.name = 'quarter_turn'
+        events = [quarter_turn, pole_slip_event()]
+        chunks = list(engine.iter_transient_response(
+            (0, 2.0), initial, chunk_size=1000, inputs={'T_load': load}, events=events))
+        reference = engine.simulate_transient_response(
+            (0, 2.0), initial, inputs={'T_load': load}, events=events)
+        streamed_times, reference_times = chunks[-1]['event_times'], reference['event_times']
+        assert len(reference_times['quarter_turn']) >= 1
+        for name in ('quarter_turn', 'pole_slip'):
+            assert len(streamed_times[name]) == len(reference_times[name]), name
+            assert np.allclose(streamed_times[name], reference_times[name], atol=1e-9)
+        assert streamed_times['pole_slip'] == [chunks[-1]['event_time']]
+        print("✓ Cruces de eventos no terminales reportados")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en salida por bloques: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_result_store():
+    """Prueba el almacenamiento columnar mapeado en memoria"""
+    print("\nProbando almacenamiento de resultados...")
+
+    try:
+        import tempfile
+        import numpy as np
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+        from scenarios import SimulationScenarios
+        from plots import MotorPlots
+        from result_store import SimulationResult, ResultWriter
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+        scenario = SimulationScenarios(motor).scenario_load_increase_gradual(t_final=1.0,
+                                                                              load_steps=2)
+        result = SimulationResult.from_results(scenario, motor.parameters)
+        assert result.n_samples == len(scenario['time'])
+        assert result['load_steps'] == scenario['load_steps'] and 'pf' in result.columns
+
+        with tempfile.TemporaryDirectory() as directory:
+            result.save(f'{directory}/carga')
+            loaded = SimulationResult.load(f'{directory}/carga')
+            assert isinstance(loaded['delta'], np.memmap)
+            for name, column in result.columns.items():
+                assert np.array_equal(loaded[name], column)
+            assert loaded['motor_parameters']['T_load'] == motor.T_load
+            assert loaded['parameters'] == scenario['parameters']
+            window = loaded.time_window(0.5, 1.0)
+            assert window['time'][0] >= 0.5 and window['time'][-1] <= 1.0
+            assert len(loaded.to_structured()) == result.n_samples
+            print("✓ Guardado y carga mapeada en memoria")
+
+            # Reescritura interrumpida: el resultado anterior deja de poder cargarse
+            try:
+                with ResultWriter(f'{directory}/carga') as writer:
+                    writer.append(result.slice(0, 10).columns)
+                    raise KeyboardInterrupt
+            except KeyboardInterrupt:
+                pass
+            try:
+                SimulationResult.load(f'{directory}/carga')
+                raise AssertionError("Se cargó un resultado incompleto")
+            except FileNotFoundError:
+                pass
+
+            # Metadatos no serializables: error, no texto
+            try:
+                SimulationResult(result.slice(0, 10).columns, {'motor': motor}).save(
+                    f'{directory}/objeto')
+                raise AssertionError("Se guardó un metadato no serializable")
+            except TypeError:
+                pass
+            print("✓ Escritura incompleta o no serializable no deja resultados cargables")
+
+            # Escritura incremental desde el flujo de bloques
+            initial = {'omega_m': motor.synchronous_speed(), 'delta': 0.3}
+            with ResultWriter(f'{directory}/flujo', {'scenario': 'flujo'}) as writer:
+                writer.extend(engine.iter_transient_response((0, 2.0), initial, chunk_size=500))
+            streamed = writer.result
+            assert streamed.n_samples == 2001 and streamed['event'] is None
+            reference = engine.simulate_transient_response((0, 2.0), initial, num_points=2001)
+            assert np.allclose(streamed['delta'], reference['delta'], rtol=0, atol=1e-9)
+            print("✓ Escritura incremental por bloques")
+
+            plots = MotorPlots(motor)
+            decimated = streamed.decimate(100)
+            assert decimated.n_samples <= 100 and decimated['time'][0] == 0.0
+            fig = plots.create_transient_plots(streamed, max_points=100)
+            assert len(fig.axes[0].lines[0].get_xdata()) == decimated.n_samples
+            plt.close(fig)
+            fig = plots.create_comparison_plot([streamed, reference], ['delta', 'pf'], ['a', 'b'])
+            plt.close(fig)
+            print("✓ Gráficos aceptan resultados columnares")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en almacenamiento de resultados: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_ensemble():
+    """Prueba la simulación vectorizada de un ensamble de motores"""
+    print("\nProbando simulación de ensamble...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+        initial = {'omega_m': motor.synchronous_speed(), 'delta': 0.3}
+        J_values = np.array([0.08, 0.1, 0.12])
+        T_load_values = np.array([5.0, 10.0, 50.0])
+
+        ensemble = engine.simulate_ensemble((0, 1.0), {'J': J_values, 'T_load': T_load_values},
+                                            initial, num_points=1000)
+        assert ensemble['delta'].shape == (3, 1000)
+        assert ensemble['pf'].shape == (3, 1000)
+
+        # Cada miembro coincide con una simulación individual
+        for i, (J, T_load) in enumerate(zip(J_values, T_load_values)):
+            motor.J, motor.T_load = J, T_load
+            single = engine.simulate_transient_response((0, 1.0), initial)
+            assert np.allclose(ensemble['delta'][i], single['delta'], atol=1e-5)
+        print(f"✓ Ensamble de {ensemble['n_members']} motores coincide con simulaciones individuales")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en simulación de ensamble: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_parallel_sweep():
+    """Prueba el barrido de parámetros en paralelo"""
+    print("\nProbando barrido de parámetros en paralelo...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+        serial = engine.parameter_sweep('If', (0.5, 4.0), num_points=12, T_load=20.0)
+        assert motor.T_load == 10.0 and motor.If == 2.0
+
+        for backend in ('process', 'thread'):
+            parallel = engine.parallel_parameter_sweep('If', (0.5, 4.0), num_points=12,
+                                                       max_workers=2, chunksize=5,
+                                                       backend=backend, T_load=20.0)
+            assert len(parallel) == len(serial)
+            for expected, result in zip(serial, parallel):
+                assert expected.keys() == result.keys()
+                assert np.isclose(expected['parameter_If'], result['parameter_If'])
+                assert np.isclose(expected['pf'], result['pf'])
+                assert np.isclose(expected['delta_equilibrium'], result['delta_equilibrium'])
+            print(f"✓ Backend '{backend}' coincide con el barrido serie")
+
+        # Una excepción a mitad del barrido no deja el motor modificado
+        try:
+            engine.parameter_sweep('connection', (0.0, 1.0), num_points=3, T_load=5.0)
+        except Exception:
+            pass
+        assert motor.connection == 'star' and motor.T_load == 10.0
+        print("✓ Parámetros restaurados tras una excepción")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en barrido paralelo: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_termination_events():
+    """Prueba los eventos terminales de deslizamiento de polo y régimen permanente"""
+    print("\nProbando eventos terminales...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine, SteadyStateEvent, pole_slip_event
+        from scenarios import SimulationScenarios
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+        omega_s = motor.synchronous_speed()
+
+        # Sobrecarga por encima del par máximo: pérdida de sincronismo
+        with engine._temporary_parameters(T_load=400.0):
+            results = engine.simulate_transient_response(
+                (0, 2.0), {'omega_m': omega_s, 'delta': 0.3}, events=[pole_slip_event()])
+        assert results['event'] == 'pole_slip' and results['event_time'] < 2.0
+        assert np.isclose(results['time'][-1], results['event_time'])
+        assert np.isclose(results['delta'][-1], np.pi)
+        print(f"✓ Deslizamiento de polo en t = {results['event_time']:.3f} s")
+
+        # Motor amortiguado cerca del equilibrio: se detiene al asentarse
+        with engine._temporary_parameters(B=3.0, T_load=0.0):
+            settled = SteadyStateEvent(omega_s, tolerance=1e-3, hold_time=0.2)
+            results = engine.simulate_transient_response(
+                (0, 10.0), {'omega_m': omega_s + 1.0, 'delta': 0.0}, events=[settled])
+        assert results['event'] == 'steady_state' and results['event_time'] < 10.0
+        tail = results['time'] > results['event_time'] - 0.2
+        assert np.all(np.abs(results['omega_m'][tail] - omega_s) < 1e-3)
+        print(f"✓ Régimen permanente en t = {results['event_time']:.3f} s")
+
+        # Sin eventos se integra todo el intervalo
+        results = engine.simulate_transient_response((0, 0.5), {'omega_m': omega_s})
+        assert results['event'] is None and results['time'][-1] == 0.5
+
+        combined = SimulationScenarios(motor).scenario_overload_test([1.5, 40.0], t_final=1.0)
+        assert not combined['stability_results'][1]
+        assert combined['pole_slip_times'][0] is None and combined['pole_slip_times'][1] < 1.0
+        print("✓ Prueba de sobrecarga termina al perder sincronismo")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en eventos terminales: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_small_signal():
+    """Prueba la linealización y el análisis de autovalores"""
+    print("\nProbando análisis de pequeña señal...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+
+        # Jacobiano analítico frente a diferencias finitas
+        state = np.array([70.0, 0.4])
+        jacobian = motor.dynamics_jacobian(state[1])
+        h = 1e-6
+        for column in range(2):
+            step = np.zeros(2)
+            step[column] = h
+            numeric = (motor.dynamic_model_derivatives(state + step, 0.0) -
+                       motor.dynamic_model_derivatives(state - step, 0.0)) / (2 * h)
+            assert np.allclose(jacobian[:, column], numeric, rtol=1e-6, atol=1e-6)
+        print("✓ Jacobiano analítico coincide con diferencias finitas")
+
+        If = np.linspace(0.2, 4.0, 5000)
+        T_load = np.linspace(600.0, 0.0, 5000)
+        results = engine.small_signal_analysis(If=If, T_load=T_load)
+        equilibrium = results['has_equilibrium']
+        assert not equilibrium.all() and equilibrium.any()
+        assert np.array_equal(results['stable'], equilibrium)
+        eigenvalues = np.sort_complex(np.linalg.eigvals(results['jacobian'][equilibrium]))
+        assert np.allclose(np.sort_complex(results['eigenvalues'][equilibrium]), eigenvalues)
+
+        stable = results['stable']
+        zeta = results['damping_ratio'][stable]
+        omega_n = results['natural_frequency'][stable]
+        assert np.allclose(zeta, motor.B / (2 * motor.J * omega_n))
+        print(f"✓ {len(If)} puntos de operación ({stable.sum()} estables)")
+
+        # Frecuencia de oscilación frente a una simulación con pequeña perturbación
+        point = engine.small_signal_analysis()
+        delta_0 = point['delta'][0]
+        transient = engine.simulate_transient_response(
+            (0, 1.0), {'omega_m': motor.synchronous_speed(), 'delta': delta_0 + 1e-4},
+            num_points=20001)
+        deviation = transient['delta'] - delta_0
+        crossings = transient['time'][1:][np.diff(np.sign(deviation)) != 0]
+        period = 2 * np.mean(np.diff(crossings))
+        assert np.isclose(2 * np.pi / period, point['damped_frequency'][0], rtol=1e-3)
+        print(f"✓ ω_d = {point['damped_frequency'][0]:.2f} rad/s coincide con la simulación")
+
+        # Equilibrio inestable (δ más allá del par máximo)
+        unstable = engine.small_signal_analysis(delta=np.pi - delta_0)
+        assert not unstable['stable'][0] and unstable['eigenvalues'][0].real.max() > 0
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en análisis de pequeña señal: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_equal_area():
+    """Prueba el criterio de igualdad de áreas y el tiempo crítico de despeje"""
+    print("\nProbando criterio de igualdad de áreas...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+
+        # Hueco de tensión total: solución en forma cerrada (par de
+        # aceleración constante durante la perturbación)
+        results = engine.equal_area_analysis(voltage_factor=0.0, T_load_during=[10.0, 50.0, 200.0],
+                                             T_load_post=10.0)
+        T1, T2 = motor.torque_coefficients()
+        T_load = 10.0 + motor.B * motor.synchronous_speed()
+        T_during = np.array([10.0, 50.0, 200.0]) + motor.B * motor.synchronous_speed()
+        delta_0, delta_u = results['delta_0'], results['delta_unstable']
+        _, delta_max = motor.pull_out_torque()
+        assert np.all(delta_u > delta_max) and np.all(delta_u < np.pi)
+        assert np.allclose(motor.calculate_torque_from_angle(delta_u), T_load)
+
+        # T_L,d (δcc - δ0) = ∫[δcc, δu] (T_e - T_L) dδ
+        delta_cc = results['critical_clearing_angle']
+        def energy(delta):
+            return -T1 * np.cos(delta) - T2 * np.cos(2 * delta) / 2 - T_load * delta
+        residual = T_during * (delta_cc - delta_0) - (energy(delta_u) - energy(delta_cc))
+        assert np.allclose(residual, 0.0, atol=1e-8)
+        t_cc = np.sqrt(2 * motor.J * (delta_cc - delta_0) / T_during)
+        assert np.allclose(results['critical_clearing_time'], t_cc, rtol=1e-10)
+        print("✓ Ángulo y tiempo crítico coinciden con la forma cerrada")
+
+        # Casos mixtos contrastados con simulaciones completas
+        results = engine.equal_area_analysis(voltage_factor=[0.2, 0.5, 1.0, 1.0],
+                                             T_load_during=[100.0, 100.0, 800.0, 10.0],
+                                             verify=True)
+        finite = np.isfinite(results['critical_clearing_time'])
+        assert list(finite) == [True, False, True, False]
+        assert np.array_equal(results['stable_without_clearing'], ~finite)
+        assert np.array_equal(results['verified'], finite)
+        assert motor.T_load == 10.0 and motor.V_line == 400.0
+        print(f"✓ Tiempos críticos verificados por simulación: "
+              f"{np.round(results['critical_clearing_time'][finite], 4)} s")
+
+        # Área de desaceleración insuficiente: inestable aun despejando al instante
+        results = engine.equal_area_analysis(T_load_during=500.0, T_load_post=380.0)
+        assert results['critical_clearing_time'][0] == 0.0
+        # Sin equilibrio posterior (carga por encima del par máximo)
+        results = engine.equal_area_analysis(T_load_during=500.0, T_load_post=500.0)
+        assert np.isnan(results['critical_clearing_time'][0])
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en criterio de igualdad de áreas: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_stability_limit():
+    """Prueba la búsqueda del límite de estabilidad por sobrecarga"""
+    print("\nProbando límite de estabilidad...")
+
+    try:
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+        initial = {'omega_m': motor.synchronous_speed(), 'delta': 0.3}
+
+        limit = engine.find_stability_limit(tol=1e-2, backend='thread', batch_size=3)
+        lower, upper = limit['bracket']
+        assert upper - lower <= 1e-2 and lower <= limit['critical_ratio'] <= upper
+        assert limit['n_simulations'] == 2 + 3 * limit['n_iterations']
+        assert limit['wall_time'] > 0
+        print(f"✓ Razón crítica: {limit['critical_ratio']:.3f} "
+              f"({limit['n_simulations']} simulaciones)")
+
+        # El límite dinámico no supera al estático (par máximo)
+        T_max, _ = motor.maximum_torque()
+        assert limit['critical_load'] < T_max
+
+        # Por debajo del intervalo no hay deslizamiento de polo; por encima sí
+        with engine._temporary_parameters(T_load=motor.T_load * lower):
+            assert engine.pole_slip_time(2.0, initial) is None
+        with engine._temporary_parameters(T_load=motor.T_load * upper):
+            assert engine.pole_slip_time(2.0, initial) is not None
+        assert motor.T_load == 10.0
+        print("✓ Intervalo final encierra la pérdida de sincronismo")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en límite de estabilidad: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_dq_model():
+    """Prueba el modelo d-q con amortiguadores y su jacobiano analítico"""
+    print("\nProbando modelo d-q...")
+
+    try:
+        import numpy as np
+        from motor_model import SynchronousMotorModel, MotorParameters
+        from dq_model import DQMotorModel
+        from profiles import PiecewiseProfile
+
+        motor = SynchronousMotorModel()
+        model = DQMotorModel(motor)
+
+        # Jacobiano analítico frente a diferencias centradas
+        state = model.equilibrium() + np.array([0.01, -0.02, 0.003, 0.01, 0.5, 0.1])
+        eps = 1e-6
+        numeric = np.column_stack([(model(0.0, state + eps * e) - model(0.0, state - eps * e))
+                                   / (2 * eps) for e in np.eye(6)])
+        assert np.allclose(model.jacobian(0.0, state), numeric, rtol=1e-6, atol=1e-4)
+        print("✓ Jacobiano analítico coincide con diferencias finitas")
+
+        # Régimen permanente: sin pérdidas coincide con el par de dos reacciones
+        lossless = SynchronousMotorModel(MotorParameters(Rs=0.0))
+        dq_lossless = DQMotorModel(lossless)
+        deltas = np.linspace(-1.0, 2.5, 8)
+        states = np.column_stack([dq_lossless.steady_state(delta) for delta in deltas])
+        assert np.allclose(dq_lossless.electromagnetic_torque(states),
+                           lossless.calculate_torque_from_angle(deltas))
+        equilibrium = model.equilibrium()
+        assert np.allclose(model(0.0, equilibrium), 0.0, atol=1e-9)
+        print("✓ Régimen permanente consistente con el modelo fasorial")
+
+        # Desde un estado perturbado RK45 queda limitado por los autovalores de los
+        # amortiguadores (~-1.6e4 1/s) mucho después de extinguido el subtransitorio
+        perturbed = equilibrium.copy()
+        perturbed[5] += 0.1
+        stiff = {method: model.simulate((0, 5.0), initial_state=perturbed, method=method,
+                                        rtol=1e-4, atol=1e-6)
+                 for method in ('RK45', 'Radau')}
+        for result in stiff.values():
+            assert result['success']
+            assert np.isclose(result['delta'][-1], equilibrium[5], atol=1e-5)
+            assert np.isclose(result['omega_m'][-1], equilibrium[4], atol=1e-4)
+        assert stiff['Radau']['njev'] > 0
+        assert stiff['Radau']['n_steps'] * 20 < stiff['RK45']['n_steps']
+        print(f"✓ Pasos desde estado perturbado: RK45 {stiff['RK45']['n_steps']}, "
+              f"Radau {stiff['Radau']['n_steps']}")
+
+        # Escalón de carga: los métodos implícitos llegan al nuevo equilibrio
+        load = PiecewiseProfile([0.0, 0.5], [10.0, 200.0])
+        final = DQMotorModel(motor, inputs={'T_load': 200.0}).equilibrium()
+        for method in ('Radau', 'BDF'):
+            result = DQMotorModel(motor, inputs={'T_load': load}).simulate((0, 5.0), method=method)
+            assert result['success']
+            assert np.isclose(result['delta'][-1], final[5], atol=1e-4)
+            assert np.isclose(result['omega_m'][-1], final[4], atol=5e-3)
+        print("✓ Escalón de carga con Radau y BDF")
+
+        # Corrientes y potencias con V(t) e If(t) de cada muestra
+        stepped = DQMotorModel(motor, inputs={
+            'V_line': PiecewiseProfile([0.0, 1.0], [400.0, 200.0]),
+            'If': PiecewiseProfile([0.0, 1.0], [2.0, 3.0])}).simulate((0, 2.0), num_points=201)
+        constant = DQMotorModel(motor, inputs={'V_line': 400.0, 'If': 2.0}).simulate(
+            (0, 2.0), num_points=201)
+        before = stepped['time'] < 1.0
+        for name in ('i_d', 'i_q', 'T_e', 'P', 'Q'):
+            assert np.allclose(stepped[name][before], constant[name][before], rtol=1e-9, atol=1e-9)
+        assert np.array_equal(stepped['V_line'][[0, 99, 100]], [400.0, 400.0, 200.0])
+        print("✓ Magnitudes derivadas con las entradas de cada instante")
+
+        # Un tramo fallido deja NaN (no memoria sin inicializar) tras el último instante
+        failing = DQMotorModel(motor, inputs={'T_load': lambda t: 10.0 if t < 0.5 else np.nan})
+        result = failing.simulate((0, 1.0), num_points=101)
+        assert not result['success']
+        assert np.all(np.isnan(result['omega_m'][result['time'] >= 0.5]))
+        assert np.all(np.isfinite(result['P'][result['time'] < 0.45]))
+        print("✓ Integración fallida marcada con NaN")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en modelo d-q: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_realtime_stepper():
+    """Prueba el integrador de paso fijo en tiempo real"""
+    print("\nProbando paso fijo en tiempo real...")
+
+    try:
+        import os
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+        from realtime import RealTimeStepper
+
+        motor = SynchronousMotorModel()
+        engine = SimulationEngine(motor)
+        omega_s = motor.synchronous_speed()
+        initial = {'omega_m': omega_s, 'delta': 0.0}
+
+        # RK4 de paso fijo frente a la integración adaptativa
+        stepper = RealTimeStepper(motor, dt=1e-4, initial_conditions=initial)
+        stepper.run(5000, realtime=False)
+        reference = engine.simulate_transient_response((0, 0.5), initial)
+        assert np.isclose(stepper.t, 0.5)
+        assert np.isclose(stepper.delta, reference['delta'][-1], atol=1e-6)
+        assert np.isclose(stepper.omega_m, reference['omega_m'][-1], atol=1e-5)
+        print("✓ RK4 de paso fijo coincide con solve_ivp")
+
+        # Entradas modificadas entre pasos
+        stepper = RealTimeStepper(motor, dt=1e-4, initial_conditions=initial)
+        stepper.set_inputs(T_load=200.0, V_line=360.0)
+        stepper.run(2000, realtime=False)
+        with engine._temporary_parameters(T_load=200.0, V_line=360.0):
+            reference = engine.simulate_transient_response((0, 0.2), initial)
+        assert np.isclose(stepper.delta, reference['delta'][-1], atol=1e-6)
+        assert motor.T_load == 10.0 and motor.V_line == 400.0
+        print("✓ Cambios de entrada entre pasos")
+
+        # Contabilidad de plazos con un reloj simulado: un paso que demora
+        # 350 µs vence su plazo y atrasa a los dos siguientes
+        class FakeClock:
+            def __init__(self):
+                self.now = 0.0
+
+            def __call__(self):
+                self.now += 1e-6
+                return self.now
+
+        clock = FakeClock()
+
+        def stall(stepper):
+            if stepper.steps == 10:
+                clock.now += 350e-6
+
+        stats = RealTimeStepper(motor, dt=1e-4, clock=clock).run(20, callback=stall)
+        assert stats['steps'] == 20 and stats['overruns'] == 3
+        assert 250e-6 < stats['jitter_max'] < 260e-6
+        print("✓ Vencimientos y jitter contabilizados")
+
+        # Buffers circulares: las estadísticas cubren sólo las últimas `history`
+        # muestras, pero los pasos y vencimientos se cuentan todos
+        for stall_step, stalled, overruns in ((10, False, 3), (18, True, 2)):
+            clock = FakeClock()
+
+            def stall(stepper):
+                if stepper.steps == stall_step:
+                    clock.now += 350e-6
+
+            ring = RealTimeStepper(motor, dt=1e-4, history=4, clock=clock)
+            stats = ring.run(20, callback=stall)
+            assert stats['steps'] == 20 and stats['overruns'] == overruns
+            assert np.count_nonzero(ring._compute_times) == 4
+            assert (stats['compute_max'] > 350e-6) == stalled
+        print("✓ Estadísticas sobre el buffer circular")
+
+        # Ritmo real de 10 kHz. El cómputo por paso frente al plazo depende de la
+        # carga de la máquina: sólo se exige con MOTOR_SIM_STARTUP_BUDGETS=1
+        stepper = RealTimeStepper(motor, dt=1e-4)
+        start = stepper.state()
+        stats = stepper.run(1000)
+        assert stats['steps'] == 1000 and np.isclose(stepper.t, 0.1)
+        assert np.isclose(stepper.delta, start['delta'], atol=1e-9)
+        if os.environ.get('MOTOR_SIM_STARTUP_BUDGETS') == '1':
+            assert stats['compute_p99'] < 1e-4
+        print(f"✓ 10 kHz: cómputo p99 {stats['compute_p99'] * 1e6:.1f} µs, "
+              f"{stats['overruns']} vencimientos")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en paso fijo en tiempo real: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_cosim_server():
+    """Prueba el servidor local de co-simulación"""
+    print("\nProbando servidor de co-simulación...")
+
+    try:
+        import asyncio
+        import json
+        import os
+        import tempfile
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+        from cosim_server import CoSimServer, CoSimClient, _LINE_LIMIT
+
+        engine = SimulationEngine(SynchronousMotorModel())
+        reference = engine.simulate_transient_response((0, 0.5), num_points=1000)
+
+        async def scenario():
+            async with CoSimServer(workers=2, chunk_size=300) as server:
+                host, port = server.address
+                async with CoSimClient(host, port) as client:
+                    # Solicitudes concurrentes sobre una misma conexión
+                    steady, sweep, transient, error = await asyncio.gather(
+                        client.call('steady', parameters={'T_load': 50.0}),
+                        client.call('sweep', parameter='If', range=[0.5, 4.0], num_points=50,
+                                    chunk_size=20),
+                        client.call('transient', t_span=[0, 0.5], num_points=1000),
+                        client.call('steady', parameters={'Xs': 1.0}),
+                        return_exceptions=True)
+                    chunks = [chunk async for chunk in
+                              client.stream('transient', t_span=[0, 0.5], num_points=1000)]
+
+                    # Más solicitudes que trabajadores: las excedentes esperan en cola
+                    pending = [asyncio.ensure_future(client.call('transient', t_span=[0, 2.0],
+                                                                 num_points=100))
+                               for _ in range(4)]
+                    queued = 0
+                    for _ in range(2000):
+                        queued = max(queued, server.queue_depth)
+                        if queued or all(task.done() for task in pending):
+                            break
+                        await asyncio.sleep(0.001)
+                    await asyncio.gather(*pending)
+                    stats = await client.call('stats')
+            return steady, sweep, transient, error, chunks, queued, stats
+
+        steady, sweep, transient, error, chunks, queued, stats = asyncio.run(scenario())
+        expected = engine.solve_steady_state(T_load=50.0)
+        assert np.isclose(steady['delta_equilibrium'], expected['delta_equilibrium'])
+        assert len(sweep['pf']) == 50 and np.isclose(sweep['parameter_If'][-1], 4.0)
+        assert np.allclose(transient['delta'], reference['delta'])
+        assert isinstance(error, RuntimeError) and 'Xs' in str(error)
+        assert len(chunks) == 4 and sum(len(chunk['time']) for chunk in chunks) == 1000
+        print("✓ Régimen permanente, barrido y transitorio por bloques")
+
+        assert queued > 0
+        assert stats['completed'] == 8 and stats['errors'] == 1
+        assert stats['queue_depth'] == 0 and stats['in_flight'] == 0
+        assert 0 < stats['latency_ms']['p50'] <= stats['latency_ms']['p99']
+        print(f"✓ Cola máxima {queued}, latencia p99 {stats['latency_ms']['p99']:.1f} ms")
+
+        # Socket Unix; una línea que excede el límite recibe un error y la
+        # conexión sigue atendiendo las siguientes
+        async def unix_scenario(path):
+            async with CoSimServer(unix_path=path, workers=1):
+                async with CoSimClient(unix_path=path) as client:
+                    pong = await client.call('ping')
+                    # Parámetros con tipo inválido: error sin ocupar un trabajador
+                    invalid = await asyncio.gather(
+                        *(client.call('steady', parameters=parameters)
+                          for parameters in ({'p': 4.5}, {'T_load': [1, 2]}, {'If': True},
+                                             {'connection': 1}, [1])),
+                        return_exceptions=True)
+                    coerced = await client.call('steady', parameters={'p': 4.0, 'T_load': '50'})
+                reader, writer = await asyncio.open_unix_connection(path)
+                oversized = b'{"id": 1, "op": "ping", "padding": "' + b'x' * _LINE_LIMIT + b'"}'
+                writer.write(oversized + b'\n{"id": 2, "op": "ping"}\n'
+                             b'{"id": 3, "op": "steady", "parameters": {"T_load": 500}}\n')
+                await writer.drain()
+                replies = [json.loads(await reader.readline(), parse_constant=reject)
+                           for _ in range(3)]
+                writer.close()
+                return pong, invalid, coerced, replies
+
+        def reject(constant):
+            raise ValueError(f"JSON inválido: {constant}")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pong, invalid, coerced, replies = asyncio.run(
+                unix_scenario(os.path.join(tmp, 'cosim.sock')))
+        assert pong['pong']
+        messages = ['p debe ser entero', 'T_load debe ser numérico', 'If debe ser numérico',
+                    'connection debe ser texto', '"parameters" debe ser un objeto']
+        for error, message in zip(invalid, messages):
+            assert isinstance(error, RuntimeError) and message in str(error), error
+        assert np.isclose(coerced['delta_equilibrium'], expected['delta_equilibrium'])
+        assert replies[0]['id'] is None and replies[0]['status'] == 'error'
+        assert 'excede' in replies[0]['error']
+        assert replies[1] == {'id': 2, 'status': 'ok', 'chunk': 0, 'final': True,
+                              'data': {'pong': True}}
+        # Sin equilibrio: JSON estricto con null en lugar de NaN
+        assert replies[2]['status'] == 'ok' and replies[2]['data']['delta_equilibrium'] is None
+        print("✓ Socket Unix, validación de parámetros, límite de línea y JSON estricto")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en servidor de co-simulación: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_batch_cli():
+    """Prueba los subcomandos por lotes de main.py (sin interfaz gráfica)"""
+    print("\nProbando línea de comandos por lotes...")
+
+    try:
+        import json
+        import os
+        import subprocess
+        import sys
+        import tempfile
+        import numpy as np
+        from result_store import SimulationResult
+
+        here = os.path.dirname(os.path.abspath(__file__))
+
+        def run_cli(*argv, cwd):
+            # Proceso aparte: verifica además que no se importen PyQt6 ni matplotlib
+            code = ("import sys; sys.path.insert(0, %r); import main; "
+                    "code = main.main(%r); "
+                    "assert not any(m.split('.')[0] in ('PyQt6', 'matplotlib') for m in sys.modules); "
+                    "sys.exit(code or 0)") % (here, list(argv))
+            return subprocess.run([sys.executable, '-c', code], cwd=cwd,
+                                  capture_output=True, text=True, timeout=300)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, 'motor.json'), 'w') as handle:
+                json.dump({'V_line': 380.0, 'T_load': 20.0}, handle)
+
+            done = run_cli('run-scenario', 'startup_ideal', 'voltage_sag', '--jobs', '2',
+                           '--params', 'motor.json', '--set', 'If=2.5', '-o', 'res', cwd=tmp)
+            assert done.returncode == 0, done.stderr
+            result = SimulationResult.load(os.path.join(tmp, 'res', 'voltage_sag'))
+            assert result.n_samples > 0 and 'delta' in result
+            assert result['motor_parameters']['V_line'] == 380.0
+            assert result['motor_parameters']['If'] == 2.5
+            print("✓ run-scenario con --jobs y archivo de parámetros")
+
+            done = run_cli('sweep', 'If', '0.5', '4.0', '--points', '40', '--jobs', '2',
+                           '-o', 'barrido', cwd=tmp)
+            assert done.returncode == 0, done.stderr
+            sweep = SimulationResult.load(os.path.join(tmp, 'barrido'))
+            assert sweep.n_samples == 40 and np.isclose(sweep['parameter_If'][-1], 4.0)
+            assert set(sweep['pf_type']) <= {'inductivo', 'capacitivo', 'unidad'}
+            print("✓ sweep en paralelo a resultado columnar")
+
+            done = run_cli('steady', '--set', 'T_load=50', '--json', cwd=tmp)
+            assert done.returncode == 0, done.stderr
+            assert json.loads(done.stdout)['T_load'] == 50.0
+            done = run_cli('steady', '--set', 'Xs=1', cwd=tmp)
+            assert done.returncode == 1 and 'Xs' in done.stderr
+            done = run_cli('steady', '--set', 'p=4.7', cwd=tmp)
+            assert done.returncode == 1 and 'p debe ser entero' in done.stderr
+
+            # Sin equilibrio: JSON estricto con null en lugar de NaN
+            def reject(constant):
+                raise ValueError(f"JSON inválido: {constant}")
+            done = run_cli('steady', '--set', 'T_load=500', '--json', cwd=tmp)
+            assert done.returncode == 0, done.stderr
+            steady = json.loads(done.stdout, parse_constant=reject)
+            assert steady['delta_equilibrium'] is None and steady['has_equilibrium'] is False
+
+            done = run_cli('bench', '--quick', '-o', 'bench.json', cwd=tmp)
+            assert done.returncode == 0, done.stderr
+            with open(os.path.join(tmp, 'bench.json')) as handle:
+                bench = json.load(handle)
+            assert bench['results']['realtime_step']['rate'] > 0
+            print("✓ steady y bench sin PyQt6 ni matplotlib")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en línea de comandos por lotes: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_startup_time():
+    """Prueba el arranque: scipy/matplotlib/PyQt6 diferidos y presupuesto de importación"""
+    print("\nProbando tiempo de arranque...")
+
+    try:
+        import os
+        import subprocess
+        import sys
+        from startup import benchmark, DEFERRED_MODULES, CORE_IMPORT_MARGIN
+        from utils import lazy_import
+
+        # Siempre: main sin NumPy, ningún módulo con scipy/matplotlib/PyQt6 y
+        # cada uno dentro de un margen proporcional al costo de NumPy medido en
+        # las mismas condiciones. Los presupuestos absolutos en ms dependen de
+        # la carga de la máquina: sólo se exigen con MOTOR_SIM_STARTUP_BUDGETS=1
+        enforce_budgets = os.environ.get('MOTOR_SIM_STARTUP_BUDGETS') == '1'
+        report = benchmark(repeats=3)
+        assert not report['modules']['main']['numpy_loaded']
+        for name, measurement in report['modules'].items():
+            assert measurement['imports_ok'], (name, measurement['deferred_loaded'])
+            assert measurement['within_limit'], (
+                name, measurement['cumulative_ms'], report['numpy_ms'], measurement['slowest'])
+            if enforce_budgets:
+                assert measurement['within_budget'], (
+                    name, measurement['cumulative_ms'], measurement['slowest'])
+        print(f"✓ main sin NumPy; módulos base sin scipy/matplotlib/PyQt6 y a menos de "
+              f"{1 + CORE_IMPORT_MARGIN:.0f} veces NumPy ({report['numpy_ms']:.0f} ms)"
+              + (" y dentro del presupuesto" if enforce_budgets else ""))
+
+        # --info verifica las dependencias sin importarlas
+        here = os.path.dirname(os.path.abspath(__file__))
+        code = ("import sys, main; main.main(['--info']); "
+                "print(sorted({m.split('.')[0] for m in sys.modules} & %r))"
+                % set(DEFERRED_MODULES))
+        done = subprocess.run([sys.executable, '-c', code], cwd=here,
+                              capture_output=True, text=True, timeout=60)
+        assert done.returncode == 0, done.stderr
+        assert 'numpy: OK' in done.stdout and done.stdout.strip().endswith('[]')
+        print("✓ --info sin importar dependencias")
+
+        # El proxy importa en el primer acceso
+        proxy = lazy_import('json')
+        assert 'sin importar' in repr(proxy)
+        assert proxy.loads('[1]') == [1] and 'sin importar' not in repr(proxy)
+        print("✓ Importación diferida en el primer uso")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en tiempo de arranque: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_disk_cache():
+    """Prueba la caché en disco de simulaciones transitorias"""
+    print("\nProbando caché en disco...")
+
+    try:
+        import tempfile
+        import numpy as np
+        from motor_model import SynchronousMotorModel
+        from simulation_engine import SimulationEngine
+        from disk_cache import TransientDiskCache
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = TransientDiskCache(directory, max_bytes=200_000)
+            motor = SynchronousMotorModel()
+            engine = SimulationEngine(motor, disk_cache=cache)
+            initial = {'omega_m': motor.synchronous_speed(), 'delta': 0.3}
+
+            computed = engine.simulate_transient_response((0, 0.5), initial)
+            cached = engine.simulate_transient_response((0, 0.5), initial)
+            assert cache.hits == 1 and cache.misses == 1
+            assert isinstance(cached['delta'], np.memmap)
+            assert np.array_equal(computed['pf'], cached['pf'])
+            print("✓ Resultado recuperado de disco mapeado en memoria")
+
+            # La ruta sin compilar no se sirve desde la entrada de la compilada
+            engine.simulate_transient_response((0, 0.5), initial, compiled=False)
+            assert cache.hits == 1 and cache.misses == 2
+
+            # Parámetros distintos generan una clave distinta
+            motor.If = 2.5
+            engine.simulate_transient_response((0, 0.5), initial)
+            assert cache.misses == 3
+
+            # Límite de tamaño con desalojo LRU (cada entrada ocupa ~73 kB)
+            for T_load in (5.0, 15.0, 20.0):
+                motor.T_load = T_load
+                engine.simulate_transient_response((0, 0.5), initial)
+            assert cache.size_bytes() <= cache.max_bytes
+            entries = cache.info()['entries']
+            assert entries < 5 and cache.clear() == entries
+            print("✓ Tamaño acotado con desalojo LRU")
+
+        # Simulaciones con eventos describibles (escenarios) también se guardan
+        with tempfile.TemporaryDirectory() as directory:
+            from scenarios import SimulationScenarios
+            from simulation_engine import pole_slip_event
+
+            cache = TransientDiskCache(directory)
+            scenarios = SimulationScenarios(SynchronousMotorModel())
+            scenarios.engine.disk_cache = cache
+            first = scenarios.scenario_voltage_sag(t_final=1.5)
+            again = scenarios.scenario_voltage_sag(t_final=1.5)
+            assert cache.hits == 1 and cache.misses == 1
+            assert again['stable'] == first['stable'] and again['event'] == first['event']
+            assert np.array_equal(first['delta'], again['delta'])
+            scenarios.scenario_startup_ideal()
+            scenarios.scenario_startup_ideal()
+            assert cache.hits == 2 and cache.misses == 2
+
+            # Otro umbral de evento es otra clave; un evento sin describe() no se guarda
+            engine = scenarios.engine
+            initial = {'omega_m': 0.0, 'delta': 0.0}
+            engine.simulate_transient_response((0, 0.2), initial, events=[pole_slip_event()])
+            engine.simulate_transient_response((0, 0.2), initial, events=[pole_slip_event(3.0)])
+            assert cache.misses == 4
+            stored = cache.info()['entries']
+            engine.simulate_transient_response((0, 0.2), initial,
+                                               events=[lambda t, state: state[1] - 3.0])
+            assert cache.info()['entries'] == stored and cache.misses == 4
+            print("✓ Escenarios con eventos de terminación en la caché")
+
+        return True
+    except Exception as e:
+        print(f"✗ Error en caché en disco: {e}")
+        traceback.print_exc()
+        return False
+
+
 def test_scenarios():
     """Prueba básica de escenarios"""
     print("\nProbando escenarios...")
@@ -153,7 +1622,9 @@ def test_utils():
     print("\nProbando utilidades...")
 
     try:
-        from utils import polar_to_rectangular, synchronous_speed_rpm, calculate_power_factor
+        import numpy as np
+        from utils import (polar_to_rectangular, synchronous_speed_rpm, calculate_power_factor,
+                           finite_or_none)
 
         # Probar conversión polar-rectangular
         z = polar_to_rectangular(5.0, 30.0)
@@ -167,6 +1638,13 @@ def test_utils():
         pf, pf_type = calculate_power_factor(1000, 1200)
         print(f"✓ Factor de potencia: {pf:.3f} ({pf_type})")
 
+        # Probar conversión para JSON estricto
+        value = finite_or_none({'a': np.array([1.0, np.nan]), 'b': (np.float64(np.inf), 2),
+                                'c': np.arange(2), 'd': 'texto'})
+        assert value == {'a': [1.0, None], 'b': [None, 2], 'c': [0, 1], 'd': 'texto'}
+        assert type(value['c'][0]) is int
+        print("✓ NaN e infinitos como null para JSON estricto")
+
         return True
     except Exception as e:
         print(f"✗ Error en utilidades: {e}")
@@ -214,7 +1692,32 @@ def main():
         ("Importaciones", test_imports),
         ("Utilidades", test_utils),
         ("Modelo del motor", test_motor_model),
+        ("Registro de parámetros", test_motor_parameters),
+        ("Régimen permanente por lotes", test_steady_state_batch),
+        ("Caché de resultados", test_result_cache),
         ("Motor de simulación", test_simulation_engine),
+        ("Polos salientes", test_salient_pole),
+        ("Solver de estado estacionario", test_steady_state_solver),
+        ("Variables del transitorio", test_transient_quantities),
+        ("Lado derecho compilado", test_compiled_dynamics),
+        ("Carga variable", test_time_varying_load),
+        ("Excitación variable", test_time_varying_excitation),
+        ("Frecuencia variable", test_frequency_variation),
+        ("Caída de tensión", test_voltage_sag),
+        ("Salida por bloques", test_streaming_transient),
+        ("Almacenamiento de resultados", test_result_store),
+        ("Ensamble de motores", test_ensemble),
+        ("Barrido paralelo", test_parallel_sweep),
+        ("Eventos terminales", test_termination_events),
+        ("Límite de estabilidad", test_stability_limit),
+        ("Pequeña señal", test_small_signal),
+        ("Igualdad de áreas", test_equal_area),
+        ("Modelo d-q", test_dq_model),
+        ("Tiempo real", test_realtime_stepper),
+        ("Servidor de co-simulación", test_cosim_server),
+        ("Línea de comandos por lotes", test_batch_cli),
+        ("Tiempo de arranque", test_startup_time),
+        ("Caché en disco", test_disk_cache),
         ("Escenarios", test_scenarios),
         ("Gráficos", test_plots)
     ]
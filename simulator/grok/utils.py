@@ -2,8 +2,11 @@
 Utilidades matemáticas para el simulador de motor síncrono
 """
 
+import importlib
+import math
 import numpy as np
 import cmath
+from typing import Any
 
 
 def polar_to_rectangular(magnitude: float, angle_deg: float) -> complex:
@@ -94,6 +97,20 @@ def calculate_power_factor(active_power: float, apparent_power: float) -> tuple[
         return -pf, "capacitivo"
 
 
+def calculate_power_factor_array(active_power: np.ndarray,
+                                 apparent_power: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Versión vectorizada de calculate_power_factor para arrays de P y S"""
+    active_power = np.asarray(active_power, dtype=float)
+    apparent_power = np.asarray(apparent_power, dtype=float)
+
+    zero = apparent_power == 0
+    pf = np.clip(active_power / np.where(zero, 1.0, apparent_power), -1.0, 1.0)
+    pf = np.where(zero, 1.0, pf)
+
+    pf_type = np.where(pf < 0, "capacitivo", np.where(pf < 1.0, "inductivo", "unidad"))
+    return np.abs(pf), pf_type
+
+
 def normalize_angle(angle_deg: float) -> float:
     """Normaliza ángulo al rango [-180, 180] grados"""
     while angle_deg > 180:
@@ -103,6 +120,11 @@ def normalize_angle(angle_deg: float) -> float:
     return angle_deg
 
 
+def normalize_angle_array(angle_deg: np.ndarray) -> np.ndarray:
+    """Versión vectorizada de normalize_angle (rango (-180, 180] grados)"""
+    return 180.0 - np.mod(180.0 - np.asarray(angle_deg, dtype=float), 360.0)
+
+
 def calculate_rms(value: float, is_peak: bool = True) -> float:
     """Calcula valor RMS a partir del valor peak o mantiene RMS"""
     if is_peak:
@@ -115,3 +137,95 @@ def calculate_peak(value: float, is_rms: bool = True) -> float:
     if is_rms:
         return value * np.sqrt(2)
     return value
+
+
+def json_default(value: Any) -> Any:
+    """
+    Conversión a JSON de escalares y arrays de NumPy (argumento default de json.dump)
+
+    Raises:
+        TypeError: para cualquier otro tipo, en lugar de guardarlo como texto
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Valor no serializable: {type(value).__name__}")
+
+
+def coerce_parameter(name: str, default: Any, value: Any) -> Any:
+    """
+    Convierte value al tipo del campo name (el tipo de su valor por defecto)
+
+    Acepta números y texto numérico (asignaciones de línea de comandos); los
+    enteros no se truncan (p=4.7 es un error).
+
+    Raises:
+        ValueError: si value no es un valor válido del tipo del campo
+    """
+    kind = type(default)
+    if kind is str:
+        if not isinstance(value, str):
+            raise ValueError(f"{name} debe ser texto: {value!r}")
+        return value
+    if isinstance(value, (bool, np.bool_)) or not isinstance(value, (int, float, str, np.number)):
+        raise ValueError(f"{name} debe ser numérico: {value!r}")
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"{name} debe ser numérico: {value!r}") from None
+    if kind is int:
+        if not number.is_integer():
+            raise ValueError(f"{name} debe ser entero: {value!r}")
+        return int(number)
+    return kind(number)
+
+
+def finite_or_none(value: Any) -> Any:
+    """
+    Copia de value apta para JSON estricto (json.dumps(..., allow_nan=False))
+
+    Recorre diccionarios, listas, tuplas y arrays; los escalares de NumPy pasan
+    a tipos de Python y los NaN e infinitos a None (null).
+    """
+    if isinstance(value, dict):
+        return {key: finite_or_none(item) for key, item in value.items()}
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in 'iub' or (value.dtype.kind == 'f' and np.isfinite(value).all()):
+            return value.tolist()
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [finite_or_none(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+class LazyModule:
+    """
+    Módulo que se importa recién en el primer acceso a uno de sus atributos
+
+    Para dependencias pesadas (matplotlib.pyplot) que sólo usan algunas
+    funciones de un módulo: importarlas arriba del archivo suma su costo al
+    arranque de todo programa que importe el módulo, aunque nunca grafique.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+    def __repr__(self) -> str:
+        state = 'importado' if self._module is not None else 'sin importar'
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Referencia diferida al módulo name (ver LazyModule)"""
+    return LazyModule(name)